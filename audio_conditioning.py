@@ -0,0 +1,149 @@
+import sys
+import time
+import wave
+import argparse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+HIGHPASS_HZ = 80
+FRAME_MS = 20
+TARGET_LEVEL_DB = -20.0
+MAX_GAIN_DB = 30.0
+PEAK_LIMIT_DB = -1.0
+GATE_MARGIN_DB = 8.0
+GATE_MIN_RANGE_DB = 15.0
+GATE_SILENCE_DB = -60.0
+GATE_HOLD_MS = 300
+BLOCK_SAMPLES = 1024 * 1024
+
+
+def is_available():
+    return np is not None
+
+
+def read_wav(path):
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2 or f.getnchannels() != 1:
+            raise ValueError(f"{path}: somente WAV mono de 16 bits é suportado")
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+        return samples.astype(np.float32), f.getframerate()
+
+
+def write_wav(path, samples, sample_rate):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.astype("<i2").tobytes())
+
+
+def remove_dc(samples, sample_rate, cutoff_hz=HIGHPASS_HZ):
+    window = max(int(sample_rate / cutoff_hz), 1)
+    output = np.empty_like(samples)
+    for start in range(0, len(samples), BLOCK_SAMPLES):
+        count = min(BLOCK_SAMPLES, len(samples) - start)
+        low = start - window // 2
+        high = start + count + window - window // 2
+        padded = np.concatenate([
+            np.full(max(-low, 0), samples[0], dtype=np.float32),
+            samples[max(low, 0):min(high, len(samples))],
+            np.full(max(high - len(samples), 0), samples[-1], dtype=np.float32)
+        ])
+        sums = np.concatenate([[0.0], np.cumsum(padded, dtype=np.float64)])
+        output[start:start + count] = samples[start:start + count] - (sums[window:window + count] - sums[:count]) / window
+    return output
+
+
+def frame_levels_db(samples, frame_size):
+    power = np.empty(-(-len(samples) // frame_size), dtype=np.float64)
+    block = max(BLOCK_SAMPLES // frame_size, 1) * frame_size
+    for start in range(0, len(samples), block):
+        chunk = samples[start:start + block]
+        frame_count = -(-len(chunk) // frame_size)
+        frames = np.zeros(frame_count * frame_size, dtype=np.float32)
+        frames[:len(chunk)] = chunk
+        first = start // frame_size
+        power[first:first + frame_count] = np.mean(np.square(frames.reshape(frame_count, frame_size)), axis=1)
+    return 20 * np.log10(np.maximum(np.sqrt(power), 1e-3) / 32768)
+
+
+def gate_mask(levels, frame_ms=FRAME_MS):
+    floor_db, loud_db = np.percentile(levels, [10, 95])
+    threshold = GATE_SILENCE_DB
+    if loud_db - floor_db >= GATE_MIN_RANGE_DB:
+        threshold = max(threshold, floor_db + GATE_MARGIN_DB)
+
+    hold = GATE_HOLD_MS // frame_ms
+    return np.convolve(levels >= threshold, np.ones(2 * hold + 1), mode="same") > 0
+
+
+def gated_blocks(samples, is_open, frame_size):
+    block = max(BLOCK_SAMPLES // frame_size, 1) * frame_size
+    for start in range(0, len(samples), block):
+        chunk = samples[start:start + block]
+        gate = np.repeat(is_open[start // frame_size:(start + len(chunk)) // frame_size + 1], frame_size)
+        yield start, chunk * gate[:len(chunk)].astype(np.float32)
+
+
+def condition_samples(samples, sample_rate):
+    frame_size = sample_rate * FRAME_MS // 1000
+    filtered = remove_dc(samples, sample_rate)
+    levels = frame_levels_db(filtered, frame_size)
+    is_open = gate_mask(levels)
+
+    if not is_open.any():
+        return np.zeros(len(samples), dtype=np.int16), is_open, 0.0
+
+    speech_db = 10 * np.log10(np.mean(np.power(10, levels[is_open] / 10)))
+    peak = max(float(np.max(np.abs(gated))) for _, gated in gated_blocks(filtered, is_open, frame_size))
+    gain_db = min(TARGET_LEVEL_DB - speech_db, MAX_GAIN_DB)
+    if peak > 0:
+        gain_db = min(gain_db, PEAK_LIMIT_DB - 20 * np.log10(peak / 32768))
+
+    gain = np.float32(10 ** (gain_db / 20))
+    conditioned = np.empty(len(samples), dtype=np.int16)
+    for start, gated in gated_blocks(filtered, is_open, frame_size):
+        conditioned[start:start + len(gated)] = np.clip(np.round(gated * gain), -32768, 32767)
+    return conditioned, is_open, float(gain_db)
+
+
+def condition_wav(input_path, output_path):
+    started = time.perf_counter()
+    samples, sample_rate = read_wav(input_path)
+    if not len(samples):
+        return None
+
+    conditioned, is_open, gain_db = condition_samples(samples, sample_rate)
+    write_wav(output_path, conditioned, sample_rate)
+
+    elapsed = time.perf_counter() - started
+    duration = len(samples) / sample_rate
+    gated = 1 - is_open.mean()
+    print(f"Áudio condicionado em {elapsed:.1f}s ({duration / max(elapsed, 1e-6):.0f}x o tempo real): "
+          f"ganho {gain_db:+.1f} dB, {gated:.0%} silenciado pelo noise gate")
+    return {"open_frames": is_open, "frame_ms": FRAME_MS, "gain_db": gain_db, "gated_fraction": float(gated)}
+
+
+def is_gated(conditioning, start_ms, end_ms):
+    first = int(start_ms // conditioning["frame_ms"])
+    last = int(-(-end_ms // conditioning["frame_ms"]))
+    return not conditioning["open_frames"][first:last].any()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Filter, gate and normalize a 16-bit mono WAV for speech recognition")
+    parser.add_argument("input", help="Input WAV (16-bit mono)")
+    parser.add_argument("output", help="Conditioned WAV to write")
+
+    args = parser.parse_args()
+
+    if not is_available():
+        print("NumPy não está instalado; instale com: pip install numpy")
+        sys.exit(1)
+
+    result = condition_wav(args.input, args.output)
+    sys.exit(0 if result else 1)
@@ -0,0 +1,225 @@
+import os
+import sys
+import wave
+import sqlite3
+import argparse
+from collections import Counter
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FINGERPRINT_DB_PATH = os.path.join("cache", "impressoes.db")
+FRAME_SEC = 0.256
+HOP_SEC = 0.016
+BAND_COUNT = 33
+MIN_FREQ = 300.0
+MAX_FREQ = 3000.0
+ANCHOR_STEP = 4
+LOOKUP_BATCH = 500
+MAX_CANDIDATES = 5
+MAX_BIT_ERROR_RATE = 0.15
+MAX_WINDOW_BIT_ERROR_RATE = 0.25
+WINDOW_SEC = 2.0
+MIN_FRAME_RATIO = 0.9
+MIN_LEVEL_DB = -50.0
+DEGENERATE_HASHES = (0, 0xFFFFFFFF)
+
+
+def is_available():
+    return np is not None
+
+
+def read_wav_samples(path):
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: somente WAV de 16 bits é suportado")
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2")
+        channels = f.getnchannels()
+        sample_rate = f.getframerate()
+    if channels > 1:
+        samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return samples.astype(np.float32), sample_rate
+
+
+def get_level_db(samples):
+    if not len(samples):
+        return float("-inf")
+    rms = np.sqrt(np.mean(np.square(samples, dtype=np.float64)))
+    return 20 * np.log10(rms / 32768) if rms > 0 else float("-inf")
+
+
+def compute_fingerprint(samples, sample_rate):
+    frame_size = int(FRAME_SEC * sample_rate)
+    hop_size = int(HOP_SEC * sample_rate)
+    if len(samples) < frame_size + 2 * hop_size:
+        return np.zeros(0, dtype=np.uint32)
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_size)[::hop_size]
+    power = np.square(np.abs(np.fft.rfft(frames * np.hanning(frame_size).astype(np.float32), axis=1)))
+
+    edges = np.round(np.geomspace(MIN_FREQ, MAX_FREQ, BAND_COUNT + 1) * frame_size / sample_rate).astype(int)
+    edges = np.maximum(edges, np.arange(len(edges)) + edges[0])
+    energies = np.add.reduceat(power[:, :edges[-1]], edges[:-1], axis=1)
+
+    band_diff = np.diff(energies, axis=1)
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    return np.packbits(bits, axis=1, bitorder="little").view("<u4").ravel()
+
+
+def fingerprint_wav(path):
+    samples, sample_rate = read_wav_samples(path)
+    return compute_fingerprint(samples, sample_rate), get_level_db(samples)
+
+
+def bit_error_rate(a, b):
+    if not len(a):
+        return 1.0
+    return float(np.unpackbits(np.bitwise_xor(a, b).view(np.uint8)).sum()) / (len(a) * 32)
+
+
+def max_window_error_rate(a, b, window_frames=int(WINDOW_SEC / HOP_SEC)):
+    if not len(a):
+        return 1.0
+    errors = np.unpackbits(np.bitwise_xor(a, b).view(np.uint8)).reshape(len(a), 32).sum(axis=1)
+    return max(
+        float(errors[start:start + window_frames].sum()) / (min(window_frames, len(a) - start) * 32)
+        for start in range(0, len(a), window_frames)
+    )
+
+
+class FingerprintIndex:
+    def __init__(self, db_path=FINGERPRINT_DB_PATH):
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                language TEXT NOT NULL,
+                fingerprint BLOB NOT NULL,
+                text TEXT NOT NULL,
+                confidence REAL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS anchors (
+                hash INTEGER NOT NULL,
+                chunk_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (hash, chunk_id, position)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def find_candidates(self, fingerprint):
+        positions = {}
+        for position, value in enumerate(fingerprint.tolist()):
+            if value not in DEGENERATE_HASHES:
+                positions.setdefault(value, []).append(position)
+
+        votes = Counter()
+        hashes = list(positions)
+        for i in range(0, len(hashes), LOOKUP_BATCH):
+            batch = hashes[i:i + LOOKUP_BATCH]
+            rows = self.conn.execute(
+                f"SELECT hash, chunk_id, position FROM anchors WHERE hash IN ({','.join('?' * len(batch))})", batch
+            )
+            for value, chunk_id, stored_position in rows:
+                for position in positions[value]:
+                    votes[(chunk_id, stored_position - position)] += 1
+        return [candidate for candidate, _ in votes.most_common(MAX_CANDIDATES)]
+
+    def lookup(self, fingerprint, language):
+        best = None
+        for chunk_id, offset in self.find_candidates(fingerprint):
+            row = self.conn.execute(
+                "SELECT fingerprint, text, confidence FROM chunks WHERE id = ? AND language = ?", (chunk_id, language)
+            ).fetchone()
+            if not row:
+                continue
+
+            stored = np.frombuffer(row[0], dtype="<u4")
+            if min(len(stored), len(fingerprint)) < MIN_FRAME_RATIO * max(len(stored), len(fingerprint)):
+                continue
+
+            start = max(0, -offset)
+            end = min(len(fingerprint), len(stored) - offset)
+            if end - start < MIN_FRAME_RATIO * len(fingerprint):
+                continue
+
+            probe, reference = fingerprint[start:end], stored[start + offset:end + offset]
+            error_rate = bit_error_rate(probe, reference)
+            if error_rate > MAX_BIT_ERROR_RATE or (best and error_rate >= best["bit_error_rate"]):
+                continue
+            if max_window_error_rate(probe, reference) > MAX_WINDOW_BIT_ERROR_RATE:
+                continue
+            best = {"id": chunk_id, "text": row[1], "confidence": row[2], "bit_error_rate": error_rate}
+
+        if best:
+            with self.conn:
+                self.conn.execute("UPDATE chunks SET hits = hits + 1 WHERE id = ?", (best["id"],))
+        return best
+
+    def add(self, fingerprint, language, text, confidence=None):
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO chunks (language, fingerprint, text, confidence, created_at) VALUES (?, ?, ?, ?, ?)",
+                (language, fingerprint.astype("<u4").tobytes(), text, confidence, datetime.now().isoformat(sep=" "))
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO anchors (hash, chunk_id, position) VALUES (?, ?, ?)",
+                [
+                    (value, cursor.lastrowid, position)
+                    for position, value in enumerate(fingerprint.tolist())
+                    if position % ANCHOR_STEP == 0 and value not in DEGENERATE_HASHES
+                ]
+            )
+        return cursor.lastrowid
+
+    def stats(self):
+        chunks, hits = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM chunks").fetchone()
+        anchors = self.conn.execute("SELECT COUNT(*) FROM anchors").fetchone()[0]
+        return {"chunks": chunks, "anchors": anchors, "hits": hits}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the acoustic fingerprint index used to reuse repeated segments")
+    parser.add_argument("--db", default=FINGERPRINT_DB_PATH, help="Path to the fingerprint database")
+    parser.add_argument("--clear", action="store_true", help="Delete every stored fingerprint")
+
+    args = parser.parse_args()
+
+    if not is_available():
+        print("NumPy não está instalado; instale com: pip install numpy")
+        sys.exit(1)
+
+    if args.clear:
+        for path in (args.db, args.db + "-wal", args.db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        print("Índice de impressões acústicas apagado")
+        sys.exit(0)
+
+    with FingerprintIndex(args.db) as index:
+        stats = index.stats()
+    size_mb = os.path.getsize(args.db) / 1024 / 1024
+    print(f"{stats['chunks']} segmentos, {stats['anchors']} âncoras, {size_mb:.1f} MB")
+    print(f"{stats['hits']} segmentos reaproveitados (requisições economizadas)")
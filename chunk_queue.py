@@ -0,0 +1,333 @@
+import os
+import sys
+import time
+import uuid
+import socket
+import shutil
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+from datetime import datetime
+
+from video_transcriber import (
+    copy_video_to_folder,
+    estimate_scratch_bytes,
+    job_workspace,
+    prepare_audio,
+    resolve_language,
+    should_recycle_worker,
+    split_audio_into_chunks,
+    transcribe_audio_chunk
+)
+from transcript_index import index_transcript
+
+
+LEASE_SECONDS = 60
+HEARTBEAT_SECONDS = 15
+MAX_ATTEMPTS = 3
+RECYCLE_EXIT_CODE = 3
+
+
+def open_queue(queue_dir):
+    if not os.path.exists(queue_dir):
+        os.makedirs(queue_dir)
+
+    conn = sqlite3.connect(os.path.join(queue_dir, "queue.db"), timeout=30, isolation_level=None)
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            language TEXT NOT NULL,
+            num_chunks INTEGER NOT NULL,
+            created_at TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            job_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            chunk_path TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            text TEXT,
+            error TEXT,
+            UNIQUE (job_id, idx)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks(status, lease_expires)")
+    return conn
+
+
+def submit_job(queue_dir, audio_path, language="en-US", chunk_length_sec=30):
+    job_id = uuid.uuid4().hex
+    job_dir = os.path.join(queue_dir, "jobs", job_id)
+    language = resolve_language(audio_path, language)
+
+    chunk_files = split_audio_into_chunks(audio_path, chunk_length_sec * 1000, job_dir)
+    if not chunk_files:
+        return None
+
+    conn = open_queue(queue_dir)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "INSERT INTO jobs (id, language, num_chunks, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, language, len(chunk_files), datetime.now().isoformat(sep=" "))
+        )
+        conn.executemany(
+            "INSERT INTO tasks (job_id, idx, chunk_path) VALUES (?, ?, ?)",
+            [(job_id, i, os.path.relpath(chunk_file, queue_dir)) for i, chunk_file in enumerate(chunk_files)]
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    print(f"Trabalho {job_id} publicado com {len(chunk_files)} segmentos")
+    return job_id
+
+
+def lease_task(conn, worker_id, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "UPDATE tasks SET status = 'failed', worker = NULL "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, max_attempts)
+        )
+        row = conn.execute(
+            "SELECT t.id, t.job_id, t.idx, t.chunk_path, j.language FROM tasks t JOIN jobs j ON j.id = t.job_id "
+            "WHERE t.status = 'pending' OR (t.status = 'leased' AND t.lease_expires < ?) "
+            "ORDER BY j.created_at, t.idx LIMIT 1",
+            (now,)
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker_id, now + lease_seconds, row[0])
+            )
+        conn.execute("COMMIT")
+    except:
+        conn.execute("ROLLBACK")
+        raise
+    return row
+
+
+def heartbeat(conn, task_id, worker_id, lease_seconds=LEASE_SECONDS):
+    cursor = conn.execute(
+        "UPDATE tasks SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+        (time.time() + lease_seconds, task_id, worker_id)
+    )
+    return cursor.rowcount == 1
+
+
+def complete_task(conn, task_id, worker_id, text):
+    cursor = conn.execute(
+        "UPDATE tasks SET status = 'done', text = ?, lease_expires = NULL WHERE id = ? AND worker = ? AND status = 'leased'",
+        (text, task_id, worker_id)
+    )
+    return cursor.rowcount == 1
+
+
+def release_task(conn, task_id, worker_id, error, max_attempts=MAX_ATTEMPTS):
+    conn.execute(
+        "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+        "worker = NULL, lease_expires = NULL, error = ? WHERE id = ? AND worker = ?",
+        (max_attempts, str(error), task_id, worker_id)
+    )
+
+
+def run_worker(queue_dir, worker_id=None, idle_timeout=None, poll_interval=1.0, max_tasks=None, max_rss_mb=None,
+               on_recycle=None, lease_seconds=LEASE_SECONDS):
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    conn = open_queue(queue_dir)
+    heartbeat_conn = sqlite3.connect(os.path.join(queue_dir, "queue.db"), timeout=30,
+                                     isolation_level=None, check_same_thread=False)
+    heartbeat_interval = min(HEARTBEAT_SECONDS, lease_seconds / 4)
+    idle_since = time.monotonic()
+    processed = 0
+    recycled = False
+
+    print(f"Worker {worker_id} aguardando segmentos em {queue_dir}")
+
+    try:
+        while True:
+            task = lease_task(conn, worker_id, lease_seconds)
+            if not task:
+                if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            task_id, job_id, idx, chunk_path, language = task
+            stop_heartbeat = threading.Event()
+
+            def keep_alive():
+                while not stop_heartbeat.wait(heartbeat_interval):
+                    if not heartbeat(heartbeat_conn, task_id, worker_id, lease_seconds):
+                        break
+
+            heartbeat_thread = threading.Thread(target=keep_alive, daemon=True)
+            heartbeat_thread.start()
+
+            try:
+                print(f"Worker {worker_id}: segmento {idx} do trabalho {job_id}")
+                text = transcribe_audio_chunk(os.path.join(queue_dir, chunk_path), language, raise_errors=True)
+                if not complete_task(conn, task_id, worker_id, text):
+                    print(f"Worker {worker_id}: concessão do segmento {idx} expirou, resultado descartado")
+                processed += 1
+            except Exception as e:
+                release_task(conn, task_id, worker_id, e)
+            finally:
+                stop_heartbeat.set()
+                heartbeat_thread.join()
+
+            idle_since = time.monotonic()
+            if should_recycle_worker(processed, max_tasks, max_rss_mb):
+                recycled = True
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        heartbeat_conn.close()
+        conn.close()
+
+    print(f"Worker {worker_id} encerrado após {processed} segmentos")
+    if recycled and on_recycle:
+        on_recycle()
+    return processed
+
+
+def exit_for_recycle():
+    sys.exit(RECYCLE_EXIT_CODE)
+
+
+def worker_process_main(queue_dir, idle_timeout=None, max_tasks=None, max_rss_mb=None):
+    run_worker(queue_dir, idle_timeout=idle_timeout, max_tasks=max_tasks, max_rss_mb=max_rss_mb,
+               on_recycle=exit_for_recycle)
+
+
+def supervise_workers(queue_dir, processes=1, idle_timeout=None, max_tasks=None, max_rss_mb=None):
+    def start_worker():
+        worker = multiprocessing.Process(target=worker_process_main, args=(queue_dir, idle_timeout, max_tasks, max_rss_mb))
+        worker.start()
+        return worker
+
+    workers = [start_worker() for _ in range(processes)]
+    try:
+        while workers:
+            for worker in list(workers):
+                worker.join(timeout=1.0 / len(workers))
+                if worker.is_alive():
+                    continue
+                workers.remove(worker)
+                recycled = worker.exitcode == RECYCLE_EXIT_CODE
+                worker.close()
+                if recycled:
+                    workers.append(start_worker())
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.join()
+
+
+def wait_for_job(queue_dir, job_id, progress_callback=None, poll_interval=1.0):
+    conn = open_queue(queue_dir)
+    try:
+        while True:
+            total, finished = conn.execute(
+                "SELECT COUNT(*), SUM(status IN ('done', 'failed')) FROM tasks WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            finished = finished or 0
+
+            if progress_callback and total:
+                progress_callback(int(finished / total * 100))
+
+            if finished >= total:
+                break
+            time.sleep(poll_interval)
+
+        rows = conn.execute(
+            "SELECT idx, status, text FROM tasks WHERE job_id = ? ORDER BY idx",
+            (job_id,)
+        ).fetchall()
+
+        failed = [idx for idx, status, _ in rows if status == "failed"]
+        if failed:
+            print(f"Segmentos que falharam após {MAX_ATTEMPTS} tentativas: {failed}")
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM tasks WHERE job_id = ?", (job_id,))
+        conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    shutil.rmtree(os.path.join(queue_dir, "jobs", job_id), ignore_errors=True)
+    return " ".join(text for _, status, text in rows if status == "done" and text)
+
+
+def run_coordinator(file_path, queue_dir, language="en-US", chunk_length_sec=30, use_cache=True):
+    output_folder, video_path = copy_video_to_folder(file_path)
+    print(f"Criada pasta para o vídeo: {output_folder}")
+
+    with job_workspace(estimate_scratch_bytes(video_path)) as workspace:
+        temp_audio_path = os.path.join(workspace, "temp_audio.wav")
+        error = prepare_audio(video_path, temp_audio_path, use_cache=use_cache)
+        if error:
+            print(error)
+            return None
+
+        job_id = submit_job(queue_dir, temp_audio_path, language, chunk_length_sec)
+
+    if not job_id:
+        print("Falha ao dividir o áudio em segmentos")
+        return None
+
+    def print_progress(percent):
+        print(f"\rSegmentos concluídos: {percent}%", end="", flush=True)
+
+    text = wait_for_job(queue_dir, job_id, print_progress)
+    print()
+
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    output_path = os.path.join(output_folder, f"{video_name}_transcricao.txt")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"Texto completo salvo em: {output_path}")
+
+    index_transcript(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distribute chunk transcription across worker processes")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    coordinator_parser = subparsers.add_parser("coordinator", help="Split a video into chunk tasks and assemble the result")
+    coordinator_parser.add_argument("-f", "--file", required=True, help="Path to the input video file")
+    coordinator_parser.add_argument("-q", "--queue", required=True, help="Queue folder on shared storage")
+    coordinator_parser.add_argument("-l", "--language", default="en-US", help="Language code for speech recognition (default: en-US)")
+    coordinator_parser.add_argument("-c", "--chunk", type=int, default=30, help="Length of audio chunks in seconds (default: 30)")
+    coordinator_parser.add_argument("--no-cache", action="store_true", help="Do not read or write the extracted audio cache")
+
+    worker_parser = subparsers.add_parser("worker", help="Lease and transcribe chunk tasks")
+    worker_parser.add_argument("-q", "--queue", required=True, help="Queue folder on shared storage")
+    worker_parser.add_argument("-n", "--processes", type=int, default=1, help="Worker processes to start on this node (default: 1)")
+    worker_parser.add_argument("--idle-timeout", type=float, help="Exit after this many seconds without tasks")
+    worker_parser.add_argument("--recycle-after", type=int, help="Restart each worker process after this many chunks")
+    worker_parser.add_argument("--recycle-rss", type=float, help="Restart a worker process once its memory use exceeds this many MB")
+
+    args = parser.parse_args()
+
+    if args.mode == "coordinator":
+        sys.exit(0 if run_coordinator(args.file, args.queue, args.language, args.chunk, not args.no_cache) else 1)
+
+    if args.processes <= 1 and not (args.recycle_after or args.recycle_rss):
+        run_worker(args.queue, idle_timeout=args.idle_timeout)
+    else:
+        supervise_workers(args.queue, max(1, args.processes), args.idle_timeout, args.recycle_after, args.recycle_rss)
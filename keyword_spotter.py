@@ -0,0 +1,210 @@
+import os
+import re
+import sys
+import json
+import shutil
+import tempfile
+import argparse
+import unicodedata
+
+import speech_recognition as sr
+from pydub import AudioSegment
+
+from video_transcriber import (
+    download_youtube_video,
+    estimate_scratch_bytes,
+    find_speech_windows,
+    get_audio_cache_key,
+    get_cached_audio_path,
+    job_workspace,
+    load_cached_audio,
+    prepare_audio,
+    recognize_chunk
+)
+
+
+SPHINX_SENSITIVITY = 0.8
+WINDOW_MS = 8000
+CHUNK_MS = 30000
+
+
+def normalize_text(text):
+    text = unicodedata.normalize("NFKD", text or "").lower()
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def find_keywords(text, keywords):
+    normalized = normalize_text(text)
+    return [
+        keyword for keyword in keywords
+        if re.search(r"\b" + re.escape(normalize_text(keyword)) + r"\b", normalized)
+    ]
+
+
+def has_local_detector(language):
+    if not language.lower().startswith("en"):
+        return False
+    try:
+        import pocketsphinx
+        return True
+    except ImportError:
+        return False
+
+
+def sphinx_candidates(recognizer, audio_data, keywords, language):
+    entries = [(normalize_text(keyword), SPHINX_SENSITIVITY) for keyword in keywords]
+    try:
+        detected = recognizer.recognize_sphinx(audio_data, language=language, keyword_entries=entries)
+    except sr.UnknownValueError:
+        return []
+    except Exception:
+        return list(keywords)
+    return find_keywords(detected, keywords)
+
+
+def merge_windows(windows, max_window_ms):
+    merged = []
+    for start_ms, end_ms in windows:
+        if merged and end_ms - merged[-1][0] <= max_window_ms:
+            merged[-1] = (merged[-1][0], end_ms)
+        else:
+            merged.append((start_ms, end_ms))
+    return merged
+
+
+def chunk_windows(windows, duration_ms, chunk_ms):
+    chunks = []
+    for start_ms in range(0, duration_ms, chunk_ms):
+        end_ms = min(start_ms + chunk_ms, duration_ms)
+        if any(start < end_ms and end > start_ms for start, end in windows):
+            chunks.append((start_ms, end_ms))
+    return chunks
+
+
+def spot_keywords_in_audio(audio_path, keywords, language="en-US", first_only=False, window_ms=WINDOW_MS,
+                           progress_callback=None, chunk_ms=CHUNK_MS):
+    audio = AudioSegment.from_wav(audio_path)
+    use_local = has_local_detector(language)
+    recognizer = sr.Recognizer()
+    window_path = os.path.join(os.path.dirname(audio_path), "keyword_window.wav")
+
+    if use_local:
+        windows = find_speech_windows(audio, window_ms)
+        print(f"{len(windows)} janelas com fala em {len(audio) / 1000:.0f}s de áudio")
+    else:
+        speech = find_speech_windows(audio, chunk_ms)
+        windows = merge_windows(speech, chunk_ms)
+        chunks = chunk_windows(speech, len(audio), chunk_ms)
+        if len(chunks) < len(windows):
+            windows = chunks
+        print(f"Detector local indisponível (pocketsphinx, somente inglês); a fala foi agrupada em {len(windows)} "
+              f"blocos de até {chunk_ms / 1000:.0f}s em {len(audio) / 1000:.0f}s de áudio, todos enviados ao Google")
+
+    remaining = list(keywords)
+    hits = []
+    requests_made = 0
+
+    for i, (start_ms, end_ms) in enumerate(windows):
+        if progress_callback:
+            progress_callback(int(i / len(windows) * 100))
+
+        audio[start_ms:end_ms].export(window_path, format="wav")
+
+        if use_local:
+            with sr.AudioFile(window_path) as source:
+                audio_data = recognizer.record(source)
+            candidates = sphinx_candidates(recognizer, audio_data, remaining, language)
+            if not candidates:
+                continue
+
+        result = recognize_chunk(window_path, language, recognizer=recognizer)
+        requests_made += 1
+
+        found = find_keywords(" ".join([result["text"]] + result["alternatives"]), remaining)
+        for keyword in found:
+            hits.append({
+                "keyword": keyword,
+                "start": start_ms / 1000,
+                "end": end_ms / 1000,
+                "text": result["text"],
+                "confidence": result["confidence"]
+            })
+            print(f"[{start_ms / 1000:.1f}s - {end_ms / 1000:.1f}s] {keyword}: {result['text']}")
+
+        if first_only:
+            remaining = [keyword for keyword in remaining if keyword not in found]
+            if not remaining:
+                print("Todos os termos encontrados, encerrando a busca")
+                break
+
+    print(f"{len(hits)} ocorrências com {requests_made} requisições ao Google "
+          f"(uma transcrição completa de {len(audio) / 1000:.0f}s em segmentos de {chunk_ms / 1000:.0f}s usaria "
+          f"{-(-len(audio) // chunk_ms)})")
+    return hits
+
+
+def spot_keywords(source, keywords, language="en-US", first_only=False, use_cache=True):
+    is_url = source.startswith(("http://", "https://"))
+    cache_key = get_audio_cache_key(None if is_url else source, source if is_url else None)
+    cached_path = get_cached_audio_path(cache_key) if use_cache and cache_key else None
+    media_path = source
+    download_folder = None
+
+    try:
+        if is_url and cached_path and os.path.exists(cached_path):
+            media_path = None
+            expected_bytes = os.path.getsize(cached_path)
+        else:
+            if is_url:
+                download_folder = tempfile.mkdtemp(prefix="transcriber_download_")
+                result = download_youtube_video(source, download_folder)
+                if isinstance(result, tuple) and len(result) == 2:
+                    media_path, _ = result
+                else:
+                    media_path = result
+                if not media_path:
+                    print("Falha ao baixar o vídeo")
+                    return None
+            expected_bytes = estimate_scratch_bytes(media_path)
+
+        with job_workspace(expected_bytes) as workspace:
+            audio_path = os.path.join(workspace, "temp_audio.wav")
+
+            if media_path:
+                error = prepare_audio(media_path, audio_path, cache_key, use_cache)
+            elif not load_cached_audio(cache_key, audio_path):
+                error = "Falha ao ler o áudio do cache"
+            else:
+                error = None
+
+            if error:
+                print(error)
+                return None
+
+            return spot_keywords_in_audio(audio_path, keywords, language, first_only)
+    finally:
+        if download_folder:
+            shutil.rmtree(download_folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find where keywords are spoken without transcribing the whole video")
+    parser.add_argument("source", help="Video file or YouTube URL")
+    parser.add_argument("keywords", nargs="+", help="Words or phrases to look for")
+    parser.add_argument("-l", "--language", default="en-US", help="Language code for speech recognition (default: en-US)")
+    parser.add_argument("--first", action="store_true", help="Stop as soon as every keyword has been found once")
+    parser.add_argument("-o", "--output", help="Save the hits as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the extracted audio cache")
+
+    args = parser.parse_args()
+
+    hits = spot_keywords(args.source, args.keywords, args.language, args.first, not args.no_cache)
+    if hits is None:
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(hits, f, ensure_ascii=False, indent=2)
+        print(f"Ocorrências salvas em {args.output}")
+
+    sys.exit(0 if hits else 1)
@@ -0,0 +1,267 @@
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+import subprocess
+import wave
+from collections import deque
+
+import speech_recognition as sr
+from pydub import AudioSegment
+
+from video_transcriber import (
+    EXTRACT_SAMPLE_RATE,
+    FFMPEG_PATH,
+    format_timestamp,
+    is_ffmpeg_available,
+    job_workspace,
+    recognize_chunk
+)
+
+
+LIVE_FRAME_MS = 100
+LIVE_MIN_SEGMENT_MS = 3000
+LIVE_MAX_SEGMENT_MS = 15000
+LIVE_MIN_SILENCE_MS = 600
+LIVE_PADDING_MS = 300
+LIVE_SILENCE_THRESH_DB = -40.0
+LIVE_MAX_PENDING = 4
+LIVE_FOLLOW_TIMEOUT_SEC = 10
+
+
+def build_live_command(source, input_format=None, follow=False, realtime=False, sample_rate=EXTRACT_SAMPLE_RATE):
+    cmd = [FFMPEG_PATH, '-nostdin', '-v', 'error']
+    if realtime:
+        cmd += ['-re']
+    if input_format:
+        cmd += ['-f', input_format]
+    if follow:
+        cmd += ['-follow', '1', '-rw_timeout', str(LIVE_FOLLOW_TIMEOUT_SEC * 1000000)]
+    cmd += [
+        '-i', source, '-vn', '-ac', '1', '-ar', str(sample_rate),
+        '-f', 's16le', '-acodec', 'pcm_s16le', 'pipe:1'
+    ]
+    return cmd
+
+
+class LiveSegmenter:
+    def __init__(self, sample_rate=EXTRACT_SAMPLE_RATE, min_segment_ms=LIVE_MIN_SEGMENT_MS,
+                 max_segment_ms=LIVE_MAX_SEGMENT_MS, min_silence_ms=LIVE_MIN_SILENCE_MS,
+                 silence_thresh_db=LIVE_SILENCE_THRESH_DB, padding_ms=LIVE_PADDING_MS):
+        self.sample_rate = sample_rate
+        self.frame_bytes = sample_rate * 2 * LIVE_FRAME_MS // 1000
+        self.min_frames = min_segment_ms // LIVE_FRAME_MS
+        self.max_frames = max(max_segment_ms // LIVE_FRAME_MS, self.min_frames + 1)
+        self.silence_frames = max(min_silence_ms // LIVE_FRAME_MS, 1)
+        self.padding_frames = padding_ms // LIVE_FRAME_MS
+        self.silence_thresh_db = silence_thresh_db
+        self.buffer = bytearray()
+        self.levels = []
+        self.start_ms = 0
+
+    def frame_level(self, frame):
+        return AudioSegment(data=frame, sample_width=2, frame_rate=self.sample_rate, channels=1).dBFS
+
+    def trailing_silence(self):
+        count = 0
+        for level in reversed(self.levels):
+            if level >= self.silence_thresh_db:
+                break
+            count += 1
+        return count
+
+    def cut(self, frames):
+        data = bytes(self.buffer[:frames * self.frame_bytes])
+        segment = (self.start_ms, self.start_ms + frames * LIVE_FRAME_MS, data)
+        del self.buffer[:frames * self.frame_bytes]
+        del self.levels[:frames]
+        self.start_ms += frames * LIVE_FRAME_MS
+        return segment
+
+    def feed(self, frame):
+        self.buffer.extend(frame)
+        self.levels.append(self.frame_level(frame))
+
+        silence = self.trailing_silence()
+        if silence == len(self.levels):
+            if len(self.levels) > self.padding_frames:
+                self.cut(len(self.levels) - self.padding_frames)
+            return None
+
+        if len(self.levels) >= self.min_frames and silence >= self.silence_frames:
+            return self.cut(len(self.levels) - max(silence - self.padding_frames, 0))
+
+        if len(self.levels) >= self.max_frames:
+            search_from = len(self.levels) * 2 // 3
+            quietest = min(range(search_from, len(self.levels)), key=lambda i: self.levels[i])
+            return self.cut(quietest + 1)
+        return None
+
+    def flush(self):
+        if self.trailing_silence() == len(self.levels):
+            return None
+        return self.cut(len(self.levels))
+
+
+def write_segment_wav(path, data, sample_rate):
+    with wave.open(path, "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(sample_rate)
+        output.writeframes(data)
+
+
+def transcribe_live(source, language="en-US", output_path=None, input_format=None, follow=False, realtime=False,
+                    max_segment_sec=LIVE_MAX_SEGMENT_MS / 1000, max_pending=LIVE_MAX_PENDING, max_lag_sec=None,
+                    workers=1, silence_thresh_db=LIVE_SILENCE_THRESH_DB, on_text=None, stop_event=None):
+    if not is_ffmpeg_available():
+        print(f"FFmpeg não está acessível no caminho {FFMPEG_PATH}")
+        return None
+
+    stop_event = stop_event or threading.Event()
+    sample_rate = EXTRACT_SAMPLE_RATE
+    segmenter = LiveSegmenter(sample_rate, max_segment_ms=int(max_segment_sec * 1000),
+                              silence_thresh_db=silence_thresh_db)
+    segments = queue.Queue(maxsize=max_pending)
+    results = {}
+    emitted = []
+    stats = {"requests": 0, "dropped": 0, "latencies": []}
+    emit_lock = threading.Lock()
+    next_index = [0]
+    error_lines = deque(maxlen=50)
+    output_file = open(output_path, "a", encoding="utf-8") if output_path else None
+
+    def emit_ready():
+        while next_index[0] in results:
+            start_ms, end_ms, text, closed_at = results.pop(next_index[0])
+            next_index[0] += 1
+            if not text:
+                continue
+            latency = time.monotonic() - closed_at
+            stats["latencies"].append(latency)
+            line = f"[{format_timestamp(start_ms / 1000)} - {format_timestamp(end_ms / 1000)}] {text}"
+            print(line, flush=True)
+            emitted.append(text)
+            if output_file:
+                output_file.write(line + "\n")
+                output_file.flush()
+            if on_text:
+                on_text(start_ms / 1000, end_ms / 1000, text)
+
+    def recognizer_worker(workspace, worker_id):
+        recognizer = sr.Recognizer()
+        segment_path = os.path.join(workspace, f"segmento_{worker_id}.wav")
+        while True:
+            item = segments.get()
+            if item is None:
+                break
+            index, start_ms, end_ms, data, closed_at = item
+            text = ""
+            if max_lag_sec is not None and time.monotonic() - closed_at > max_lag_sec:
+                print(f"Segmento {format_timestamp(start_ms / 1000)} descartado: reconhecimento "
+                      f"{time.monotonic() - closed_at:.1f}s atrasado")
+                with emit_lock:
+                    stats["dropped"] += 1
+            else:
+                write_segment_wav(segment_path, data, sample_rate)
+                text = recognize_chunk(segment_path, language, recognizer=recognizer)["text"]
+                with emit_lock:
+                    stats["requests"] += 1
+            with emit_lock:
+                results[index] = (start_ms, end_ms, text, closed_at)
+                emit_ready()
+
+    def submit(segment, index):
+        item = (index,) + segment + (time.monotonic(),)
+        waiting = False
+        while True:
+            try:
+                segments.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                if not waiting:
+                    print("Reconhecimento atrasado; leitura da fonte pausada até liberar a fila")
+                    waiting = True
+
+    print(f"Transcrevendo ao vivo: {source}")
+    with job_workspace() as workspace:
+        threads = [threading.Thread(target=recognizer_worker, args=(workspace, i), daemon=True) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+
+        index = 0
+        with subprocess.Popen(build_live_command(source, input_format, follow, realtime, sample_rate),
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+            stderr_thread = threading.Thread(
+                target=lambda: error_lines.extend(line.decode(errors="replace") for line in process.stderr),
+                daemon=True
+            )
+            stderr_thread.start()
+            try:
+                while not stop_event.is_set():
+                    frame = process.stdout.read(segmenter.frame_bytes)
+                    if not frame:
+                        break
+                    segment = segmenter.feed(frame)
+                    if segment:
+                        submit(segment, index)
+                        index += 1
+            except KeyboardInterrupt:
+                print("\nEncerrando a transcrição ao vivo...")
+            finally:
+                stopped = process.poll() is None
+                if stopped:
+                    process.kill()
+                process.wait()
+                stderr_thread.join(timeout=1)
+
+            segment = segmenter.flush()
+            if segment:
+                submit(segment, index)
+                index += 1
+
+        for _ in threads:
+            segments.put(None)
+        for thread in threads:
+            thread.join()
+
+    if output_file:
+        output_file.close()
+
+    if process.returncode != 0 and not stopped:
+        print(f"FFmpeg encerrou com código {process.returncode}: {''.join(error_lines).strip()}")
+        if not index:
+            return None
+
+    latencies = stats["latencies"]
+    if latencies:
+        print(f"{index} segmentos, {stats['requests']} requisições, {stats['dropped']} descartados por atraso; "
+              f"latência média {sum(latencies) / len(latencies):.1f}s, máxima {max(latencies):.1f}s")
+    else:
+        print(f"{index} segmentos, {stats['requests']} requisições, {stats['dropped']} descartados por atraso")
+    return " ".join(emitted)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transcribe a live or growing source as it plays")
+    parser.add_argument("source", help="Stream URL (RTMP/HLS), file still being written, or audio device (with --format)")
+    parser.add_argument("-l", "--language", default="en-US", help="Language code for speech recognition (default: en-US)")
+    parser.add_argument("-o", "--output", help="Append the timestamped text to this file as it is recognized")
+    parser.add_argument("--format", help="ffmpeg input format for devices (e.g. pulse, alsa, dshow, avfoundation)")
+    parser.add_argument("--follow", action="store_true", help="Keep reading a local file that is still being written")
+    parser.add_argument("--realtime", action="store_true", help="Read a finished file at playback speed, as a live stand-in")
+    parser.add_argument("--max-segment", type=float, default=LIVE_MAX_SEGMENT_MS / 1000, help="Longest segment in seconds before a forced cut (default: 15)")
+    parser.add_argument("--max-pending", type=int, default=LIVE_MAX_PENDING, help="Segments waiting for recognition before reading pauses (default: 4)")
+    parser.add_argument("--max-lag", type=float, help="Drop segments that waited longer than this many seconds, keeping latency bounded")
+    parser.add_argument("--silence-thresh", type=float, default=LIVE_SILENCE_THRESH_DB, help="Frames quieter than this dBFS count as silence (default: -40)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Segments recognized at the same time (default: 1)")
+
+    args = parser.parse_args()
+    if args.language.startswith("auto"):
+        parser.error("a detecção automática de idioma não está disponível no modo ao vivo; use -l com o idioma")
+
+    text = transcribe_live(args.source, args.language, args.output, args.format, args.follow, args.realtime,
+                           args.max_segment, args.max_pending, args.max_lag, args.jobs, args.silence_thresh)
+    sys.exit(0 if text is not None else 1)
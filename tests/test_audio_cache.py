@@ -0,0 +1,59 @@
+import os
+import sys
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+import video_transcriber
+
+
+def test_store_cached_audio_copies_audio_already_in_cache_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_transcriber, "AUDIO_CACHE_DIR", str(tmp_path / "cache" / "audio"))
+    audio_path = str(tmp_path / "temp_audio.wav")
+    Sine(440).to_audio_segment(duration=1000).set_channels(1).set_frame_rate(16000).set_sample_width(2).export(
+        audio_path, format="wav")
+
+    def no_decode(path):
+        raise AssertionError("o áudio já está no formato do cache")
+
+    monkeypatch.setattr(video_transcriber.AudioSegment, "from_wav", no_decode)
+
+    assert video_transcriber.store_cached_audio("mono16k", audio_path)
+    with open(audio_path, "rb") as original, open(video_transcriber.get_cached_audio_path("mono16k"), "rb") as cached:
+        assert original.read() == cached.read()
+
+
+def test_store_cached_audio_converts_other_formats(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_transcriber, "AUDIO_CACHE_DIR", str(tmp_path / "cache" / "audio"))
+    audio_path = str(tmp_path / "temp_audio.wav")
+    Sine(440).to_audio_segment(duration=1000).set_channels(2).set_frame_rate(44100).export(audio_path, format="wav")
+
+    assert video_transcriber.store_cached_audio("estereo", audio_path)
+    with wave.open(video_transcriber.get_cached_audio_path("estereo"), "rb") as f:
+        assert (f.getnchannels(), f.getframerate(), f.getsampwidth()) == (1, 16000, 2)
+
+
+def test_evict_audio_cache_removes_least_recently_used_first(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache" / "audio"
+    cache_dir.mkdir(parents=True)
+    monkeypatch.setattr(video_transcriber, "AUDIO_CACHE_DIR", str(cache_dir))
+
+    for age, name in enumerate(["novo", "medio", "antigo"]):
+        path = cache_dir / f"{name}.wav"
+        path.write_bytes(b"\0" * 100)
+        os.utime(path, (1000000 - age * 100, 1000000 - age * 100))
+
+    video_transcriber.evict_audio_cache(max_bytes=200)
+    assert sorted(os.listdir(cache_dir)) == ["medio.wav", "novo.wav"]
+
+    os.utime(cache_dir / "medio.wav", (2000000, 2000000))
+    video_transcriber.evict_audio_cache(max_bytes=100)
+    assert os.listdir(cache_dir) == ["medio.wav"]
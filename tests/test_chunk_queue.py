@@ -0,0 +1,104 @@
+import os
+import re
+import sys
+import time
+import multiprocessing
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub.generators import Sine
+
+import chunk_queue
+from chunk_queue import MAX_ATTEMPTS, complete_task, lease_task, open_queue, run_worker, submit_job, wait_for_job
+
+
+LEASE_SECONDS = 0.8
+
+
+def make_job(tmp_path, chunks):
+    audio_path = str(tmp_path / "audio.wav")
+    Sine(440).to_audio_segment(duration=chunks * 1000).set_frame_rate(16000).export(audio_path, format="wav")
+    return submit_job(str(tmp_path / "fila"), audio_path, "pt-BR", chunk_length_sec=1)
+
+
+def task_rows(queue_dir, job_id):
+    conn = open_queue(queue_dir)
+    try:
+        return {
+            idx: (status, attempts)
+            for idx, status, attempts in conn.execute(
+                "SELECT idx, status, attempts FROM tasks WHERE job_id = ?", (job_id,)
+            )
+        }
+    finally:
+        conn.close()
+
+
+def test_expired_lease_is_taken_over_and_late_result_rejected(tmp_path):
+    queue_dir = str(tmp_path / "fila")
+    job_id = make_job(tmp_path, 2)
+
+    conn = open_queue(queue_dir)
+    try:
+        task = lease_task(conn, "perdido", lease_seconds=0.2)
+        assert task[2] == 0
+        assert lease_task(conn, "outro", lease_seconds=10)[2] == 1
+        assert lease_task(conn, "outro", lease_seconds=10) is None
+
+        time.sleep(0.3)
+        retried = lease_task(conn, "novo", lease_seconds=10)
+        assert retried[0] == task[0]
+        assert not complete_task(conn, task[0], "perdido", "atrasado")
+        assert complete_task(conn, task[0], "novo", "ok")
+    finally:
+        conn.close()
+
+    assert task_rows(queue_dir, job_id)[0] == ("done", 2)
+
+
+def fake_transcribe(chunk_path, language="en-US", raise_errors=False):
+    idx = int(re.search(r"chunk_(\d+)", chunk_path).group(1))
+    marker = os.path.join(os.path.dirname(chunk_path), f"tentativa_{idx}")
+    first_attempt = not os.path.exists(marker)
+    open(marker, "a").close()
+
+    if idx == 0:
+        time.sleep(LEASE_SECONDS * 2)
+    if idx == 2 and first_attempt:
+        os._exit(9)
+    if idx == 4:
+        raise RuntimeError("falha permanente")
+    time.sleep(0.05)
+    return f"parte{idx}"
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs fork to inherit the patched recognizer")
+def test_workers_recover_lost_leases_and_reassemble_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunk_queue, "transcribe_audio_chunk", fake_transcribe)
+    queue_dir = str(tmp_path / "fila")
+    job_id = make_job(tmp_path, 6)
+
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(queue_dir, f"worker{i}"),
+                                kwargs={"idle_timeout": 2, "poll_interval": 0.05, "lease_seconds": LEASE_SECONDS})
+        for i in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert not worker.is_alive()
+    assert sorted(worker.exitcode for worker in workers) == [0, 9]
+
+    rows = task_rows(queue_dir, job_id)
+    assert rows[0] == ("done", 1)
+    assert rows[2] == ("done", 2)
+    assert rows[4] == ("failed", MAX_ATTEMPTS)
+
+    assert wait_for_job(queue_dir, job_id, poll_interval=0.05) == "parte0 parte1 parte2 parte3 parte5"
+    assert task_rows(queue_dir, job_id) == {}
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub.generators import Sine
+
+from video_transcriber import get_chunk_count, join_segments_text, split_audio_into_chunks
+
+
+def test_chunk_count_does_not_add_a_chunk_made_only_of_overlap():
+    assert get_chunk_count(60000, 30000) == 2
+    assert get_chunk_count(62000, 30000, 2000) == 2
+    assert get_chunk_count(62001, 30000, 2000) == 3
+    assert get_chunk_count(1000, 30000, 2000) == 1
+    assert get_chunk_count(0, 30000) == 0
+
+
+def test_split_with_overlap_covers_the_audio_without_a_tail_chunk(tmp_path):
+    audio_path = str(tmp_path / "audio.wav")
+    Sine(440).to_audio_segment(duration=12000).export(audio_path, format="wav")
+
+    chunks = split_audio_into_chunks(audio_path, 5000, str(tmp_path / "chunks"), overlap_ms=2000)
+
+    assert len(chunks) == 2
+    assert [os.path.getsize(chunk) for chunk in chunks][0] == os.path.getsize(chunks[1])
+
+
+def test_refined_window_overlapping_its_neighbours_is_deduplicated():
+    segments = [
+        {"start": 0.0, "end": 30.0, "text": "bom dia a todos hoje vamos falar"},
+        {"start": 29.0, "end": 61.0, "text": "vamos falar sobre o orçamento do ano que vem"},
+        {"start": 60.0, "end": 90.0, "text": "ano que vem e das metas"},
+    ]
+    assert join_segments_text(segments) == "bom dia a todos hoje vamos falar sobre o orçamento do ano que vem e das metas"
+
+
+def test_failed_chunking_writes_no_transcript(tmp_path, monkeypatch):
+    import video_transcriber
+
+    monkeypatch.setenv("TRANSCRIBER_SCRATCH", str(tmp_path / "scratch"))
+    monkeypatch.setattr(video_transcriber, "split_audio_into_chunks", lambda *args, **kwargs: [])
+
+    def fake_prepare(video_path, audio_path, cache_key=None, use_cache=True, shards=0):
+        Sine(440).to_audio_segment(duration=1000).export(audio_path, format="wav")
+
+    monkeypatch.setattr(video_transcriber, "prepare_audio", fake_prepare)
+
+    video_path = str(tmp_path / "video.mp4")
+    open(video_path, "wb").close()
+    output_path = str(tmp_path / "video_transcricao.txt")
+
+    result = video_transcriber.extract_speech_from_video(video_path, output_path, "pt-BR", use_cache=False)
+
+    assert result == "Falha ao dividir o áudio em segmentos"
+    assert not os.path.exists(output_path)
+    assert not os.path.exists(str(tmp_path / "video_segmentos.json"))
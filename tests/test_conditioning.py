@@ -0,0 +1,79 @@
+import os
+import sys
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+import audio_conditioning
+import video_transcriber
+from audio_conditioning import condition_samples, condition_wav, is_gated, write_wav
+
+
+SAMPLE_RATE = 16000
+
+
+def quiet_recording(seconds, speech_every=20, speech_length=8):
+    rng = np.random.default_rng(0)
+    t = np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE
+    speech = (t % speech_every) < speech_length
+    samples = rng.normal(0, 30, len(t)) + 500
+    samples += speech * 300 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    return samples.astype(np.float32), speech
+
+
+def test_conditioning_removes_dc_gates_noise_and_normalizes_speech():
+    samples, speech = quiet_recording(60)
+    conditioned, is_open, gain_db = condition_samples(samples, SAMPLE_RATE)
+
+    assert gain_db > 10
+    assert abs(conditioned.mean()) < 5
+    speech_rms = np.sqrt(np.mean(np.square(conditioned[speech].astype(np.float64))))
+    assert -23 < 20 * np.log10(speech_rms / 32768) < -17
+    assert np.abs(conditioned[~speech][SAMPLE_RATE:-SAMPLE_RATE]).max() < np.abs(conditioned).max()
+    assert 0.3 < is_open.mean() < 0.6
+
+
+def test_block_processing_matches_a_single_pass(monkeypatch):
+    samples, _ = quiet_recording(30)
+    expected, expected_open, expected_gain = condition_samples(samples, SAMPLE_RATE)
+
+    monkeypatch.setattr(audio_conditioning, "BLOCK_SAMPLES", 12345)
+    conditioned, is_open, gain_db = condition_samples(samples, SAMPLE_RATE)
+
+    assert gain_db == pytest.approx(expected_gain, abs=1e-3)
+    assert (is_open == expected_open).all()
+    assert np.abs(conditioned.astype(np.int32) - expected).max() <= 1
+
+
+def test_silent_chunks_are_skipped_without_requests(tmp_path, monkeypatch):
+    samples, _ = quiet_recording(40, speech_every=40, speech_length=8)
+    audio_path = str(tmp_path / "temp_audio.wav")
+    write_wav(audio_path, samples, SAMPLE_RATE)
+
+    conditioning = condition_wav(audio_path, str(tmp_path / "condicionado.wav"))
+    assert not is_gated(conditioning, 0, 10000)
+    assert is_gated(conditioning, 10000, 40000)
+
+    requests = []
+
+    def fake_recognize(path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+        requests.append(path)
+        return {"text": "fala", "confidence": 0.9, "alternatives": []}
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(video_transcriber.CONDITION_ENV, "1")
+    monkeypatch.setattr(video_transcriber, "recognize_chunk", fake_recognize)
+    segments = video_transcriber.transcribe_audio_segments(audio_path, "pt-BR", chunk_length_sec=10)
+
+    assert len(segments) == 4
+    assert len(requests) == 1
+    assert [bool(segment.get("skipped")) for segment in segments] == [False, True, True, True]
+    assert not os.path.exists(str(tmp_path / "temp_audio_condicionado.wav"))
+    with wave.open(audio_path, "rb") as f:
+        assert f.getnframes() == len(samples)
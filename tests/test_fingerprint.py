@@ -0,0 +1,83 @@
+import os
+import sys
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+import video_transcriber
+from audio_fingerprint import FingerprintIndex, compute_fingerprint
+
+
+SAMPLE_RATE = 16000
+
+
+def melody(seconds, seed):
+    rng = np.random.default_rng(seed)
+    notes = rng.uniform(150, 400, size=int(seconds * 4))
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    current = notes[(t * 4).astype(int)]
+    signal = sum(np.sin(2 * np.pi * current * harmonic * t) / harmonic for harmonic in range(1, 11))
+    return (signal * 32767 * 0.2).astype(np.float32)
+
+
+def write_wav(path, samples):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(np.clip(samples, -32768, 32767).astype("<i2").tobytes())
+
+
+def test_repeated_audio_matches_despite_shift_and_noise(tmp_path):
+    intro = melody(10, seed=1)
+    noisy = np.roll(intro, 700) * 0.6 + np.random.default_rng(0).normal(0, 200, len(intro))
+
+    with FingerprintIndex(str(tmp_path / "impressoes.db")) as index:
+        index.add(compute_fingerprint(intro, SAMPLE_RATE), "pt-BR", "abertura do programa", 0.9)
+
+        match = index.lookup(compute_fingerprint(noisy.astype(np.float32), SAMPLE_RATE), "pt-BR")
+        assert match and match["text"] == "abertura do programa"
+        assert index.lookup(compute_fingerprint(noisy.astype(np.float32), SAMPLE_RATE), "en-US") is None
+        assert index.lookup(compute_fingerprint(melody(10, seed=2), SAMPLE_RATE), "pt-BR") is None
+        assert index.stats()["hits"] == 1
+
+
+def test_partly_overlapping_audio_is_not_reused(tmp_path):
+    stored = melody(30, seed=1)
+    partial = np.concatenate([stored[:20 * SAMPLE_RATE], melody(10, seed=5)])
+    mostly_same = np.concatenate([stored[:27 * SAMPLE_RATE], melody(3, seed=6)])
+
+    with FingerprintIndex(str(tmp_path / "impressoes.db")) as index:
+        index.add(compute_fingerprint(stored, SAMPLE_RATE), "pt-BR", "bloco completo", 0.9)
+
+        assert index.lookup(compute_fingerprint(partial, SAMPLE_RATE), "pt-BR") is None
+        assert index.lookup(compute_fingerprint(mostly_same, SAMPLE_RATE), "pt-BR") is None
+        assert index.lookup(compute_fingerprint(stored, SAMPLE_RATE), "pt-BR")["text"] == "bloco completo"
+
+
+def test_transcription_reuses_chunks_seen_in_earlier_jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(video_transcriber.DEDUPE_ENV, "1")
+    intro = melody(5, seed=1)
+    requests = []
+
+    def fake_recognize(path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+        requests.append(path)
+        return {"text": f"texto {len(requests)}", "confidence": 0.9, "alternatives": []}
+
+    monkeypatch.setattr(video_transcriber, "recognize_chunk", fake_recognize)
+
+    for episode, seed in enumerate((10, 20)):
+        audio_path = str(tmp_path / f"episodio_{episode}.wav")
+        write_wav(audio_path, np.concatenate([intro, melody(5, seed=seed)]))
+        segments = video_transcriber.transcribe_audio_segments(audio_path, "pt-BR", chunk_length_sec=5)
+
+    assert len(requests) == 3
+    assert segments[0]["reused"] and segments[0]["text"] == "texto 1"
+    assert not segments[1].get("reused")
@@ -0,0 +1,70 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub.generators import Sine
+
+import keyword_spotter
+from keyword_spotter import find_keywords
+
+
+def test_find_keywords_ignores_case_and_accents():
+    assert find_keywords("A Reunião começa às nove", ["reuniao", "Nove", "dez"]) == ["reuniao", "Nove"]
+    assert find_keywords("preço", ["preç"]) == []
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_url_download_outside_scratch_with_title_tuple(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scratch = tmp_path / "scratch"
+    monkeypatch.setenv("TRANSCRIBER_SCRATCH", str(scratch))
+    download_folders = []
+
+    def fake_download(url, output_folder=None, progress_callback=None, video_title=None):
+        download_folders.append(output_folder)
+        path = os.path.join(output_folder, "video.wav")
+        Sine(440).to_audio_segment(duration=2000).export(path, format="wav")
+        return path, "Título do vídeo"
+
+    def fake_spot(audio_path, keywords, language, first_only):
+        assert os.path.getsize(audio_path) > 0
+        return [{"keyword": keywords[0], "start": 0.0, "end": 2.0}]
+
+    monkeypatch.setattr(keyword_spotter, "download_youtube_video", fake_download)
+    monkeypatch.setattr(keyword_spotter, "spot_keywords_in_audio", fake_spot)
+
+    hits = keyword_spotter.spot_keywords("https://www.youtube.com/watch?v=abc123def45", ["termo"], use_cache=False)
+
+    assert hits == [{"keyword": "termo", "start": 0.0, "end": 2.0}]
+    assert not download_folders[0].startswith(str(scratch))
+    assert not os.path.exists(download_folders[0])
+
+
+def test_without_local_detector_speech_is_grouped_into_chunks(tmp_path, monkeypatch):
+    from pydub import AudioSegment
+
+    burst = Sine(440).to_audio_segment(duration=1500, volume=-10)
+    pause = AudioSegment.silent(duration=1500)
+    audio = sum([burst + pause] * 20, AudioSegment.empty()) + AudioSegment.silent(duration=30000)
+    audio_path = str(tmp_path / "fala.wav")
+    audio.set_channels(1).set_frame_rate(16000).export(audio_path, format="wav")
+    requests = []
+
+    def fake_recognize(path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+        requests.append(len(AudioSegment.from_wav(path)))
+        return {"text": "a reunião", "confidence": 0.9, "alternatives": []}
+
+    monkeypatch.setattr(keyword_spotter, "recognize_chunk", fake_recognize)
+
+    hits = keyword_spotter.spot_keywords_in_audio(audio_path, ["reuniao"], language="pt-BR")
+
+    assert len(requests) <= 3
+    assert max(requests) <= 30000
+    assert hits[0]["keyword"] == "reuniao"
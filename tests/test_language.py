@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+import video_transcriber
+from video_transcriber import pick_excerpt_regions
+
+
+def test_excerpts_are_evenly_spaced_and_short():
+    regions = pick_excerpt_regions(3600000, 3, 60000)
+    assert regions == [(570000, 630000), (1770000, 1830000), (2970000, 3030000)]
+    assert pick_excerpt_regions(30000, 3, 60000) == [(0, 10000), (10000, 20000), (20000, 30000)]
+
+
+def test_detect_language_reads_only_the_sampled_excerpts(tmp_path, monkeypatch):
+    speech = Sine(300).to_audio_segment(duration=4000, volume=-10) + AudioSegment.silent(2000, frame_rate=44100)
+    audio = (speech * 50).set_frame_rate(16000).set_channels(1)
+    audio_path = str(tmp_path / "temp_audio.wav")
+    audio.export(audio_path, format="wav")
+
+    def refuse_full_load(*args, **kwargs):
+        raise AssertionError("the whole file must not be loaded")
+
+    calls = []
+
+    def fake_recognize(path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+        calls.append((language, len(AudioSegment.from_file(path))))
+        return {"text": "x", "confidence": 0.9 if language == "pt-BR" else 0.3, "alternatives": []}
+
+    monkeypatch.setattr(video_transcriber.AudioSegment, "from_wav", refuse_full_load)
+    monkeypatch.setattr(video_transcriber, "recognize_chunk", fake_recognize)
+
+    assert video_transcriber.detect_language(audio_path, ["en-US", "pt-BR"]) == "pt-BR"
+    assert len(calls) == 6
+    assert all(2000 <= length <= 8000 for _, length in calls)
+    assert not os.path.exists(str(tmp_path / "language_samples"))
@@ -0,0 +1,91 @@
+import os
+import shutil
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub.generators import Sine
+
+import live_transcriber
+from live_transcriber import LIVE_FRAME_MS, LiveSegmenter
+from video_transcriber import get_wav_duration_ms
+
+
+def frames_of(segment, segmenter):
+    data = segment.set_frame_rate(segmenter.sample_rate).set_channels(1).set_sample_width(2).raw_data
+    return [data[i:i + segmenter.frame_bytes] for i in range(0, len(data), segmenter.frame_bytes)]
+
+
+def run_segmenter(segmenter, audio):
+    segments = []
+    for frame in frames_of(audio, segmenter):
+        segment = segmenter.feed(frame)
+        if segment:
+            segments.append(segment)
+    segment = segmenter.flush()
+    if segment:
+        segments.append(segment)
+    return segments
+
+
+def tone(ms):
+    return Sine(440).to_audio_segment(duration=ms, volume=-10)
+
+
+def silence(ms):
+    return tone(ms) - 120
+
+
+def test_segments_close_on_silence_and_skip_silent_stretches():
+    segmenter = LiveSegmenter()
+    audio = silence(2000) + tone(4000) + silence(3000) + tone(3500) + silence(1000)
+    segments = run_segmenter(segmenter, audio)
+
+    assert len(segments) == 2
+    first_start, first_end, data = segments[0]
+    assert 1500 <= first_start <= 2000
+    assert 6000 <= first_end <= 6500
+    assert len(data) == (first_end - first_start) // LIVE_FRAME_MS * segmenter.frame_bytes
+    assert 8500 <= segments[1][0] <= 9000
+
+
+def test_long_speech_is_cut_at_max_length():
+    segmenter = LiveSegmenter(max_segment_ms=5000)
+    segments = run_segmenter(segmenter, tone(12000))
+
+    assert all(end - start <= 5000 for start, end, _ in segments)
+    assert segments[0][0] == 0
+    assert segments[-1][1] == 12000
+    assert all(previous[1] == current[0] for previous, current in zip(segments, segments[1:]))
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_transcribe_live_emits_segments_in_order(tmp_path, monkeypatch):
+    source = str(tmp_path / "fonte.wav")
+    (tone(4000) + silence(1500) + tone(2500) + silence(1500)).export(source, format="wav")
+    output = str(tmp_path / "ao_vivo.txt")
+
+    def fake_recognize(path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+        if get_wav_duration_ms(path) > 3500:
+            time.sleep(0.3)
+            return {"text": "longo", "confidence": 0.9, "alternatives": []}
+        return {"text": "curto", "confidence": 0.9, "alternatives": []}
+
+    monkeypatch.setattr(live_transcriber, "recognize_chunk", fake_recognize)
+    monkeypatch.setenv("TRANSCRIBER_SCRATCH", str(tmp_path / "scratch"))
+    received = []
+
+    text = live_transcriber.transcribe_live(source, output_path=output, max_pending=1, workers=2,
+                                            on_text=lambda start, end, text: received.append((start, end, text)))
+
+    assert text == "longo curto"
+    assert [item[2] for item in received] == ["longo", "curto"]
+    assert received[0][1] <= received[1][0]
+    with open(output, encoding="utf-8") as f:
+        assert f.read().splitlines()[1].startswith("[00:00:05 - ")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from video_transcriber import estimate_makespan
+
+
+def test_makespan_is_bounded_by_the_longest_file():
+    assert estimate_makespan([100, 1, 1, 1], 4) == 100
+    assert estimate_makespan([100, 1, 1, 1], 2) == 100
+
+
+def test_makespan_balances_files_across_jobs():
+    assert estimate_makespan([3, 3, 2, 2, 2], 2) == 7
+    assert estimate_makespan([10, 10, 10, 10], 2) == 20
+    assert estimate_makespan([5, 5], 1) == 10
+    assert estimate_makespan([], 3) == 0
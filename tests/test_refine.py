@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub import AudioSegment
+
+import video_transcriber
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_refine_reextracts_the_track_of_a_track_transcript(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TRANSCRIBER_SCRATCH", str(tmp_path / "scratch"))
+    monkeypatch.setattr(video_transcriber, "index_transcript", lambda path: None)
+
+    video_path = str(tmp_path / "gravacao.mkv")
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error",
+         "-f", "lavfi", "-i", "anullsrc=r=16000:cl=mono:d=4",
+         "-f", "lavfi", "-i", "sine=frequency=440:duration=4",
+         "-map", "0", "-map", "1", "-c:a", "flac", video_path],
+        check=True
+    )
+
+    segments_path = str(tmp_path / "gravacao_faixa1_segmentos.json")
+    with open(segments_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "video_path": video_path,
+            "language": "en-US",
+            "track": 1,
+            "cache_key": None,
+            "segments": [{"index": 0, "start": 0.0, "end": 4.0, "text": "", "confidence": 0.0, "alternatives": []}]
+        }, f)
+
+    levels = []
+
+    def fake_recognize(path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+        levels.append(AudioSegment.from_wav(path).dBFS)
+        return {"text": "faixa um", "confidence": 0.95, "alternatives": []}
+
+    monkeypatch.setattr(video_transcriber, "recognize_chunk", fake_recognize)
+
+    text = video_transcriber.refine_transcription(segments_path)
+
+    assert text == "faixa um"
+    assert levels and levels[0] > -40
+    with open(str(tmp_path / "gravacao_faixa1_transcricao.txt"), encoding="utf-8") as f:
+        assert f.read() == "faixa um"
+    assert not os.path.exists(video_transcriber.AUDIO_CACHE_DIR)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_refine_keeps_range_blocks_and_extracts_only_the_ranges(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TRANSCRIBER_SCRATCH", str(tmp_path / "scratch"))
+    monkeypatch.setattr(video_transcriber, "index_transcript", lambda path: None)
+
+    def no_full_decode(*args, **kwargs):
+        raise AssertionError("o arquivo inteiro não deve ser decodificado")
+
+    monkeypatch.setattr(video_transcriber, "prepare_audio", no_full_decode)
+
+    video_path = str(tmp_path / "palestra.mkv")
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=60:sample_rate=16000",
+         "-c:a", "flac", video_path],
+        check=True
+    )
+
+    segments_path = str(tmp_path / "palestra_segmentos.json")
+    with open(segments_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "video_path": video_path,
+            "language": "pt-BR",
+            "cache_key": None,
+            "ranges": [[0.0, 10.0], [40.0, 50.0]],
+            "segments": [
+                {"index": 0, "start": 0.0, "end": 10.0, "text": "t1", "confidence": 0.9, "alternatives": []},
+                {"index": 1, "start": 40.0, "end": 50.0, "text": "t2", "confidence": 0.2, "alternatives": []}
+            ]
+        }, f)
+
+    windows = []
+
+    def fake_recognize(path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+        windows.append(len(AudioSegment.from_wav(path)))
+        return {"text": "t2 melhor", "confidence": 0.95, "alternatives": []}
+
+    monkeypatch.setattr(video_transcriber, "recognize_chunk", fake_recognize)
+
+    text = video_transcriber.refine_transcription(segments_path)
+
+    assert text == "[00:00:00 - 00:00:10]\nt1\n\n[00:00:40 - 00:00:50]\nt2 melhor"
+    assert len(windows) == 1 and 9900 <= windows[0] <= 11000
+    with open(segments_path, encoding="utf-8") as f:
+        refined = json.load(f)["segments"][1]
+    assert 39.0 <= refined["start"] <= 40.0 and refined["end"] <= 50.0
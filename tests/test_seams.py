@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from video_transcriber import dedupe_seam, join_segments_text
+
+
+def test_dedupe_seam_drops_words_repeated_across_the_seam():
+    previous = "e agora vamos ver os resultados do trimestre".split()
+    words = "Resultados do trimestre, que foram bons".split()
+    assert dedupe_seam(previous, words) == (0, ["que", "foram", "bons"])
+
+
+def test_dedupe_seam_tolerates_a_cut_word_at_the_edges():
+    previous = "falamos sobre o novo contr".split()
+    words = "o novo contrato foi assinado".split()
+    assert dedupe_seam(previous, words) == (1, ["contrato", "foi", "assinado"])
+
+
+def test_dedupe_seam_keeps_text_without_a_real_overlap():
+    previous = "a reunião de hoje começou às nove e terminou bem mais cedo".split()
+    assert dedupe_seam(previous, "depois fomos almoçar".split()) == (0, ["depois", "fomos", "almoçar"])
+    words = "a reunião de amanhã será remota".split()
+    assert dedupe_seam(previous, words) == (0, words)
+
+
+def test_join_only_dedupes_overlapping_segments():
+    segments = [
+        {"start": 0.0, "end": 30.0, "text": "um dois três"},
+        {"start": 30.0, "end": 60.0, "text": "dois três quatro"},
+    ]
+    assert join_segments_text(segments) == "um dois três dois três quatro"
+    segments[1]["start"] = 28.0
+    assert join_segments_text(segments) == "um dois três quatro"
+
+
+def test_join_drops_the_cut_word_left_at_the_end_of_the_previous_segment():
+    segments = [
+        {"start": 0.0, "end": 32.0, "text": "falamos sobre o novo contr"},
+        {"start": 30.0, "end": 62.0, "text": "o novo contrato foi assinado"},
+    ]
+    assert join_segments_text(segments) == "falamos sobre o novo contrato foi assinado"
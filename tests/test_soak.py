@@ -0,0 +1,76 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from pydub import AudioSegment
+
+from video_transcriber import (
+    SCRATCH_DIR_ENV,
+    find_speech_windows,
+    get_open_fd_count,
+    get_rss_mb,
+    job_workspace,
+    prepare_audio,
+    split_audio_into_chunks
+)
+
+
+VIDEO_COUNT = 20
+WARMUP_COUNT = 3
+MAX_RSS_GROWTH_MB = 30
+
+
+def make_video(path, seconds=4):
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error",
+         "-f", "lavfi", "-i", f"testsrc=size=64x64:rate=5:duration={seconds}",
+         "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+         "-shortest", "-c:v", "mpeg4", "-c:a", "aac", path],
+        check=True
+    )
+
+
+def process_one(video_path):
+    with job_workspace() as workspace:
+        audio_path = os.path.join(workspace, "temp_audio.wav")
+        error = prepare_audio(video_path, audio_path, use_cache=False)
+        assert error is None
+        chunks = split_audio_into_chunks(audio_path, 1500, os.path.join(workspace, "chunks"), overlap_ms=300)
+        assert chunks
+        find_speech_windows(AudioSegment.from_wav(audio_path))
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_many_videos_do_not_leak_fds_or_memory(tmp_path, monkeypatch):
+    if get_open_fd_count() is None or get_rss_mb() is None:
+        pytest.skip("fd/RSS counters not available on this platform")
+
+    monkeypatch.chdir(tmp_path)
+    scratch = tmp_path / "scratch"
+    monkeypatch.setenv(SCRATCH_DIR_ENV, str(scratch))
+    videos = []
+    for i in range(VIDEO_COUNT):
+        path = str(tmp_path / f"video_{i:02d}.mp4")
+        make_video(path)
+        videos.append(path)
+
+    for path in videos[:WARMUP_COUNT]:
+        process_one(path)
+
+    fds_before = get_open_fd_count()
+    rss_before = get_rss_mb()
+
+    for path in videos[WARMUP_COUNT:]:
+        process_one(path)
+
+    assert get_open_fd_count() <= fds_before
+    assert get_rss_mb() - rss_before < MAX_RSS_GROWTH_MB
+    assert [name for name in os.listdir(scratch) if name.startswith("transcriber_job_")] == []
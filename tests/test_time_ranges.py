@@ -0,0 +1,54 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+import video_transcriber
+from video_transcriber import format_timestamp, merge_time_ranges, parse_time_ranges, parse_timestamp
+
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp("45") == 45
+    assert parse_timestamp("10:30") == 630
+    assert parse_timestamp("1:02:03") == 3723
+    assert format_timestamp(3723) == "01:02:03"
+
+
+def test_overlapping_and_adjacent_ranges_are_merged():
+    assert parse_time_ranges("10:00-20:00; 15:00-25:00, 25:00-26:00") == [(600.0, 1560.0)]
+    assert parse_time_ranges("1:00:00-1:05:00;0-30") == [(0.0, 30.0), (3600.0, 3900.0)]
+
+
+def test_open_ended_range_absorbs_later_ranges():
+    assert parse_time_ranges("50:00-;55:00-1:10:00;2:00:00-2:10:00") == [(3000.0, None)]
+    assert merge_time_ranges([(100.0, 200.0), (0.0, None)]) == [(0.0, None)]
+
+
+def test_invalid_ranges_are_rejected():
+    with pytest.raises(ValueError):
+        parse_time_ranges("20:00-10:00")
+    with pytest.raises(ValueError):
+        parse_time_ranges("10:00")
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_range_extraction_works_without_ffprobe(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_transcriber, "probe_media", lambda path: None)
+    media_path = str(tmp_path / "audio.mkv")
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=20:sample_rate=16000",
+         "-c:a", "flac", media_path],
+        check=True
+    )
+
+    assert video_transcriber.extract_audio_range(media_path, str(tmp_path / "a.wav"), 5.0, 8.0) == pytest.approx((5.0, 8.0), abs=0.05)
+    start_sec, end_sec = video_transcriber.extract_audio_range(media_path, str(tmp_path / "b.wav"), 15.0)
+    assert start_sec == 15.0 and abs(end_sec - 20.0) < 0.1
+    assert video_transcriber.extract_audio_range(media_path, str(tmp_path / "c.wav"), 30.0, 40.0) is None
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+from watch_folder import MAX_ATTEMPTS, ProcessedRecord
+
+
+def test_failed_files_are_retried_up_to_the_limit(tmp_path):
+    video_path = tmp_path / "aula.mp4"
+    video_path.write_bytes(b"\0" * 10)
+    stat = os.stat(video_path)
+    record = ProcessedRecord(str(tmp_path / "estado.json"))
+
+    for _ in range(MAX_ATTEMPTS - 1):
+        record.mark(str(video_path), stat, "erro")
+        assert not record.is_processed(str(video_path), stat)
+    record.mark(str(video_path), stat, "erro")
+    assert ProcessedRecord(str(tmp_path / "estado.json")).is_processed(str(video_path), stat)
+
+    video_path.write_bytes(b"\0" * 20)
+    changed = os.stat(video_path)
+    assert not record.is_processed(str(video_path), changed)
+    record.mark(str(video_path), changed, "ok", "aula_transcricao.txt")
+    assert record.is_processed(str(video_path), changed)
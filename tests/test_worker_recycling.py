@@ -0,0 +1,57 @@
+import os
+import sys
+import threading
+import multiprocessing
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pydub")
+pytest.importorskip("speech_recognition")
+
+import watch_folder
+from video_transcriber import should_recycle_worker
+
+
+def fake_process_video_file(path, *args, **kwargs):
+    if path == "boom":
+        raise ValueError("falhou")
+    if path == "crash":
+        os._exit(9)
+    return path + "_transcricao.txt", "texto"
+
+
+def test_should_recycle_worker_by_job_count():
+    assert not should_recycle_worker(1, max_jobs=2)
+    assert should_recycle_worker(2, max_jobs=2)
+    assert not should_recycle_worker(100)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs fork to inherit the patched job")
+def test_recycling_pool_survives_errors_and_crashes(monkeypatch):
+    monkeypatch.setattr(watch_folder, "process_video_file", fake_process_video_file)
+    paths = ["a", "b", "boom", "c", "crash", "d", "e"]
+    results = {}
+    done = threading.Event()
+
+    def callback(path):
+        def finished(output, error):
+            results[path] = (output, error)
+            if len(results) == len(paths):
+                done.set()
+        return finished
+
+    pool = watch_folder.RecyclingProcessPool(2, 2)
+    try:
+        for path in paths:
+            pool.submit((path, "en-US", 30, False), callback(path))
+        assert done.wait(30)
+    finally:
+        pool.shutdown()
+
+    assert results["a"] == ("a_transcricao.txt", None)
+    assert results["e"] == ("e_transcricao.txt", None)
+    assert results["boom"] == (None, "falhou")
+    assert results["crash"][0] is None
+    assert "9" in results["crash"][1]
@@ -7,24 +7,152 @@ import subprocess
 import time
 from pathlib import Path
 import json
+import queue
 import shutil
+from collections import deque
 from datetime import datetime
 
 try:
     from video_transcriber import (
-        extract_speech_from_video, 
-        download_youtube_video, 
-        create_video_folder
+        process_video_file,
+        process_youtube_video,
+        is_youtube_collection,
+        expand_youtube_playlist,
+        parse_time_ranges
     )
+    from transcript_index import update_index, search_transcripts, get_indexed_youtube_ids
 except ImportError:
     messagebox.showerror("Erro", "O arquivo video_transcriber.py não foi encontrado. Por favor, certifique-se de que ele está no mesmo diretório que este script.")
     sys.exit(1)
 
+JOB_STATUS_LABELS = {
+    "queued": "Na fila",
+    "running": "Executando",
+    "done": "Concluído",
+    "failed": "Erro",
+    "cancelled": "Cancelado"
+}
+
+LOG_MAX_LINES = 1000
+JOB_LOG_MAX_LINES = 2000
+LOG_RENDER_INTERVAL_SEC = 0.25
+MAX_UI_EVENTS_PER_TICK = 500
+JOB_LOG_SPOOL_DIR = os.path.join("videos", ".logs")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class TranscriptionJob:
+    def __init__(self, job_id, kind, source, title, language, chunk_size):
+        self.job_id = job_id
+        self.kind = kind
+        self.source = source
+        self.title = title
+        self.language = language
+        self.chunk_size = chunk_size
+        self.status = "queued"
+        self.progress = 0
+        self.phase = None
+        self.details = None
+        self.log_lines = deque(maxlen=JOB_LOG_MAX_LINES)
+        self.pending_log_lines = []
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.folder = None
+        self.output_path = None
+        self.profile = False
+        self.ranges = None
+        self.overlap = 0
+        self.widgets = {}
+        self.log_widget = None
+
+
+class JobLogWriter:
+    def __init__(self):
+        self.session = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def spool_path(self, job_id):
+        return os.path.join(JOB_LOG_SPOOL_DIR, f"{self.session}_trabalho{job_id}.txt")
+    
+    def write(self, job, line):
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.queue.put(("write", job.job_id, f"[{timestamp}] {line}\n"))
+    
+    def finish(self, job):
+        self.queue.put(("finish", job.job_id, job.output_path))
+    
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+    
+    def run(self):
+        files = {}
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            
+            action, job_id, value = item
+            try:
+                if action == "write":
+                    log_file = files.get(job_id)
+                    if log_file is None:
+                        os.makedirs(JOB_LOG_SPOOL_DIR, exist_ok=True)
+                        log_file = open(self.spool_path(job_id), "a", encoding="utf-8")
+                        files[job_id] = log_file
+                    log_file.write(value)
+                    if self.queue.empty():
+                        log_file.flush()
+                elif action == "finish":
+                    log_file = files.pop(job_id, None)
+                    if log_file:
+                        log_file.close()
+                    spool_path = self.spool_path(job_id)
+                    if value and os.path.exists(spool_path):
+                        log_path = value[:-len("_transcricao.txt")] if value.endswith("_transcricao.txt") else os.path.splitext(value)[0]
+                        shutil.move(spool_path, log_path + "_log.txt")
+            except Exception as e:
+                if sys.__stderr__:
+                    sys.__stderr__.write(f"Erro ao gravar o log do trabalho {job_id}: {e}\n")
+        
+        for log_file in files.values():
+            log_file.close()
+
+
+class ThreadRoutedStream:
+    def __init__(self, original, app):
+        self.original = original
+        self.app = app
+        self.buffers = {}
+    
+    def write(self, text):
+        job = self.app.thread_jobs.get(threading.get_ident())
+        if job is None:
+            if self.original:
+                self.original.write(text)
+            return
+        
+        lines = (self.buffers.get(job.job_id, "") + text).replace("\r", "\n").split("\n")
+        for line in lines[:-1]:
+            if line.strip():
+                self.app.post_job_log(job, line)
+        self.buffers[job.job_id] = lines[-1]
+    
+    def flush(self):
+        if self.original:
+            self.original.flush()
+
+
 class VideoTranscriberApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Extrator de Texto de Vídeos")
-        self.root.geometry("800x650")
+        self.root.geometry("850x850")
         self.root.resizable(True, True)
         
         self.style = ttk.Style()
@@ -44,16 +172,27 @@ class VideoTranscriberApp:
         self.output_folder = tk.StringVar()
         self.language = tk.StringVar(value="pt-BR")
         self.chunk_size = tk.IntVar(value=30)
+        self.overlap = tk.IntVar(value=0)
         self.input_mode = tk.StringVar(value="youtube")
-        
-        self.processing_thread = None
-        self.is_processing = False
-        self.download_progress = 0
-        self.transcription_progress = 0
-        self.current_folder = None
+        self.max_parallel_jobs = tk.IntVar(value=2)
+        self.profile_enabled = tk.BooleanVar(value=False)
+        self.time_ranges = tk.StringVar()
+        
+        self.jobs = []
+        self.job_counter = 0
+        self.thread_jobs = {}
+        self.ui_events = queue.Queue()
+        self.last_folder = None
+        self.pending_log_lines = deque(maxlen=LOG_MAX_LINES)
+        self.last_log_render = 0
+        self.log_writer = JobLogWriter()
         
         self.create_widgets()
         
+        sys.stdout = ThreadRoutedStream(sys.stdout, self)
+        sys.stderr = ThreadRoutedStream(sys.stderr, self)
+        self.root.after(100, self.process_ui_events)
+        
         if not os.path.exists("videos"):
             os.makedirs("videos")
             
@@ -113,6 +252,7 @@ class VideoTranscriberApp:
         
         language_combobox = ttk.Combobox(language_frame, textvariable=self.language, width=15)
         language_combobox['values'] = (
+            'auto (Detectar automaticamente)', 
             'pt-BR (Português)', 
             'en-US (Inglês)', 
             'es-ES (Espanhol)', 
@@ -141,10 +281,30 @@ class VideoTranscriberApp:
         
         ttk.Label(segment_frame, text="segundos").pack(side=tk.LEFT, padx=(5, 10))
         
+        ttk.Label(segment_frame, text="Sobreposição:").pack(side=tk.LEFT)
+        ttk.Spinbox(segment_frame, from_=0, to=5, textvariable=self.overlap, width=3).pack(side=tk.LEFT, padx=5)
+        ttk.Label(segment_frame, text="s").pack(side=tk.LEFT, padx=(0, 10))
+        
         segment_help = ttk.Label(segment_frame, text="?", cursor="hand2", foreground="blue")
         segment_help.pack(side=tk.LEFT)
         segment_help.bind("<Button-1>", lambda e: self.show_segment_help())
         
+        ttk.Label(config_grid, text="Trabalhos simultâneos:").grid(row=0, column=2, sticky=tk.W, padx=(20, 5), pady=5)
+        ttk.Spinbox(
+            config_grid, 
+            from_=1, 
+            to=8, 
+            textvariable=self.max_parallel_jobs, 
+            width=5, 
+            command=self.schedule_jobs
+        ).grid(row=0, column=3, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Checkbutton(
+            config_grid, 
+            text="Gerar relatório de desempenho", 
+            variable=self.profile_enabled
+        ).grid(row=1, column=2, columnspan=2, sticky=tk.W, padx=(20, 5), pady=5)
+        
         ttk.Label(config_grid, text="Pasta de saída:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
         output_frame = ttk.Frame(config_grid)
         output_frame.grid(row=2, column=1, columnspan=3, sticky=tk.EW, padx=5, pady=5)
@@ -152,6 +312,21 @@ class VideoTranscriberApp:
         ttk.Entry(output_frame, textvariable=self.output_folder, width=50).pack(side=tk.LEFT, fill=tk.X, expand=True)
         ttk.Button(output_frame, text="Procurar...", command=self.browse_output_folder).pack(side=tk.LEFT, padx=5)
         
+        ttk.Label(config_grid, text="Trechos (opcional):").grid(row=3, column=0, sticky=tk.W, padx=5, pady=5)
+        ranges_frame = ttk.Frame(config_grid)
+        ranges_frame.grid(row=3, column=1, columnspan=3, sticky=tk.EW, padx=5, pady=5)
+        
+        ttk.Entry(ranges_frame, textvariable=self.time_ranges, width=50).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        ranges_help = ttk.Label(ranges_frame, text="?", cursor="hand2", foreground="blue")
+        ranges_help.pack(side=tk.LEFT, padx=5)
+        ranges_help.bind("<Button-1>", lambda e: self.show_tooltip(
+            ranges_help, 
+            "Transcreva apenas partes do vídeo, no formato INÍCIO-FIM separados por ponto e vírgula.\n"
+            "Exemplo: 10:00-20:00; 1:00:00-1:05:00\n"
+            "Deixe em branco para transcrever o vídeo inteiro."
+        ))
+        
         separator2 = ttk.Separator(main_frame, orient='horizontal')
         separator2.pack(fill=tk.X, pady=10)
         
@@ -200,10 +375,26 @@ class VideoTranscriberApp:
         self.progress_details = ttk.Label(progress_frame, text="", foreground="#555555", font=("Helvetica", 9))
         self.progress_details.pack(side=tk.TOP, anchor=tk.W, pady=(5, 0))
         
+        queue_frame = ttk.LabelFrame(main_frame, text="Fila de Trabalhos", padding="10")
+        queue_frame.pack(fill=tk.X, pady=10)
+        
+        queue_canvas = tk.Canvas(queue_frame, height=130, highlightthickness=0)
+        queue_scrollbar = ttk.Scrollbar(queue_frame, orient=tk.VERTICAL, command=queue_canvas.yview)
+        self.jobs_frame = ttk.Frame(queue_canvas)
+        self.jobs_frame.bind(
+            "<Configure>",
+            lambda e: queue_canvas.configure(scrollregion=queue_canvas.bbox("all"))
+        )
+        jobs_window = queue_canvas.create_window((0, 0), window=self.jobs_frame, anchor=tk.NW)
+        queue_canvas.bind("<Configure>", lambda e: queue_canvas.itemconfigure(jobs_window, width=e.width))
+        queue_canvas.configure(yscrollcommand=queue_scrollbar.set)
+        queue_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        queue_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
         log_frame = ttk.LabelFrame(main_frame, text="Log de Processamento", padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
-        self.log_text = scrolledtext.ScrolledText(log_frame, width=80, height=15, wrap=tk.WORD)
+        self.log_text = scrolledtext.ScrolledText(log_frame, width=80, height=8, wrap=tk.WORD)
         self.log_text.pack(fill=tk.BOTH, expand=True)
         self.log_text.config(state=tk.DISABLED)
         
@@ -235,9 +426,24 @@ class VideoTranscriberApp:
         )
         self.open_folder_button.pack(side=tk.LEFT, padx=5, pady=5)
         
+        self.search_button = ttk.Button(
+            control_frame, 
+            text="Buscar Transcrições", 
+            command=self.show_search_window,
+            width=20
+        )
+        self.search_button.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        ttk.Button(
+            control_frame, 
+            text="Limpar Concluídos", 
+            command=self.clear_finished_jobs,
+            width=18
+        ).pack(side=tk.LEFT, padx=5, pady=5)
+        
         self.cancel_button = ttk.Button(
             control_frame, 
-            text="Cancelar", 
+            text="Cancelar Todos", 
             command=self.cancel_processing, 
             state=tk.DISABLED,
             style="Large.Danger.TButton",
@@ -283,7 +489,7 @@ class VideoTranscriberApp:
         help_button.pack(side=tk.LEFT, padx=5)
         help_button.bind("<Button-1>", lambda e: self.show_tooltip(
             help_button, 
-            "Cole o URL completo do YouTube, exemplo:\nhttps://www.youtube.com/watch?v=dQw4w9WgXcQ"
+            "Cole o URL completo do YouTube, exemplo:\nhttps://www.youtube.com/watch?v=dQw4w9WgXcQ\n\nURLs de playlists e canais adicionam todos os vídeos ainda não processados à fila."
         ))
         
         example_frame = ttk.Frame(parent)
@@ -311,7 +517,7 @@ class VideoTranscriberApp:
         
         ttk.Label(
             file_frame, 
-            text="Formatos suportados: MP4, AVI, MKV, WEBM, MOV",
+            text="Formatos suportados: MP4, AVI, MKV, WEBM, MOV (selecione vários para enfileirar todos)",
             foreground="#555555"
         ).grid(row=1, column=1, sticky=tk.W)
         
@@ -360,16 +566,15 @@ class VideoTranscriberApp:
         tooltip.after(5000, close_tooltip)
     
     def browse_video(self):
-        filename = filedialog.askopenfilename(
-            title="Selecione um arquivo de vídeo",
+        filenames = filedialog.askopenfilenames(
+            title="Selecione um ou mais arquivos de vídeo",
             filetypes=(
                 ("Arquivos de vídeo", "*.mp4 *.avi *.mkv *.webm *.mov"), 
                 ("Todos os arquivos", "*.*")
             )
         )
-        if filename:
-            self.video_path.set(filename)
-            base_name = os.path.splitext(os.path.basename(filename))[0]
+        if filenames:
+            self.video_path.set("; ".join(filenames))
     
     def browse_output_folder(self):
         folder = filedialog.askdirectory(
@@ -379,8 +584,10 @@ class VideoTranscriberApp:
             self.output_folder.set(folder)
     
     def open_output_folder(self):
-        folder_to_open = self.current_folder if self.current_folder else self.output_folder.get()
-        
+        folder_to_open = self.last_folder if self.last_folder else self.output_folder.get()
+        self.open_path(folder_to_open)
+    
+    def open_path(self, folder_to_open):
         if os.path.exists(folder_to_open):
             if sys.platform == 'win32':
                 os.startfile(folder_to_open)
@@ -392,246 +599,344 @@ class VideoTranscriberApp:
             messagebox.showerror("Erro", "A pasta de saída não existe.")
     
     def log_message(self, message):
-        self.log_text.config(state=tk.NORMAL)
-        
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
-        self.root.update_idletasks()
-    
-    def update_progress(self, percent, phase="processamento", details=None):
-        self.progress_bar["value"] = percent
-        self.progress_percent["text"] = f"{int(percent)}%"
-        
-        phases = {
-            "download": "Baixando vídeo",
-            "extract": "Extraindo áudio",
-            "transcribe": "Transcrevendo áudio",
-            "process": "Processando",
-            "complete": "Concluído"
-        }
-        
-        phase_text = phases.get(phase, "Processando")
-        self.progress_label["text"] = f"{phase_text}..."
-        
-        if details:
-            self.progress_details["text"] = details
-        
-        self.root.update_idletasks()
+        self.pending_log_lines.append(f"[{timestamp}] {message}")
     
     def start_processing(self):
-        self.start_big_button.config(
-            text="PROCESSANDO...",
-            bg="#f39c12",
-            state=tk.DISABLED
-        )
-        self.root.update_idletasks()
-        
-        if self.input_mode.get() == "youtube" and not self.youtube_url.get():
-            messagebox.showerror("Erro", "Por favor, informe uma URL do YouTube.")
-            self.start_big_button.config(
-                text="▶ INICIAR EXTRAÇÃO",
-                bg="#2ecc71",
-                state=tk.NORMAL
-            )
-            return
-        elif self.input_mode.get() == "file" and not self.video_path.get():
-            messagebox.showerror("Erro", "Por favor, selecione um arquivo de vídeo.")
-            self.start_big_button.config(
-                text="▶ INICIAR EXTRAÇÃO",
-                bg="#2ecc71",
-                state=tk.NORMAL
-            )
-            return
+        language_code = self.language.get().split(" ")[0]
+        chunk_size = self.chunk_size.get()
         
         if not self.output_folder.get():
             messagebox.showerror("Erro", "Por favor, selecione uma pasta de saída.")
-            self.start_big_button.config(
-                text="▶ INICIAR EXTRAÇÃO",
-                bg="#2ecc71",
-                state=tk.NORMAL
-            )
             return
         
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
+        try:
+            parse_time_ranges(self.time_ranges.get())
+        except ValueError as e:
+            messagebox.showerror("Erro", str(e))
+            return
         
-        self.start_button.config(state=tk.DISABLED)
-        self.cancel_button.config(state=tk.NORMAL)
-        self.open_folder_button.config(state=tk.DISABLED)
+        if self.input_mode.get() == "youtube":
+            url = self.youtube_url.get().strip()
+            if not url:
+                messagebox.showerror("Erro", "Por favor, informe uma URL do YouTube.")
+                return
+            
+            if is_youtube_collection(url):
+                self.log_message(f"Listando vídeos da playlist/canal: {url}")
+                threading.Thread(
+                    target=self.expand_playlist,
+                    args=(url, language_code, chunk_size),
+                    daemon=True
+                ).start()
+            else:
+                self.add_job("youtube", url, url, language_code, chunk_size)
+            self.youtube_url.set("")
+        else:
+            files = [f.strip() for f in self.video_path.get().split(";") if f.strip()]
+            if not files:
+                messagebox.showerror("Erro", "Por favor, selecione um arquivo de vídeo.")
+                return
+            
+            for video_file in files:
+                self.add_job("file", video_file, os.path.basename(video_file), language_code, chunk_size)
+            self.video_path.set("")
+    
+    def expand_playlist(self, url, language_code, chunk_size):
+        try:
+            entries = expand_youtube_playlist(url)
+            update_index()
+            processed_ids = get_indexed_youtube_ids()
+            new_entries = [entry for entry in entries if entry["id"] not in processed_ids]
+            
+            self.ui_events.put(("message", f"Playlist: {len(entries)} vídeos, {len(entries) - len(new_entries)} já processados"))
+            self.ui_events.put(("enqueue", [
+                ("youtube", entry["url"], entry["title"], language_code, chunk_size)
+                for entry in new_entries
+            ]))
+        except Exception as e:
+            self.ui_events.put(("message", f"Erro ao listar a playlist: {str(e)}"))
+    
+    def add_job(self, kind, source, title, language_code, chunk_size):
+        self.job_counter += 1
+        job = TranscriptionJob(self.job_counter, kind, source, title, language_code, chunk_size)
+        job.profile = self.profile_enabled.get()
+        job.overlap = max(0, min(self.overlap.get(), chunk_size - 1))
+        try:
+            job.ranges = parse_time_ranges(self.time_ranges.get()) or None
+        except ValueError:
+            job.ranges = None
+        self.jobs.append(job)
+        self.create_job_row(job)
+        self.log_message(f"Adicionado à fila: {title}")
+        self.schedule_jobs()
+        return job
+    
+    def create_job_row(self, job):
+        row = ttk.Frame(self.jobs_frame, padding=(0, 2))
+        row.pack(fill=tk.X)
         
-        self.progress_bar["value"] = 0
-        self.progress_percent["text"] = "0%"
-        self.progress_details["text"] = ""
+        title_label = ttk.Label(row, text=job.title, width=32, anchor=tk.W)
+        title_label.pack(side=tk.LEFT, padx=(0, 5))
         
-        self.is_processing = True
-        self.processing_thread = threading.Thread(target=self.process_video)
-        self.processing_thread.daemon = True
-        self.processing_thread.start()
+        status_label = ttk.Label(row, text=JOB_STATUS_LABELS[job.status], width=12, foreground="#555555")
+        status_label.pack(side=tk.LEFT, padx=5)
         
-        self.root.after(100, self.check_thread)
+        progress_bar = ttk.Progressbar(row, orient=tk.HORIZONTAL, mode='determinate', length=180)
+        progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        percent_label = ttk.Label(row, text="0%", width=5)
+        percent_label.pack(side=tk.LEFT)
+        
+        action_button = ttk.Button(row, text="Cancelar", width=9, command=lambda: self.cancel_job(job))
+        action_button.pack(side=tk.RIGHT, padx=2)
+        
+        ttk.Button(row, text="Log", width=5, command=lambda: self.show_job_log(job)).pack(side=tk.RIGHT, padx=2)
+        
+        job.widgets = {
+            "row": row,
+            "status": status_label,
+            "progress": progress_bar,
+            "percent": percent_label,
+            "action": action_button
+        }
     
-    def process_video(self):
-        try:
-            class StreamRedirector:
-                def __init__(self, log_function):
-                    self.log_function = log_function
-                    self.buffer = ""
-                
-                def write(self, text):
-                    self.buffer += text
-                    if '\n' in self.buffer:
-                        lines = self.buffer.split('\n')
-                        for line in lines[:-1]:
-                            if line:
-                                self.log_function(line)
-                        self.buffer = lines[-1]
-                
-                def flush(self):
-                    if self.buffer:
-                        self.log_function(self.buffer)
-                        self.buffer = ""
+    def schedule_jobs(self):
+        running = sum(1 for job in self.jobs if job.status == "running")
+        
+        for job in self.jobs:
+            if running >= max(1, self.max_parallel_jobs.get()):
+                break
+            if job.status != "queued":
+                continue
             
-            original_stdout = sys.stdout
-            original_stderr = sys.stderr
-            sys.stdout = StreamRedirector(self.log_message)
-            sys.stderr = StreamRedirector(self.log_message)
+            job.status = "running"
+            job.thread = threading.Thread(target=self.run_job, args=(job,), daemon=True)
+            job.thread.start()
+            running += 1
+            self.refresh_job_row(job)
+        
+        self.refresh_summary()
+    
+    def run_job(self, job):
+        self.thread_jobs[threading.get_ident()] = job
+        
+        def check_cancelled():
+            if job.cancel_event.is_set():
+                raise JobCancelled()
+        
+        def update_download_progress(percent):
+            check_cancelled()
+            self.post_progress(job, percent, "download", f"Baixado {percent:.1f}% do vídeo")
+        
+        def update_transcription_progress(percent):
+            check_cancelled()
+            phase = "extract" if percent < 25 else "transcribe"
+            detail = "Extraindo áudio..." if percent < 25 else f"Transcrevendo áudio: {percent-25:.1f}% de 75%"
+            self.post_progress(job, percent, phase, detail)
+        
+        try:
+            check_cancelled()
+            self.post_job_log(job, f"Idioma selecionado: {job.language}")
+            self.post_job_log(job, f"Tamanho do segmento: {job.chunk_size} segundos")
             
-            try:
-                language_code = self.language.get().split(" ")[0]
-                
-                if self.input_mode.get() == "youtube":
-                    url = self.youtube_url.get()
-                    self.log_message(f"Obtendo informações do vídeo do YouTube: {url}")
-                    
-                    self.log_message(f"Baixando vídeo do YouTube: {url}")
-                    self.update_progress(0, "download", "Iniciando download...")
-                    
-                    def update_download_progress(percent):
-                        self.update_progress(
-                            percent, 
-                            "download", 
-                            f"Baixado {percent:.1f}% do vídeo"
-                        )
-                    
-                    temp_folder = os.path.join("videos", "temp_" + datetime.now().strftime("%Y%m%d_%H%M%S"))
-                    if not os.path.exists(temp_folder):
-                        os.makedirs(temp_folder)
-                    
-                    result = download_youtube_video(url, temp_folder, update_download_progress)
-                    
-                    if isinstance(result, tuple) and len(result) == 2:
-                        video_path, video_title = result
-                    else:
-                        video_path = result
-                        video_title = "youtube_video"
-                    
-                    if not video_path:
-                        self.log_message("Falha ao baixar o vídeo do YouTube.")
-                        return
-                        
-                    self.current_folder = create_video_folder(video_title or "youtube_video", True, url)
-                    self.log_message(f"Criada pasta para o vídeo: {self.current_folder}")
-                    
-                    if video_path and os.path.exists(video_path):
-                        new_video_path = os.path.join(self.current_folder, os.path.basename(video_path))
-                        try:
-                            shutil.move(video_path, new_video_path)
-                            video_path = new_video_path
-                        except Exception as e:
-                            self.log_message(f"Erro ao mover arquivo: {str(e)}")
-                            try:
-                                shutil.copy2(video_path, new_video_path)
-                                video_path = new_video_path
-                            except:
-                                pass
-                    
-                    try:
-                        if os.path.exists(temp_folder):
-                            shutil.rmtree(temp_folder)
-                    except:
-                        pass
-                else:
-                    video_file = self.video_path.get()
-                    video_name = os.path.splitext(os.path.basename(video_file))[0]
-                    
-                    self.current_folder = create_video_folder(video_name)
-                    self.log_message(f"Criada pasta para o vídeo: {self.current_folder}")
-                    
-                    dest_path = os.path.join(self.current_folder, os.path.basename(video_file))
-                    self.log_message(f"Copiando arquivo de vídeo para a pasta de processamento...")
-                    self.update_progress(0, "process", "Copiando arquivo de vídeo...")
-                    
-                    try:
-                        shutil.copy2(video_file, dest_path)
-                        video_path = dest_path
-                    except Exception as e:
-                        self.log_message(f"Erro ao copiar arquivo: {str(e)}")
-                        video_path = video_file
-                
-                if video_path:
-                    base_name = os.path.splitext(os.path.basename(video_path))[0]
-                    output_text_path = os.path.join(self.current_folder, f"{base_name}_transcricao.txt")
-                else:
-                    output_text_path = os.path.join(self.current_folder, "transcricao.txt")
-                
-                self.log_message(f"Iniciando extração de texto do vídeo: {os.path.basename(video_path)}")
-                self.log_message(f"Idioma selecionado: {language_code}")
-                self.log_message(f"Tamanho do segmento: {self.chunk_size.get()} segundos")
-                
-                def update_transcription_progress(percent):
-                    phase = "extract" if percent < 25 else "transcribe"
-                    detail = "Extraindo áudio..." if percent < 25 else f"Transcrevendo áudio: {percent-25:.1f}% de 75%"
-                    self.update_progress(percent, phase, detail)
-                
-                result = extract_speech_from_video(
-                    video_path, 
-                    output_text_path, 
-                    language_code, 
-                    self.chunk_size.get(),
-                    update_transcription_progress
+            if job.kind == "youtube":
+                self.post_progress(job, 0, "download", "Iniciando download...")
+                video_title = job.title if job.title != job.source else None
+                output_path, result = process_youtube_video(
+                    job.source,
+                    None,
+                    job.language,
+                    job.chunk_size,
+                    update_download_progress,
+                    update_transcription_progress,
+                    video_title=video_title,
+                    profile=job.profile,
+                    ranges=job.ranges,
+                    overlap_sec=job.overlap
                 )
+            else:
+                self.post_progress(job, 0, "process", "Copiando arquivo de vídeo...")
+                output_path, result = process_video_file(
+                    job.source,
+                    None,
+                    job.language,
+                    job.chunk_size,
+                    update_transcription_progress,
+                    profile=job.profile,
+                    ranges=job.ranges,
+                    overlap_sec=job.overlap
+                )
+            
+            check_cancelled()
+            
+            if output_path:
+                job.output_path = output_path
+                job.folder = os.path.dirname(output_path)
+                job.status = "done"
+                self.post_progress(job, 100, "complete", "Processamento concluído!")
+                self.post_job_log(job, "Extração concluída!")
+                self.post_job_log(job, f"Texto salvo em: {output_path}")
                 
-                self.update_progress(100, "complete", "Processamento concluído!")
-                self.log_message("\nExtração concluída!")
-                self.log_message(f"Texto salvo em: {output_text_path}")
-                
-                if result:
-                    preview = result[:500] + "..." if len(result) > 500 else result
-                    self.log_message("\nPrévia do texto extraído:")
-                    self.log_message(preview)
-                    self.log_message(f"\nComprimento total do texto: {len(result)} caracteres")
-                
-                self.open_folder_button.config(state=tk.NORMAL)
-                
-            finally:
-                sys.stdout = original_stdout
-                sys.stderr = original_stderr
-                
+                preview = result[:500] + "..." if len(result) > 500 else result
+                self.post_job_log(job, "Prévia do texto extraído:")
+                self.post_job_log(job, preview)
+                self.post_job_log(job, f"Comprimento total do texto: {len(result)} caracteres")
+            else:
+                job.status = "failed"
+                self.post_job_log(job, f"Falha no processamento: {result or 'download não concluído'}")
+        except JobCancelled:
+            job.status = "cancelled"
+            self.post_job_log(job, "Operação cancelada")
         except Exception as e:
-            self.log_message(f"Erro durante o processamento: {str(e)}")
+            job.status = "failed"
+            self.post_job_log(job, f"Erro durante o processamento: {str(e)}")
             import traceback
-            self.log_message(traceback.format_exc())
+            self.post_job_log(job, traceback.format_exc())
+        finally:
+            self.thread_jobs.pop(threading.get_ident(), None)
+            self.log_writer.finish(job)
+            self.ui_events.put(("finished", job))
+    
+    def post_job_log(self, job, message):
+        self.log_writer.write(job, message)
+        self.ui_events.put(("log", job, message))
+    
+    def post_progress(self, job, percent, phase, details=None):
+        self.ui_events.put(("progress", job, percent, phase, details))
+    
+    def process_ui_events(self):
+        handled = 0
+        try:
+            while handled < MAX_UI_EVENTS_PER_TICK:
+                event = self.ui_events.get_nowait()
+                handled += 1
+                kind = event[0]
+                
+                if kind == "log":
+                    _, job, message = event
+                    job.log_lines.append(message)
+                    self.log_message(f"[{job.title}] {message}")
+                    if job.log_widget:
+                        job.pending_log_lines.append(message)
+                elif kind == "progress":
+                    _, job, percent, phase, details = event
+                    job.progress = percent
+                    job.phase = phase
+                    job.details = details
+                    self.refresh_job_row(job)
+                    self.refresh_summary()
+                elif kind == "finished":
+                    job = event[1]
+                    if job.folder:
+                        self.last_folder = job.folder
+                        self.open_folder_button.config(state=tk.NORMAL)
+                    self.refresh_job_row(job)
+                    self.schedule_jobs()
+                elif kind == "enqueue":
+                    for job_kind, source, title, language_code, chunk_size in event[1]:
+                        self.add_job(job_kind, source, title, language_code, chunk_size)
+                elif kind == "message":
+                    self.log_message(event[1])
+        except queue.Empty:
+            pass
+        
+        if time.monotonic() - self.last_log_render >= LOG_RENDER_INTERVAL_SEC:
+            self.render_logs()
+            self.last_log_render = time.monotonic()
+        
+        self.root.after(10 if handled >= MAX_UI_EVENTS_PER_TICK else 100, self.process_ui_events)
+    
+    def render_logs(self):
+        if self.pending_log_lines:
+            self.append_lines(self.log_text, self.pending_log_lines, LOG_MAX_LINES)
+            self.pending_log_lines.clear()
+        
+        for job in self.jobs:
+            if not job.pending_log_lines:
+                continue
+            if job.log_widget and job.log_widget.winfo_exists():
+                self.append_lines(job.log_widget, job.pending_log_lines, JOB_LOG_MAX_LINES)
+            job.pending_log_lines = []
+    
+    def refresh_job_row(self, job):
+        if not job.widgets:
+            return
+        
+        job.widgets["status"]["text"] = JOB_STATUS_LABELS[job.status]
+        job.widgets["progress"]["value"] = job.progress
+        job.widgets["percent"]["text"] = f"{int(job.progress)}%"
+        
+        if job.status in ("done", "failed", "cancelled"):
+            if job.folder:
+                job.widgets["action"].config(text="Abrir", state=tk.NORMAL, command=lambda: self.open_path(job.folder))
+            else:
+                job.widgets["action"].config(state=tk.DISABLED)
+        elif job.cancel_event.is_set():
+            job.widgets["status"]["text"] = "Cancelando..."
+            job.widgets["action"].config(state=tk.DISABLED)
     
-    def check_thread(self):
-        if self.processing_thread and self.processing_thread.is_alive():
-            self.root.after(100, self.check_thread)
+    def refresh_summary(self):
+        running = [job for job in self.jobs if job.status == "running"]
+        queued = [job for job in self.jobs if job.status == "queued"]
+        done = [job for job in self.jobs if job.status == "done"]
+        active = running + queued
+        
+        if active:
+            percent = sum(job.progress for job in active) / len(active)
+            self.progress_label["text"] = f"Executando: {len(running)}  |  Na fila: {len(queued)}  |  Concluídos: {len(done)}"
+            if len(running) == 1 and running[0].details:
+                self.progress_details["text"] = f"{running[0].title}: {running[0].details}"
+            else:
+                self.progress_details["text"] = ""
+            self.cancel_button.config(state=tk.NORMAL)
         else:
-            self.start_button.config(state=tk.NORMAL)
+            percent = 100 if done else 0
+            self.progress_label["text"] = f"Pronto para processar  |  Concluídos: {len(done)}" if self.jobs else "Pronto para processar"
+            self.progress_details["text"] = ""
             self.cancel_button.config(state=tk.DISABLED)
-            self.is_processing = False
-            
-            self.start_big_button.config(
-                text="▶ INICIAR EXTRAÇÃO",
-                bg="#2ecc71",
-                state=tk.NORMAL
-            )
-            
-            if self.current_folder and os.path.exists(self.current_folder):
-                self.open_folder_button.config(state=tk.NORMAL)
+        
+        self.progress_bar["value"] = percent
+        self.progress_percent["text"] = f"{int(percent)}%"
+    
+    def clear_finished_jobs(self):
+        for job in list(self.jobs):
+            if job.status in ("done", "failed", "cancelled"):
+                job.widgets["row"].destroy()
+                self.jobs.remove(job)
+        self.refresh_summary()
+    
+    def append_lines(self, widget, lines, max_lines):
+        at_end = widget.yview()[1] >= 0.999
+        widget.config(state=tk.NORMAL)
+        widget.insert(tk.END, "\n".join(lines) + "\n")
+        
+        excess = int(widget.index("end-1c").split(".")[0]) - 1 - max_lines
+        if excess > 0:
+            widget.delete("1.0", f"{excess + 1}.0")
+        
+        if at_end:
+            widget.see(tk.END)
+        widget.config(state=tk.DISABLED)
+    
+    def show_job_log(self, job):
+        if job.log_widget and job.log_widget.winfo_exists():
+            job.log_widget.winfo_toplevel().lift()
+            return
+        
+        log_window = tk.Toplevel(self.root)
+        log_window.title(f"Log - {job.title}")
+        log_window.geometry("650x400")
+        
+        text = scrolledtext.ScrolledText(log_window, wrap=tk.WORD)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert(tk.END, "\n".join(job.log_lines) + ("\n" if job.log_lines else ""))
+        text.see(tk.END)
+        text.config(state=tk.DISABLED)
+        job.log_widget = text
+        job.pending_log_lines = []
+        
+        ttk.Button(log_window, text="Fechar", command=log_window.destroy).pack(pady=5)
     
     def show_segment_help(self):
         help_text = """O tamanho do segmento define em quantos segundos cada parte do áudio será dividida para processamento.
@@ -648,11 +953,16 @@ Recomendações:
 • Para idiomas não-inglês: 20-30 segundos é ideal
 
 Melhor precisão: 15-30 segundos
-Melhor velocidade: 45-60 segundos"""
+Melhor velocidade: 45-60 segundos
+
+Sobreposição:
+• Com sobreposição, segmentos vizinhos compartilham alguns segundos de áudio e as palavras repetidas na emenda são removidas
+• Isso evita perder palavras cortadas no limite entre segmentos
+• Com 1-2 segundos de sobreposição é possível usar segmentos de 45-55 segundos (menos requisições) sem perder precisão nas emendas"""
 
         help_window = tk.Toplevel(self.root)
         help_window.title("Ajuda - Tamanho do Segmento")
-        help_window.geometry("500x350")
+        help_window.geometry("500x450")
         help_window.transient(self.root)
         help_window.grab_set()
         
@@ -663,21 +973,113 @@ Melhor velocidade: 45-60 segundos"""
         
         ttk.Button(help_window, text="Fechar", command=help_window.destroy).pack(pady=10)
     
-    def cancel_processing(self):
-        if self.is_processing:
-            self.log_message("Cancelando operação...")
-            self.is_processing = False
+    def show_search_window(self):
+        search_window = tk.Toplevel(self.root)
+        search_window.title("Buscar Transcrições")
+        search_window.geometry("750x450")
+        search_window.transient(self.root)
+        
+        query = tk.StringVar()
+        
+        query_frame = ttk.Frame(search_window, padding=10)
+        query_frame.pack(fill=tk.X)
+        
+        ttk.Label(query_frame, text="Buscar:").pack(side=tk.LEFT, padx=(0, 5))
+        query_entry = ttk.Entry(query_frame, textvariable=query, width=50)
+        query_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        search_button = ttk.Button(query_frame, text="Buscar", state=tk.DISABLED)
+        search_button.pack(side=tk.LEFT, padx=5)
+        
+        status_label = ttk.Label(search_window, text="Atualizando índice...", foreground="#555555")
+        status_label.pack(fill=tk.X, padx=10)
+        
+        results_frame = ttk.Frame(search_window, padding=10)
+        results_frame.pack(fill=tk.BOTH, expand=True)
+        
+        results_tree = ttk.Treeview(results_frame, columns=("title", "date", "snippet"), show="headings")
+        results_tree.heading("title", text="Título")
+        results_tree.heading("date", text="Processado em")
+        results_tree.heading("snippet", text="Trecho")
+        results_tree.column("title", width=200)
+        results_tree.column("date", width=130)
+        results_tree.column("snippet", width=380)
+        results_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=results_tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        results_tree.configure(yscrollcommand=scrollbar.set)
+        
+        result_folders = {}
+        
+        def run_search(event=None):
+            if not query.get().strip():
+                return
             
-            self.update_progress(0, "process", "Operação cancelada")
-            self.start_button.config(state=tk.NORMAL)
-            self.cancel_button.config(state=tk.DISABLED)
+            results_tree.delete(*results_tree.get_children())
+            result_folders.clear()
             
-            self.start_big_button.config(
-                text="▶ INICIAR EXTRAÇÃO",
-                bg="#2ecc71",
-                state=tk.NORMAL
-            )
+            start = time.perf_counter()
+            try:
+                results = search_transcripts(query.get(), limit=100)
+            except Exception as e:
+                status_label["text"] = f"Erro na busca: {e}"
+                return
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            for result in results:
+                item = results_tree.insert("", tk.END, values=(
+                    result["title"],
+                    result["processed_at"] or "",
+                    result["snippet"].replace("\n", " ")
+                ))
+                result_folders[item] = result["folder"]
             
+            status_label["text"] = f"{len(results)} resultados em {elapsed_ms:.0f} ms (clique duas vezes para abrir a pasta)"
+        
+        def open_result(event=None):
+            selection = results_tree.selection()
+            if selection and selection[0] in result_folders:
+                self.open_path(result_folders[selection[0]])
+        
+        def index_ready(added, removed):
+            if not search_window.winfo_exists():
+                return
+            status_label["text"] = f"Índice atualizado ({added} novas, {removed} removidas)"
+            search_button.config(state=tk.NORMAL, command=run_search)
+            query_entry.bind("<Return>", run_search)
+        
+        def refresh_index():
+            try:
+                added, removed = update_index()
+            except Exception as e:
+                added, removed = 0, 0
+                self.root.after(0, lambda: self.log_message(f"Erro ao atualizar o índice: {e}"))
+            self.root.after(0, lambda: index_ready(added, removed))
+        
+        results_tree.bind("<Double-1>", open_result)
+        query_entry.focus_set()
+        
+        threading.Thread(target=refresh_index, daemon=True).start()
+    
+    def cancel_job(self, job):
+        if job.status == "queued":
+            job.status = "cancelled"
+            self.log_message(f"Removido da fila: {job.title}")
+        elif job.status == "running":
+            self.log_message(f"Cancelando: {job.title}")
+            job.cancel_event.set()
+        
+        self.refresh_job_row(job)
+        self.refresh_summary()
+    
+    def cancel_processing(self):
+        running = [job for job in self.jobs if job.status == "running"]
+        
+        for job in self.jobs:
+            if job.status in ("queued", "running"):
+                self.cancel_job(job)
+        
+        if running:
             try:
                 if sys.platform == 'win32':
                     os.system('taskkill /f /im ffmpeg.exe > NUL 2>&1')
@@ -763,6 +1165,7 @@ def main():
     check_dependencies()
     
     root.mainloop()
+    app.log_writer.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,246 @@
+import os
+import sys
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+
+VIDEOS_DIR = "videos"
+INDEX_PATH = os.path.join(VIDEOS_DIR, "indice_transcricoes.db")
+TRANSCRIPT_SUFFIX = "_transcricao.txt"
+
+_index_lock = threading.Lock()
+
+
+def open_index(db_path=INDEX_PATH):
+    folder = os.path.dirname(db_path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            folder TEXT,
+            size INTEGER,
+            mtime REAL,
+            title TEXT,
+            youtube_id TEXT,
+            processed_at TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS documents_youtube_id ON documents(youtube_id)")
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS transcripts USING fts5(
+            title, content, tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    return conn
+
+
+def read_video_info(folder):
+    info = {"title": None, "youtube_id": None, "processed_at": None}
+    info_file = os.path.join(folder, "info.txt")
+
+    if not os.path.exists(info_file):
+        return info
+
+    try:
+        with open(info_file, "r", encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                value = value.strip()
+                if key == "Título":
+                    info["title"] = value
+                elif key == "ID do YouTube":
+                    info["youtube_id"] = value
+                elif key == "Data de processamento":
+                    try:
+                        info["processed_at"] = datetime.strptime(value, "%d/%m/%Y %H:%M:%S").isoformat(sep=" ")
+                    except ValueError:
+                        info["processed_at"] = value
+    except Exception as e:
+        print(f"Erro ao ler {info_file}: {e}")
+
+    return info
+
+
+def find_transcripts(videos_dir=VIDEOS_DIR):
+    if not os.path.exists(videos_dir):
+        return
+
+    for entry in os.scandir(videos_dir):
+        if not entry.is_dir():
+            continue
+        for item in os.scandir(entry.path):
+            if item.is_file() and item.name.endswith(TRANSCRIPT_SUFFIX):
+                yield item.path, item.stat()
+
+
+def _upsert_document(conn, path, stat):
+    folder = os.path.dirname(path)
+    info = read_video_info(folder)
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        content = f.read()
+
+    title = info["title"] or os.path.basename(path)[:-len(TRANSCRIPT_SUFFIX)]
+
+    row = conn.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+    if row:
+        doc_id = row[0]
+        conn.execute(
+            "UPDATE documents SET folder = ?, size = ?, mtime = ?, title = ?, youtube_id = ?, processed_at = ? WHERE id = ?",
+            (folder, stat.st_size, stat.st_mtime, title, info["youtube_id"], info["processed_at"], doc_id)
+        )
+        conn.execute("DELETE FROM transcripts WHERE rowid = ?", (doc_id,))
+    else:
+        cursor = conn.execute(
+            "INSERT INTO documents (path, folder, size, mtime, title, youtube_id, processed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, folder, stat.st_size, stat.st_mtime, title, info["youtube_id"], info["processed_at"])
+        )
+        doc_id = cursor.lastrowid
+
+    conn.execute("INSERT INTO transcripts (rowid, title, content) VALUES (?, ?, ?)", (doc_id, title, content))
+
+
+def _delete_document(conn, doc_id):
+    conn.execute("DELETE FROM transcripts WHERE rowid = ?", (doc_id,))
+    conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+
+def update_index(videos_dir=VIDEOS_DIR, db_path=INDEX_PATH):
+    added = 0
+    removed = 0
+
+    with _index_lock:
+        conn = open_index(db_path)
+        try:
+            known = {
+                path: (doc_id, size, mtime)
+                for doc_id, path, size, mtime in conn.execute("SELECT id, path, size, mtime FROM documents")
+            }
+
+            with conn:
+                for path, stat in find_transcripts(videos_dir):
+                    current = known.pop(path, None)
+                    if current and current[1] == stat.st_size and current[2] == stat.st_mtime:
+                        continue
+                    try:
+                        _upsert_document(conn, path, stat)
+                        added += 1
+                    except Exception as e:
+                        print(f"Erro ao indexar {path}: {e}")
+
+                for doc_id, _, _ in known.values():
+                    _delete_document(conn, doc_id)
+                    removed += 1
+        finally:
+            conn.close()
+
+    return added, removed
+
+
+def index_transcript(path, db_path=INDEX_PATH):
+    if not path or not os.path.exists(path):
+        return False
+
+    with _index_lock:
+        conn = open_index(db_path)
+        try:
+            with conn:
+                _upsert_document(conn, path, os.stat(path))
+            return True
+        except Exception as e:
+            print(f"Erro ao indexar {path}: {e}")
+            return False
+        finally:
+            conn.close()
+
+
+def build_fts_query(text):
+    terms = [term.replace('"', '""') for term in text.split() if term.strip()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def search_transcripts(query, limit=20, db_path=INDEX_PATH, raw=False):
+    fts_query = query if raw else build_fts_query(query)
+    if not fts_query:
+        return []
+
+    conn = open_index(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT d.path, d.folder, d.title, d.youtube_id, d.processed_at,
+                   snippet(transcripts, 1, '[', ']', '...', 12), bm25(transcripts, 5.0, 1.0)
+            FROM transcripts
+            JOIN documents d ON d.id = transcripts.rowid
+            WHERE transcripts MATCH ?
+            ORDER BY bm25(transcripts, 5.0, 1.0)
+            LIMIT ?
+        """, (fts_query, limit)).fetchall()
+    finally:
+        conn.close()
+
+    return [
+        {
+            "path": path,
+            "folder": folder,
+            "title": title,
+            "youtube_id": youtube_id,
+            "processed_at": processed_at,
+            "snippet": snippet,
+            "score": -rank
+        }
+        for path, folder, title, youtube_id, processed_at, snippet, rank in rows
+    ]
+
+
+def get_indexed_youtube_ids(db_path=INDEX_PATH):
+    if not os.path.exists(db_path):
+        return set()
+
+    conn = open_index(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT DISTINCT youtube_id FROM documents WHERE youtube_id IS NOT NULL")}
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search the transcript library")
+    parser.add_argument("query", nargs="?", help="Words to search for")
+    parser.add_argument("-d", "--videos-dir", default=VIDEOS_DIR, help="Transcript library folder (default: videos)")
+    parser.add_argument("--db", default=INDEX_PATH, help="Path to the index database")
+    parser.add_argument("-n", "--limit", type=int, default=20, help="Maximum number of results (default: 20)")
+    parser.add_argument("--raw", action="store_true", help="Pass the query to FTS5 unchanged (AND/OR/NEAR, prefix*)")
+    parser.add_argument("--no-update", action="store_true", help="Search without scanning for new transcripts first")
+
+    args = parser.parse_args()
+
+    if not args.no_update:
+        added, removed = update_index(args.videos_dir, args.db)
+        if added or removed:
+            print(f"Índice atualizado: {added} transcrições indexadas, {removed} removidas")
+
+    if not args.query:
+        sys.exit(0)
+
+    try:
+        results = search_transcripts(args.query, args.limit, args.db, args.raw)
+    except sqlite3.OperationalError as e:
+        print(f"Consulta inválida: {e}")
+        sys.exit(1)
+
+    if not results:
+        print("Nenhum resultado encontrado.")
+
+    for i, result in enumerate(results, 1):
+        print(f"{i}. {result['title']} ({result['processed_at'] or 'sem data'})")
+        if result["youtube_id"]:
+            print(f"   YouTube: {result['youtube_id']}")
+        print(f"   {result['path']}")
+        print(f"   {result['snippet']}")
@@ -1,16 +1,255 @@
 import os
 import speech_recognition as sr
-from moviepy.video.io.VideoFileClip import VideoFileClip
 import argparse
 import subprocess
 import sys
 import glob
 from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
 import math
 import time
 import json
 from datetime import datetime
 import shutil
+import hashlib
+import tempfile
+import threading
+import wave
+import cProfile
+import pstats
+import tracemalloc
+import contextlib
+import io
+import re
+import difflib
+import heapq
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from transcript_index import index_transcript, update_index, get_indexed_youtube_ids
+import audio_fingerprint
+import audio_conditioning
+
+
+def find_ffmpeg_tool(name):
+    windows_path = f"C:\\ffmpeg\\bin\\{name}.exe"
+    if os.path.exists(windows_path):
+        return windows_path
+    return shutil.which(name) or name
+
+
+FFMPEG_PATH = find_ffmpeg_tool("ffmpeg")
+FFPROBE_PATH = find_ffmpeg_tool("ffprobe")
+
+_ffmpeg_lock = threading.Lock()
+_ffmpeg_available = None
+
+
+def is_ffmpeg_available():
+    global _ffmpeg_available
+    
+    with _ffmpeg_lock:
+        if _ffmpeg_available is None:
+            try:
+                subprocess.run([FFMPEG_PATH, '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                _ffmpeg_available = True
+            except:
+                _ffmpeg_available = False
+    return _ffmpeg_available
+
+SHARD_MIN_DURATION_SEC = 20 * 60
+SHARD_TARGET_DURATION_SEC = 10 * 60
+EXTRACT_SAMPLE_RATE = 16000
+
+SCRATCH_DIR_ENV = "TRANSCRIBER_SCRATCH"
+SCRATCH_QUOTA_ENV = "TRANSCRIBER_SCRATCH_QUOTA_MB"
+DEDUPE_ENV = "TRANSCRIBER_DEDUPE"
+CONDITION_ENV = "TRANSCRIBER_CONDITION"
+
+AUTO_LANGUAGE = "auto"
+AUTO_LANGUAGE_CANDIDATES = ["pt-BR", "en-US", "es-ES", "fr-FR", "de-DE", "it-IT"]
+LANGUAGE_SAMPLE_COUNT = 3
+LANGUAGE_SAMPLE_MS = 8000
+LANGUAGE_EXCERPT_MS = 60000
+
+SEAM_MAX_WORDS = 30
+SEAM_MIN_MATCH_WORDS = 2
+
+TRACK_LANGUAGE_TAGS = {
+    "por": "pt-BR", "eng": "en-US", "spa": "es-ES", "fra": "fr-FR", "fre": "fr-FR", "deu": "de-DE",
+    "ger": "de-DE", "ita": "it-IT", "jpn": "ja-JP", "kor": "ko-KR", "zho": "zh-CN", "chi": "zh-CN"
+}
+
+MEDIA_EXTENSIONS = (".mp4", ".avi", ".mkv", ".webm", ".mov", ".m4a", ".mp3", ".wav", ".aac", ".flac", ".ogg")
+
+STATS_PATH = os.path.join("cache", "estatisticas.json")
+DEFAULT_REQUEST_LATENCY_SEC = 3.0
+PLAN_SILENCE_THRESHOLD = "-35dB"
+PLAN_SILENCE_MIN_SEC = 0.5
+
+AUDIO_CACHE_DIR = os.path.join("cache", "audio")
+AUDIO_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+AUDIO_CACHE_SAMPLE_RATE = EXTRACT_SAMPLE_RATE
+
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+@contextlib.contextmanager
+def profile_stage(stage, profile_dir=None):
+    if not profile_dir:
+        yield
+        return
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        print(f"Perfil de CPU indisponível para '{stage}': outro perfil já está ativo")
+        profiler = None
+    
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0:
+            tracemalloc.start(25)
+        _tracemalloc_users += 1
+    tracemalloc.reset_peak()
+    snapshot_before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+        snapshot_after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0:
+                tracemalloc.stop()
+        
+        try:
+            write_profile_report(stage, profile_dir, profiler, snapshot_before, snapshot_after, elapsed, peak)
+        except Exception as e:
+            print(f"Erro ao salvar o relatório de desempenho: {e}")
+
+
+def write_profile_report(stage, profile_dir, profiler, snapshot_before, snapshot_after, elapsed, peak):
+    if profiler:
+        profiler.dump_stats(os.path.join(profile_dir, f"perfil_{stage}.pstats"))
+        
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats("cumulative").print_stats(40)
+        stats.sort_stats("tottime").print_stats(40)
+        with open(os.path.join(profile_dir, f"perfil_{stage}.txt"), "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+    
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = snapshot_after.filter_traces(filters).compare_to(snapshot_before.filter_traces(filters), "lineno")
+    with open(os.path.join(profile_dir, f"memoria_{stage}.txt"), "w", encoding="utf-8") as f:
+        f.write(f"Pico de memória rastreada: {peak / 1024 / 1024:.1f} MB\n\n")
+        f.write("Maiores alocações (diferença durante a etapa):\n")
+        for difference in differences[:30]:
+            f.write(f"{difference}\n")
+        
+        f.write("\nMaiores alocações ainda vivas (com pilha):\n")
+        for statistic in snapshot_after.filter_traces(filters).statistics("traceback")[:5]:
+            f.write(f"\n{statistic.count} blocos, {statistic.size / 1024:.1f} KiB\n")
+            for line in statistic.traceback.format(limit=10):
+                f.write(f"{line}\n")
+    
+    with open(os.path.join(profile_dir, "perfil_resumo.txt"), "a", encoding="utf-8") as f:
+        f.write(f"{stage}: {elapsed:.2f} s, pico de memória {peak / 1024 / 1024:.1f} MB\n")
+    
+    print(f"Relatório de desempenho da etapa '{stage}': {elapsed:.2f} s, pico {peak / 1024 / 1024:.1f} MB")
+
+
+_scratch_lock = threading.Lock()
+_scratch_reserved = {}
+
+
+def get_scratch_root():
+    configured = os.environ.get(SCRATCH_DIR_ENV)
+    if configured:
+        return configured
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def get_scratch_quota():
+    try:
+        return int(float(os.environ[SCRATCH_QUOTA_ENV]) * 1024 * 1024)
+    except (KeyError, ValueError):
+        return None
+
+
+def estimate_scratch_bytes(media_path):
+    if not media_path:
+        return 0
+    duration = get_media_duration(media_path)
+    if not duration:
+        return 0
+    return int(duration * EXTRACT_SAMPLE_RATE * 2 * 2)
+
+
+def reserve_scratch(root, expected_bytes):
+    quota = get_scratch_quota()
+    with _scratch_lock:
+        reserved = _scratch_reserved.get(root, 0)
+        if quota is not None and reserved + expected_bytes > quota:
+            return False
+        try:
+            if shutil.disk_usage(root).free < reserved + expected_bytes:
+                return False
+        except OSError:
+            return False
+        _scratch_reserved[root] = reserved + expected_bytes
+        return True
+
+
+def release_scratch(root, expected_bytes):
+    with _scratch_lock:
+        _scratch_reserved[root] = max(0, _scratch_reserved.get(root, 0) - expected_bytes)
+
+
+@contextlib.contextmanager
+def job_workspace(expected_bytes=0, scratch_root=None):
+    root = scratch_root or get_scratch_root()
+    if not os.path.exists(root):
+        os.makedirs(root)
+    
+    if not reserve_scratch(root, expected_bytes):
+        fallback = tempfile.gettempdir()
+        print(f"Espaço insuficiente em {root} para {expected_bytes / 1024 / 1024:.0f} MB, usando {fallback}")
+        root = fallback
+        expected_bytes = 0
+    
+    workspace = tempfile.mkdtemp(prefix="transcriber_job_", dir=root)
+    try:
+        yield workspace
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+        release_scratch(root, expected_bytes)
+        print("Temporary audio files removed")
+
+
+def get_youtube_id(youtube_url):
+    if not youtube_url:
+        return None
+    try:
+        if "v=" in youtube_url:
+            return youtube_url.split("v=")[1].split("&")[0]
+        if "youtu.be/" in youtube_url:
+            return youtube_url.split("youtu.be/")[1].split("?")[0].split("/")[0]
+        if "/shorts/" in youtube_url:
+            return youtube_url.split("/shorts/")[1].split("?")[0].split("/")[0]
+    except:
+        pass
+    return None
 
 
 def create_video_folder(video_title, is_youtube=False, youtube_url=None):
@@ -19,13 +258,9 @@ def create_video_folder(video_title, is_youtube=False, youtube_url=None):
     
     youtube_id = None
     if is_youtube and youtube_url:
-        try:
-            if "v=" in youtube_url:
-                youtube_id = youtube_url.split("v=")[1].split("&")[0]
-                if not video_title or video_title == "youtube_video":
-                    video_title = f"youtube_{youtube_id}"
-        except:
-            pass
+        youtube_id = get_youtube_id(youtube_url)
+        if youtube_id and video_title == "youtube_video":
+            video_title = f"youtube_{youtube_id}"
     
     try:
         valid_name = "".join(c for c in video_title if c.isalnum() or c in " _-").strip()
@@ -43,7 +278,14 @@ def create_video_folder(video_title, is_youtube=False, youtube_url=None):
         os.makedirs("videos")
     
     folder_path = os.path.join("videos", folder_name)
-    os.makedirs(folder_path, exist_ok=True)
+    suffix = 1
+    while True:
+        try:
+            os.makedirs(folder_path)
+            break
+        except FileExistsError:
+            suffix += 1
+            folder_path = os.path.join("videos", f"{folder_name}_{suffix}")
     
     try:
         info_file = os.path.join(folder_path, "info.txt")
@@ -60,19 +302,353 @@ def create_video_folder(video_title, is_youtube=False, youtube_url=None):
     return folder_path
 
 
-def extract_audio_from_video(video_path, audio_path):
+def get_audio_cache_key(video_path, youtube_url=None):
+    youtube_id = get_youtube_id(youtube_url)
+    if youtube_id:
+        return f"youtube_{youtube_id}"
+    
+    try:
+        stat = os.stat(video_path)
+        digest = hashlib.sha1(f"{stat.st_size}:{int(stat.st_mtime)}".encode())
+        sample_size = 1024 * 1024
+        with open(video_path, "rb") as f:
+            digest.update(f.read(sample_size))
+            if stat.st_size > 2 * sample_size:
+                f.seek(-sample_size, os.SEEK_END)
+                digest.update(f.read(sample_size))
+        return f"file_{digest.hexdigest()}"
+    except:
+        return None
+
+
+def get_cached_audio_path(cache_key):
+    return os.path.join(AUDIO_CACHE_DIR, f"{cache_key}.wav")
+
+
+def load_cached_audio(cache_key, audio_path):
+    cached_path = get_cached_audio_path(cache_key)
+    if not os.path.exists(cached_path):
+        return False
+    
+    try:
+        shutil.copyfile(cached_path, audio_path)
+        os.utime(cached_path)
+        return True
+    except Exception as e:
+        print(f"Erro ao ler o áudio do cache: {e}")
+        return False
+
+
+def is_cache_format(audio_path):
+    try:
+        with wave.open(audio_path, "rb") as f:
+            return f.getnchannels() == 1 and f.getframerate() == AUDIO_CACHE_SAMPLE_RATE and f.getsampwidth() == 2
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+def store_cached_audio(cache_key, audio_path):
+    temp_path = None
+    try:
+        if not os.path.exists(AUDIO_CACHE_DIR):
+            os.makedirs(AUDIO_CACHE_DIR)
+        
+        fd, temp_path = tempfile.mkstemp(suffix=".wav", dir=AUDIO_CACHE_DIR)
+        os.close(fd)
+        
+        converted = not is_cache_format(audio_path)
+        if converted:
+            audio = AudioSegment.from_wav(audio_path)
+            audio = audio.set_channels(1).set_frame_rate(AUDIO_CACHE_SAMPLE_RATE).set_sample_width(2)
+            audio.export(temp_path, format="wav")
+        else:
+            shutil.copyfile(audio_path, temp_path)
+        
+        cached_path = get_cached_audio_path(cache_key)
+        os.replace(temp_path, cached_path)
+        if converted:
+            shutil.copyfile(cached_path, audio_path)
+        print(f"Áudio salvo no cache: {cached_path}")
+        
+        evict_audio_cache()
+        return True
+    except Exception as e:
+        print(f"Erro ao salvar o áudio no cache: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+
+def get_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        return None
+
+
+def get_open_fd_count():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        pass
+    try:
+        import psutil
+        process = psutil.Process()
+        return process.num_handles() if sys.platform == "win32" else process.num_fds()
+    except ImportError:
+        return None
+
+
+def should_recycle_worker(jobs_done, max_jobs=None, max_rss_mb=None):
+    if max_jobs and jobs_done >= max_jobs:
+        print(f"Worker {os.getpid()} reciclado após {jobs_done} trabalhos")
+        return True
+    rss_mb = get_rss_mb() if max_rss_mb else None
+    if rss_mb and rss_mb >= max_rss_mb:
+        print(f"Worker {os.getpid()} reciclado com {rss_mb:.0f} MB de memória")
+        return True
+    return False
+
+
+_stats_lock = threading.Lock()
+
+
+def load_stats():
+    try:
+        with open(STATS_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except:
+        return {}
+
+
+def record_request_latency(seconds, requests):
+    if requests <= 0:
+        return
+    
+    with _stats_lock:
+        stats = load_stats()
+        stats["requests"] = stats.get("requests", 0) + requests
+        stats["request_seconds"] = stats.get("request_seconds", 0.0) + seconds
+        try:
+            os.makedirs(os.path.dirname(STATS_PATH), exist_ok=True)
+            with open(STATS_PATH, "w", encoding="utf-8") as f:
+                json.dump(stats, f, indent=2)
+        except Exception as e:
+            print(f"Erro ao salvar as estatísticas: {e}")
+
+
+def get_measured_latency():
+    stats = load_stats()
+    if stats.get("requests"):
+        return stats["request_seconds"] / stats["requests"]
+    return None
+
+
+def evict_audio_cache(max_bytes=AUDIO_CACHE_MAX_BYTES):
+    if not os.path.exists(AUDIO_CACHE_DIR):
+        return
+    
+    entries = []
+    for name in os.listdir(AUDIO_CACHE_DIR):
+        path = os.path.join(AUDIO_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        except:
+            pass
+    
+    total = sum(size for _, size, _ in entries)
+    entries.sort()
+    
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            print(f"Removido do cache: {path}")
+        except:
+            pass
+
+
+_probe_cache = {}
+_probe_lock = threading.Lock()
+
+
+def probe_media(media_path):
     try:
-        print(f"Extracting audio from {video_path}...")
+        stat = os.stat(media_path)
+    except OSError:
+        return None
+    
+    key = (os.path.abspath(media_path), stat.st_size, stat.st_mtime)
+    with _probe_lock:
+        if key in _probe_cache:
+            return _probe_cache[key]
+    
+    cmd = [FFPROBE_PATH, '-v', 'error', '-show_streams', '-show_format', '-of', 'json', media_path]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8")
+        if result.returncode != 0:
+            print(f"ffprobe não conseguiu ler {media_path}: {result.stderr.strip()}")
+            return None
+        data = json.loads(result.stdout)
+    except Exception as e:
+        print(f"ffprobe indisponível: {e}")
+        return None
+    
+    format_info = data.get("format", {})
+    audio_streams = []
+    has_video = False
+    
+    for stream in data.get("streams", []):
+        disposition = stream.get("disposition", {})
+        if stream.get("codec_type") == "video" and not disposition.get("attached_pic"):
+            has_video = True
+        elif stream.get("codec_type") == "audio":
+            audio_streams.append({
+                "index": stream.get("index"),
+                "audio_index": len(audio_streams),
+                "codec": stream.get("codec_name"),
+                "channels": stream.get("channels"),
+                "channel_layout": stream.get("channel_layout"),
+                "sample_rate": int(stream.get("sample_rate") or 0),
+                "language": stream.get("tags", {}).get("language"),
+                "default": bool(disposition.get("default"))
+            })
+    
+    try:
+        duration = float(format_info.get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+    
+    info = {
+        "format": format_info.get("format_name", ""),
+        "duration": duration,
+        "has_video": has_video,
+        "audio_streams": audio_streams
+    }
+    
+    with _probe_lock:
+        _probe_cache[key] = info
+    return info
+
+
+def get_default_audio_stream(info):
+    if not info or not info["audio_streams"]:
+        return None
+    for stream in info["audio_streams"]:
+        if stream["default"]:
+            return stream
+    return info["audio_streams"][0]
+
+
+def get_media_duration(media_path):
+    info = probe_media(media_path)
+    return info["duration"] if info else None
+
+
+def get_shard_count(duration, shards=0):
+    if shards == 1 or not duration:
+        return 1
+    if shards > 1:
+        return shards
+    if duration < SHARD_MIN_DURATION_SEC:
+        return 1
+    return max(1, min(os.cpu_count() or 1, math.ceil(duration / SHARD_TARGET_DURATION_SEC)))
+
+
+def extract_audio_shard(video_path, shard_path, start_sec, duration_sec, expected_samples, sample_rate, stream_index=0):
+    cmd = [
+        FFMPEG_PATH, '-nostdin', '-v', 'error', '-y',
+        '-ss', f"{start_sec:.6f}", '-t', f"{duration_sec:.6f}", '-i', video_path,
+        '-vn', '-map', f"0:a:{stream_index}", '-ac', '1', '-ar', str(sample_rate),
+        '-f', 's16le', '-acodec', 'pcm_s16le', shard_path
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0 or not os.path.exists(shard_path):
+        raise RuntimeError(result.stderr.strip() or "ffmpeg falhou")
+    
+    expected_bytes = expected_samples * 2
+    actual_bytes = os.path.getsize(shard_path)
+    if actual_bytes > expected_bytes:
+        with open(shard_path, "r+b") as f:
+            f.truncate(expected_bytes)
+    elif actual_bytes < expected_bytes:
+        with open(shard_path, "ab") as f:
+            f.write(b"\0" * (expected_bytes - actual_bytes))
+    return shard_path
+
+
+def write_wav_from_raw(audio_path, raw_files, sample_rate):
+    with wave.open(audio_path, "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(sample_rate)
+        for raw_file in raw_files:
+            with open(raw_file, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    output.writeframesraw(block)
+
+
+def extract_audio_sharded(video_path, audio_path, duration, shards, sample_rate=EXTRACT_SAMPLE_RATE, stream_index=0):
+    shard_dir = tempfile.mkdtemp(prefix="shards_", dir=os.path.dirname(audio_path) or ".")
+    try:
+        boundaries = [round(duration * i / shards * sample_rate) for i in range(shards + 1)]
+        
+        print(f"Extraindo áudio em {shards} partes paralelas ({duration/60:.1f} minutos)...")
+        with ThreadPoolExecutor(max_workers=shards) as executor:
+            futures = [
+                executor.submit(
+                    extract_audio_shard,
+                    video_path,
+                    os.path.join(shard_dir, f"shard_{i:03d}.raw"),
+                    boundaries[i] / sample_rate,
+                    (boundaries[i + 1] - boundaries[i]) / sample_rate,
+                    boundaries[i + 1] - boundaries[i],
+                    sample_rate,
+                    stream_index
+                )
+                for i in range(shards)
+            ]
+            shard_files = [future.result() for future in futures]
+        
+        write_wav_from_raw(audio_path, shard_files, sample_rate)
+        
+        print(f"Audio extracted successfully and saved to {audio_path}")
+        return True
+    except Exception as e:
+        print(f"Erro na extração paralela: {e}")
+        return False
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def extract_audio_with_moviepy(video_path, audio_path):
+    try:
+        from moviepy.video.io.VideoFileClip import VideoFileClip
         
         if video_path.endswith('.m4a'):
-            cmd = ['C:\\ffmpeg\\bin\\ffmpeg.exe', '-y', '-i', video_path, '-acodec', 'pcm_s16le', '-ar', '44100', audio_path]
+            cmd = [FFMPEG_PATH, '-y', '-i', video_path, '-acodec', 'pcm_s16le', '-ar', '44100', audio_path]
             subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             print(f"Audio extracted successfully and saved to {audio_path}")
             return True
         
         video = VideoFileClip(video_path)
+        try:
+            has_audio = video.audio is not None
+            if has_audio:
+                video.audio.write_audiofile(audio_path, codec='pcm_s16le')
+        finally:
+            video.close()
         
-        if video.audio is None:
+        if not has_audio:
             print("Vídeo não tem áudio. Procurando arquivo de áudio correspondente...")
             
             base_name = os.path.splitext(video_path)[0]
@@ -80,7 +656,7 @@ def extract_audio_from_video(video_path, audio_path):
             
             if audio_files:
                 print(f"Encontrado arquivo de áudio: {audio_files[0]}")
-                cmd = ['C:\\ffmpeg\\bin\\ffmpeg.exe', '-y', '-i', audio_files[0], '-acodec', 'pcm_s16le', '-ar', '44100', audio_path]
+                cmd = [FFMPEG_PATH, '-y', '-i', audio_files[0], '-acodec', 'pcm_s16le', '-ar', '44100', audio_path]
                 subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
                 print(f"Audio extracted successfully and saved to {audio_path}")
                 return True
@@ -88,14 +664,13 @@ def extract_audio_from_video(video_path, audio_path):
                 print("Não foi encontrado nenhum arquivo de áudio correspondente.")
                 return False
         
-        video.audio.write_audiofile(audio_path, codec='pcm_s16le')
         print(f"Audio extracted successfully and saved to {audio_path}")
         return True
     except Exception as e:
         print(f"Error extracting audio: {e}")
         try:
             print("Tentando extração com FFmpeg...")
-            cmd = ['C:\\ffmpeg\\bin\\ffmpeg.exe', '-y', '-i', video_path, '-acodec', 'pcm_s16le', '-ar', '44100', audio_path]
+            cmd = [FFMPEG_PATH, '-y', '-i', video_path, '-acodec', 'pcm_s16le', '-ar', '44100', audio_path]
             subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             if os.path.exists(audio_path):
                 print(f"Audio extracted successfully with FFmpeg and saved to {audio_path}")
@@ -106,159 +681,1129 @@ def extract_audio_from_video(video_path, audio_path):
         return False
 
 
-def split_audio_into_chunks(audio_path, chunk_length_ms=30000, output_dir="audio_chunks"):
-    try:
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            
-        print(f"Carregando o arquivo de áudio: {audio_path}")
-        audio = AudioSegment.from_wav(audio_path)
+def extract_audio_with_ffmpeg(media_path, audio_path, info, stream):
+    if (info["format"] == "wav" and not info["has_video"] and len(info["audio_streams"]) == 1
+            and stream["codec"] == "pcm_s16le" and stream["channels"] == 1):
+        shutil.copyfile(media_path, audio_path)
+        print(f"Arquivo já está em PCM, copiado para {audio_path}")
+        return True
+    
+    cmd = [
+        FFMPEG_PATH, '-nostdin', '-v', 'error', '-y', '-i', media_path,
+        '-map', f"0:a:{stream['audio_index']}", '-vn', '-sn', '-dn',
+        '-ac', '1', '-ar', str(EXTRACT_SAMPLE_RATE), '-acodec', 'pcm_s16le', audio_path
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0 or not os.path.exists(audio_path):
+        print(f"Erro do FFmpeg: {result.stderr.strip()}")
+        return False
+    
+    print(f"Audio extracted successfully and saved to {audio_path}")
+    return True
+
+
+def extract_audio_from_video(video_path, audio_path, shards=0):
+    print(f"Extracting audio from {video_path}...")
+    
+    info = probe_media(video_path)
+    if info is None:
+        return extract_audio_with_moviepy(video_path, audio_path)
+    
+    stream = get_default_audio_stream(info)
+    if stream is None:
+        print("Vídeo não tem áudio.")
+        return False
+    
+    print(f"Faixa de áudio: {stream['codec']}, {stream['channels']} canais "
+          f"({stream['channel_layout'] or 'layout desconhecido'}), {stream['sample_rate']} Hz")
+    
+    try:
+        shard_count = get_shard_count(info["duration"], shards)
+        if shard_count > 1 and extract_audio_sharded(video_path, audio_path, info["duration"], shard_count,
+                                                     stream_index=stream["audio_index"]):
+            return True
+        
+        return extract_audio_with_ffmpeg(video_path, audio_path, info, stream)
+    except Exception as e:
+        print(f"Error extracting audio: {e}")
+        return False
+
+
+def parse_track_spec(spec, info, default_language="en-US"):
+    streams = info["audio_streams"] if info else []
+    if not streams:
+        raise ValueError("O arquivo não tem faixas de áudio")
+    
+    if not spec or spec.strip() == "all":
+        items = [str(stream["audio_index"]) for stream in streams]
+    else:
+        items = [item.strip() for item in spec.split(",") if item.strip()]
+    
+    tracks = []
+    for item in items:
+        index, _, language = item.partition(":")
+        try:
+            stream = streams[int(index)]
+        except (ValueError, IndexError):
+            raise ValueError(f"Faixa de áudio inválida: {index} (o arquivo tem {len(streams)} faixas)")
+        language = language.strip() or TRACK_LANGUAGE_TAGS.get(stream["language"] or "", default_language)
+        tracks.append((stream["audio_index"], language))
+    return tracks
+
+
+def extract_audio_tracks(media_path, workspace, track_indexes, sample_rate=EXTRACT_SAMPLE_RATE):
+    cmd = [FFMPEG_PATH, '-nostdin', '-v', 'error', '-y', '-i', media_path]
+    track_paths = {}
+    for index in track_indexes:
+        track_path = os.path.join(workspace, f"faixa{index}", "temp_audio.wav")
+        os.makedirs(os.path.dirname(track_path), exist_ok=True)
+        cmd += ['-map', f"0:a:{index}", '-ac', '1', '-ar', str(sample_rate), '-acodec', 'pcm_s16le', track_path]
+        track_paths[index] = track_path
+    
+    print(f"Extraindo {len(track_paths)} faixas de áudio em uma única leitura do arquivo...")
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        print(f"Erro do FFmpeg: {result.stderr.strip()}")
+        return None
+    return track_paths
+
+
+def parse_timestamp(value):
+    parts = value.strip().split(":")
+    if not parts or len(parts) > 3:
+        raise ValueError(f"Horário inválido: {value}")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    if seconds < 0:
+        raise ValueError(f"Horário inválido: {value}")
+    return seconds
+
+
+def format_timestamp(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def parse_time_ranges(text):
+    ranges = []
+    for item in text.replace(",", ";").split(";"):
+        if not item.strip():
+            continue
+        start, separator, end = item.partition("-")
+        if not separator:
+            raise ValueError(f"Trecho inválido (use INÍCIO-FIM): {item.strip()}")
+        start_sec = parse_timestamp(start) if start.strip() else 0.0
+        end_sec = parse_timestamp(end) if end.strip() else None
+        if end_sec is not None and end_sec <= start_sec:
+            raise ValueError(f"Trecho inválido (fim antes do início): {item.strip()}")
+        ranges.append((start_sec, end_sec))
+    return merge_time_ranges(ranges)
+
+
+def merge_time_ranges(ranges):
+    merged = []
+    for start_sec, end_sec in sorted(ranges, key=lambda time_range: time_range[0]):
+        if merged and (merged[-1][1] is None or start_sec <= merged[-1][1]):
+            previous_end = merged[-1][1]
+            merged[-1] = (merged[-1][0], None if previous_end is None or end_sec is None else max(previous_end, end_sec))
+        else:
+            merged.append((start_sec, end_sec))
+    return merged
+
+
+def extract_unprobed_audio_range(media_path, audio_path, start_sec, end_sec=None, sample_rate=EXTRACT_SAMPLE_RATE):
+    print("Duração do arquivo desconhecida (ffprobe indisponível), extraindo o trecho direto com o FFmpeg")
+    cmd = [FFMPEG_PATH, '-nostdin', '-v', 'error', '-y', '-ss', f"{start_sec:.6f}"]
+    if end_sec is not None:
+        cmd += ['-t', f"{end_sec - start_sec:.6f}"]
+    cmd += [
+        '-i', media_path, '-vn', '-map', '0:a:0', '-ac', '1', '-ar', str(sample_rate),
+        '-acodec', 'pcm_s16le', audio_path
+    ]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0 or not os.path.exists(audio_path):
+            raise RuntimeError(result.stderr.strip() or "ffmpeg falhou")
+        duration = get_wav_duration_ms(audio_path) / 1000
+    except Exception as e:
+        print(f"Erro ao extrair o trecho a partir de {format_timestamp(start_sec)}: {e}")
+        return None
+    
+    if duration <= 0:
+        print(f"Trecho {format_timestamp(start_sec)} fora da duração do arquivo")
+        return None
+    
+    print(f"Trecho {format_timestamp(start_sec)}-{format_timestamp(start_sec + duration)} extraído")
+    return start_sec, start_sec + duration
+
+
+def extract_audio_range(media_path, audio_path, start_sec, end_sec=None, sample_rate=EXTRACT_SAMPLE_RATE):
+    info = probe_media(media_path)
+    if info is None and is_ffmpeg_available():
+        return extract_unprobed_audio_range(media_path, audio_path, start_sec, end_sec, sample_rate)
+    stream = get_default_audio_stream(info)
+    if stream is None:
+        print(f"Não foi possível ler a faixa de áudio de {media_path}")
+        return None
+    
+    if info["duration"]:
+        end_sec = min(end_sec, info["duration"]) if end_sec is not None else info["duration"]
+    if end_sec is None or end_sec <= start_sec:
+        print(f"Trecho {format_timestamp(start_sec)} fora da duração do arquivo")
+        return None
+    
+    raw_path = os.path.splitext(audio_path)[0] + ".raw"
+    try:
+        samples = round((end_sec - start_sec) * sample_rate)
+        extract_audio_shard(media_path, raw_path, start_sec, end_sec - start_sec, samples, sample_rate,
+                            stream["audio_index"])
+        write_wav_from_raw(audio_path, [raw_path], sample_rate)
+    except Exception as e:
+        print(f"Erro ao extrair o trecho {format_timestamp(start_sec)}-{format_timestamp(end_sec)}: {e}")
+        return None
+    finally:
+        if os.path.exists(raw_path):
+            os.remove(raw_path)
+    
+    print(f"Trecho {format_timestamp(start_sec)}-{format_timestamp(end_sec)} extraído")
+    return start_sec, end_sec
+
+
+def prepare_audio_ranges(video_path, workspace, ranges, cache_key=None, use_cache=True):
+    source = video_path
+    if use_cache and cache_key and os.path.exists(get_cached_audio_path(cache_key)):
+        print("Áudio encontrado no cache, extraindo os trechos dele")
+        source = get_cached_audio_path(cache_key)
+    
+    range_files = []
+    for i, (start_sec, end_sec) in enumerate(ranges):
+        range_path = os.path.join(workspace, f"range_{i:03d}", "temp_audio.wav")
+        os.makedirs(os.path.dirname(range_path))
+        extracted = extract_audio_range(source, range_path, start_sec, end_sec)
+        if extracted:
+            range_files.append((extracted[0], extracted[1], range_path))
+    return range_files
+
+
+def find_speech_windows(audio, max_window_ms=10000, min_silence_ms=500, silence_thresh_db=None, padding_ms=200):
+    if audio.dBFS == float("-inf"):
+        return []
+    
+    if silence_thresh_db is None:
+        silence_thresh_db = audio.dBFS - 16
+    
+    windows = []
+    for start_ms, end_ms in detect_nonsilent(audio, min_silence_ms, silence_thresh_db, seek_step=10):
+        start_ms = max(0, start_ms - padding_ms)
+        end_ms = min(len(audio), end_ms + padding_ms)
+        while start_ms < end_ms:
+            windows.append((start_ms, min(start_ms + max_window_ms, end_ms)))
+            start_ms += max_window_ms
+    return windows
+
+
+def get_chunk_count(duration_ms, chunk_length_ms, overlap_ms=0):
+    if duration_ms <= 0:
+        return 0
+    return max(1, math.ceil((duration_ms - overlap_ms) / chunk_length_ms))
+
+
+def split_audio_into_chunks(audio_path, chunk_length_ms=30000, output_dir="audio_chunks", overlap_ms=0):
+    try:
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+            
+        print(f"Carregando o arquivo de áudio: {audio_path}")
+        audio = AudioSegment.from_wav(audio_path)
+        
+        duration = len(audio)
+        num_chunks = get_chunk_count(duration, chunk_length_ms, overlap_ms)
+        print(f"Dividindo o áudio em {num_chunks} segmentos de {chunk_length_ms/1000} segundos...")
+        
+        chunk_files = []
+        for i in range(num_chunks):
+            start_ms = i * chunk_length_ms
+            end_ms = min((i + 1) * chunk_length_ms + overlap_ms, duration)
+            
+            chunk = audio[start_ms:end_ms]
+            chunk_file = os.path.join(output_dir, f"chunk_{i:03d}.wav")
+            chunk.export(chunk_file, format="wav")
+            chunk_files.append(chunk_file)
+            
+        print(f"Áudio dividido em {len(chunk_files)} segmentos")
+        return chunk_files
+    
+    except Exception as e:
+        print(f"Erro ao dividir o áudio: {e}")
+        return []
+
+
+def parse_google_response(response):
+    if not isinstance(response, dict) or not response.get("alternative"):
+        return {"text": "", "confidence": 0.0, "alternatives": []}
+    
+    alternatives = response["alternative"]
+    best = next((alternative for alternative in alternatives if "confidence" in alternative), alternatives[0])
+    return {
+        "text": best.get("transcript", ""),
+        "confidence": best.get("confidence"),
+        "alternatives": [alternative.get("transcript", "") for alternative in alternatives if alternative is not best]
+    }
+
+
+def recognize_chunk(audio_path, language="en-US", raise_errors=False, backend="google", recognizer=None):
+    recognizer = recognizer or sr.Recognizer()
+    
+    try:
+        with sr.AudioFile(audio_path) as source:
+            audio_data = recognizer.record(source)
+        
+        if backend == "sphinx":
+            text = recognizer.recognize_sphinx(audio_data, language=language)
+            return {"text": text, "confidence": None, "alternatives": []}
+        
+        response = recognizer.recognize_google(audio_data, language=language, show_all=True)
+        return parse_google_response(response)
+    except sr.UnknownValueError:
+        return {"text": "", "confidence": 0.0, "alternatives": []}
+    except sr.RequestError as e:
+        print(f"Erro na API do Google: {e}")
+        if raise_errors:
+            raise
+        return {"text": "", "confidence": None, "alternatives": [], "error": str(e)}
+    except Exception as e:
+        print(f"Erro ao transcrever o chunk {audio_path}: {e}")
+        if raise_errors:
+            raise
+        return {"text": "", "confidence": None, "alternatives": [], "error": str(e)}
+
+
+def transcribe_audio_chunk(audio_path, language="en-US", raise_errors=False):
+    return recognize_chunk(audio_path, language, raise_errors)["text"]
+
+
+def open_fingerprint_index():
+    if os.environ.get(DEDUPE_ENV) != "1":
+        return None
+    if not audio_fingerprint.is_available():
+        print("NumPy não está instalado; reaproveitamento de segmentos repetidos desativado")
+        return None
+    try:
+        return audio_fingerprint.FingerprintIndex()
+    except Exception as e:
+        print(f"Erro ao abrir o índice de impressões acústicas: {e}")
+        return None
+
+
+def recognize_chunk_with_fingerprints(chunk_file, language, recognizer, fingerprints):
+    try:
+        fingerprint, level_db = audio_fingerprint.fingerprint_wav(chunk_file)
+    except Exception as e:
+        print(f"Erro ao calcular a impressão acústica de {chunk_file}: {e}")
+        return recognize_chunk(chunk_file, language, recognizer=recognizer)
+    
+    if level_db >= audio_fingerprint.MIN_LEVEL_DB:
+        match = fingerprints.lookup(fingerprint, language)
+        if match:
+            print(f"Segmento já transcrito antes (diferença de {match['bit_error_rate']:.0%}), reaproveitando o texto")
+            return {"text": match["text"], "confidence": match["confidence"], "alternatives": [], "reused": True}
+    
+    result = recognize_chunk(chunk_file, language, recognizer=recognizer)
+    if result["text"] and not result.get("error") and level_db >= audio_fingerprint.MIN_LEVEL_DB:
+        fingerprints.add(fingerprint, language, result["text"], result["confidence"])
+    return result
+
+
+def condition_audio(audio_path):
+    if os.environ.get(CONDITION_ENV) != "1":
+        return audio_path, None
+    if not audio_conditioning.is_available():
+        print("NumPy não está instalado; condicionamento do áudio desativado")
+        return audio_path, None
+    
+    conditioned_path = os.path.splitext(audio_path)[0] + "_condicionado.wav"
+    try:
+        conditioning = audio_conditioning.condition_wav(audio_path, conditioned_path)
+    except Exception as e:
+        print(f"Erro ao condicionar o áudio, usando o original: {e}")
+        conditioning = None
+    if not conditioning:
+        return audio_path, None
+    return conditioned_path, conditioning
+
+
+def get_wav_duration_ms(audio_path):
+    with wave.open(audio_path, "rb") as f:
+        return int(f.getnframes() * 1000 / f.getframerate())
+
+
+def transcribe_audio_segments(audio_path, language="en-US", chunk_length_sec=30, progress_callback=None, profile_dir=None,
+                              recognizer=None, overlap_sec=0):
+    chunk_length_ms = chunk_length_sec * 1000
+    overlap_ms = int(overlap_sec * 1000)
+    
+    with profile_stage("condicionamento", profile_dir):
+        chunk_source, conditioning = condition_audio(audio_path)
+    
+    with profile_stage("divisao", profile_dir):
+        chunk_files = split_audio_into_chunks(chunk_source, chunk_length_ms, 
+                                             os.path.join(os.path.dirname(audio_path), "audio_chunks"), overlap_ms)
+    
+    if chunk_source != audio_path:
+        os.remove(chunk_source)
+    
+    if not chunk_files:
+        return None
+    
+    duration_ms = get_wav_duration_ms(audio_path)
+    print(f"Transcrevendo {len(chunk_files)} segmentos de áudio...")
+    segments = []
+    fingerprints = open_fingerprint_index()
+    
+    request_started = time.perf_counter()
+    with profile_stage("transcricao", profile_dir):
+        for i, chunk_file in enumerate(chunk_files):
+            print(f"Processando segmento {i+1} de {len(chunk_files)}...")
+            start_ms = i * chunk_length_ms
+            end_ms = min(start_ms + chunk_length_ms + overlap_ms, duration_ms)
+            
+            if conditioning and audio_conditioning.is_gated(conditioning, start_ms, end_ms):
+                print("Segmento silenciado pelo noise gate, sem requisição")
+                result = {"text": "", "confidence": 0.0, "alternatives": [], "skipped": True}
+            elif fingerprints:
+                result = recognize_chunk_with_fingerprints(chunk_file, language, recognizer, fingerprints)
+            else:
+                result = recognize_chunk(chunk_file, language, recognizer=recognizer)
+            
+            result.update({
+                "index": i,
+                "start": start_ms / 1000,
+                "end": end_ms / 1000
+            })
+            segments.append(result)
+            
+            if progress_callback:
+                progress = int((i + 1) / len(chunk_files) * 100)
+                progress_callback(progress)
+            
+            try:
+                os.remove(chunk_file)
+            except:
+                pass
+    
+    reused = sum(1 for segment in segments if segment.get("reused"))
+    skipped = sum(1 for segment in segments if segment.get("skipped"))
+    if fingerprints:
+        fingerprints.close()
+        print(f"{reused} de {len(segments)} segmentos reaproveitados do índice de impressões acústicas "
+              f"({reused} requisições economizadas)")
+    if conditioning:
+        print(f"{skipped} de {len(segments)} segmentos só com silêncio após o noise gate "
+              f"({skipped} requisições economizadas)")
+    record_request_latency(time.perf_counter() - request_started, len(segments) - reused - skipped)
+    
+    try:
+        chunks_dir = os.path.join(os.path.dirname(audio_path), "audio_chunks")
+        if os.path.exists(chunks_dir) and not os.listdir(chunks_dir):
+            os.rmdir(chunks_dir)
+    except:
+        pass
+    
+    return segments
+
+
+def get_auto_language_candidates(language):
+    if not language or not language.startswith(AUTO_LANGUAGE):
+        return None
+    _, _, candidates = language.partition(":")
+    return [candidate.strip() for candidate in candidates.split(",") if candidate.strip()] or AUTO_LANGUAGE_CANDIDATES
+
+
+def read_wav_excerpt(audio_path, start_ms, end_ms):
+    with wave.open(audio_path, "rb") as f:
+        frame_rate = f.getframerate()
+        start_frame = min(int(start_ms * frame_rate / 1000), f.getnframes())
+        f.setpos(start_frame)
+        data = f.readframes(int((end_ms - start_ms) * frame_rate / 1000))
+        return AudioSegment(data=data, sample_width=f.getsampwidth(), frame_rate=frame_rate, channels=f.getnchannels())
+
+
+def pick_excerpt_regions(duration_ms, sample_count=LANGUAGE_SAMPLE_COUNT, excerpt_ms=LANGUAGE_EXCERPT_MS):
+    if duration_ms <= excerpt_ms * sample_count:
+        step = duration_ms / sample_count
+        return [(int(step * i), int(step * (i + 1))) for i in range(sample_count) if step > 0]
+    regions = []
+    for i in range(sample_count):
+        center = duration_ms * (i + 0.5) / sample_count
+        regions.append((int(center - excerpt_ms / 2), int(center + excerpt_ms / 2)))
+    return regions
+
+
+def pick_sample_window(windows, min_length_ms=2000):
+    usable = [window for window in windows if window[1] - window[0] >= min_length_ms] or windows
+    if not usable:
+        return None
+    return usable[len(usable) // 2]
+
+
+def detect_language(audio_path, candidates=None, sample_count=LANGUAGE_SAMPLE_COUNT):
+    candidates = candidates or AUTO_LANGUAGE_CANDIDATES
+    
+    sample_dir = os.path.join(os.path.dirname(audio_path), "language_samples")
+    os.makedirs(sample_dir, exist_ok=True)
+    sample_files = []
+    for start_ms, end_ms in pick_excerpt_regions(get_wav_duration_ms(audio_path), sample_count):
+        excerpt = read_wav_excerpt(audio_path, start_ms, end_ms)
+        window = pick_sample_window(find_speech_windows(excerpt, LANGUAGE_SAMPLE_MS))
+        if window:
+            sample_file = os.path.join(sample_dir, f"sample_{len(sample_files):02d}.wav")
+            excerpt[window[0]:window[1]].export(sample_file, format="wav")
+            sample_files.append(sample_file)
+    
+    if not sample_files:
+        shutil.rmtree(sample_dir, ignore_errors=True)
+        print(f"Nenhum trecho com fala encontrado, usando {candidates[0]}")
+        return candidates[0]
+    
+    print(f"Detectando o idioma em {len(sample_files)} trechos entre {', '.join(candidates)}...")
+    jobs = [(language, sample_file) for language in candidates for sample_file in sample_files]
+    with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+        results = list(executor.map(lambda job: recognize_chunk(job[1], job[0]), jobs))
+    
+    scores = dict.fromkeys(candidates, 0.0)
+    for (language, _), result in zip(jobs, results):
+        scores[language] += get_confidence_score(result)
+    
+    shutil.rmtree(sample_dir, ignore_errors=True)
+    
+    best = max(candidates, key=lambda language: scores[language])
+    print("Pontuação por idioma: " + ", ".join(f"{language} {scores[language]:.2f}" for language in candidates))
+    print(f"Idioma detectado: {best} ({len(jobs)} requisições de amostra)")
+    return best
+
+
+def resolve_language(audio_path, language):
+    candidates = get_auto_language_candidates(language)
+    if candidates is None:
+        return language
+    return detect_language(audio_path, candidates)
+
+
+def normalize_word(word):
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+def dedupe_seam(previous_words, words, max_words=SEAM_MAX_WORDS, edge_words=2):
+    tail = [normalize_word(word) for word in previous_words[-max_words:]]
+    head = [normalize_word(word) for word in words[:max_words]]
+    match = difflib.SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(0, len(tail), 0, len(head))
+    
+    if match.size < SEAM_MIN_MATCH_WORDS and match.size < len(head):
+        return 0, words
+    if match.a + match.size < len(tail) - edge_words or match.b > edge_words:
+        return 0, words
+    return len(tail) - match.a - match.size, words[match.b + match.size:]
+
+
+def join_segments_text(segments):
+    words = []
+    previous = None
+    for segment in segments:
+        segment_words = segment["text"].split() if segment["text"] else []
+        if (segment_words and words and previous and previous["text"]
+                and segment.get("start") is not None and segment["start"] < previous.get("end", 0) - 0.05):
+            trimmed, segment_words = dedupe_seam(words, segment_words)
+            del words[len(words) - trimmed:]
+        words.extend(segment_words)
+        previous = segment
+    return " ".join(words)
+
+
+def join_range_blocks(segments, ranges):
+    blocks = []
+    for start_sec, end_sec in ranges:
+        range_segments = [segment for segment in segments if start_sec <= segment["start"] < end_sec]
+        blocks.append(f"[{format_timestamp(start_sec)} - {format_timestamp(end_sec)}]\n{join_segments_text(range_segments)}")
+    return "\n\n".join(blocks)
+
+
+def join_transcript_text(data):
+    if data.get("ranges"):
+        return join_range_blocks(data["segments"], data["ranges"])
+    return join_segments_text(data["segments"])
+
+
+def transcribe_audio_with_chunks(audio_path, language="en-US", chunk_length_sec=30, progress_callback=None, profile_dir=None,
+                                 overlap_sec=0):
+    language = resolve_language(audio_path, language)
+    segments = transcribe_audio_segments(audio_path, language, chunk_length_sec, progress_callback, profile_dir,
+                                         overlap_sec=overlap_sec)
+    if segments is None:
+        return "Falha ao dividir o áudio em segmentos"
+    return join_segments_text(segments)
+
+
+def get_segments_path(output_text_path):
+    if output_text_path.endswith("_transcricao.txt"):
+        return output_text_path[:-len("_transcricao.txt")] + "_segmentos.json"
+    return os.path.splitext(output_text_path)[0] + "_segmentos.json"
+
+
+def save_segments(segments_path, data):
+    try:
+        with open(segments_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"Segmentos salvos em {segments_path}")
+    except Exception as e:
+        print(f"Erro ao salvar os segmentos: {e}")
+
+
+def prepare_audio(video_path, audio_path, cache_key=None, use_cache=True, shards=0):
+    if use_cache and not cache_key:
+        cache_key = get_audio_cache_key(video_path)
+    
+    cached = use_cache and cache_key and load_cached_audio(cache_key, audio_path)
+    if cached:
+        print("Áudio encontrado no cache, pulando a extração")
+    elif not extract_audio_from_video(video_path, audio_path, shards):
+        base_name = os.path.splitext(video_path)[0]
+        audio_files = glob.glob(f"{base_name}*.m4a") + glob.glob(f"{base_name}*.mp3") + glob.glob(f"{base_name}*.aac")
+        
+        if audio_files:
+            print(f"Trying to use separate audio file: {audio_files[0]}")
+            if not extract_audio_from_video(audio_files[0], audio_path, shards):
+                return "Failed to extract audio from video and audio files"
+        else:
+            return "Failed to extract audio from video and no audio files found"
+    
+    if use_cache and cache_key and not cached:
+        store_cached_audio(cache_key, audio_path)
+    
+    return None
+
+
+def extract_speech_from_video(video_path, output_text_path=None, language="en-US", chunk_length_sec=30, progress_callback=None, cache_key=None, use_cache=True, shards=0, profile=False,
+                              recognizer=None, ranges=None, overlap_sec=0):
+    video_dir = os.path.dirname(video_path)
+    profile_dir = video_dir if profile else None
+    if not output_text_path:
+        base_name = os.path.splitext(os.path.basename(video_path))[0]
+        output_text_path = os.path.join(video_dir, f"{base_name}_transcricao.txt")
+    
+    if use_cache and not cache_key:
+        cache_key = get_audio_cache_key(video_path)
+    
+    if ranges:
+        return extract_speech_from_ranges(video_path, output_text_path, language, chunk_length_sec, progress_callback,
+                                          cache_key, use_cache, profile_dir, recognizer, ranges, overlap_sec)
+    
+    with job_workspace(estimate_scratch_bytes(video_path)) as workspace:
+        temp_audio_path = os.path.join(workspace, "temp_audio.wav")
+        
+        with profile_stage("extracao", profile_dir):
+            error = prepare_audio(video_path, temp_audio_path, cache_key, use_cache, shards)
+        if error:
+            return error
+        
+        language = resolve_language(temp_audio_path, language)
+        
+        if progress_callback:
+            progress_callback(25)
+        
+        segments = transcribe_audio_segments(
+            temp_audio_path, 
+            language, 
+            chunk_length_sec,
+            lambda progress: progress_callback(25 + progress * 0.75) if progress_callback else None,
+            profile_dir,
+            recognizer,
+            overlap_sec
+        )
+    
+    if segments is None:
+        print("Falha ao dividir o áudio em segmentos; nenhuma transcrição foi salva")
+        return "Falha ao dividir o áudio em segmentos"
+    
+    transcribed_text = join_segments_text(segments)
+    save_segments(get_segments_path(output_text_path), {
+        "video_path": os.path.abspath(video_path),
+        "cache_key": cache_key,
+        "language": language,
+        "chunk_length_sec": chunk_length_sec,
+        "overlap_sec": overlap_sec,
+        "segments": segments
+    })
+    
+    if output_text_path and transcribed_text:
+        try:
+            with open(output_text_path, 'w', encoding='utf-8') as file:
+                file.write(transcribed_text)
+            print(f"Transcribed text saved to {output_text_path}")
+        except Exception as e:
+            print(f"Error saving transcribed text: {e}")
+    
+    if progress_callback:
+        progress_callback(100)
+    
+    return transcribed_text
+
+
+def extract_speech_from_ranges(video_path, output_text_path, language, chunk_length_sec, progress_callback, cache_key,
+                               use_cache, profile_dir, recognizer, ranges, overlap_sec=0):
+    requested_sec = sum(end - start for start, end in ranges if end is not None)
+    
+    with job_workspace(int(requested_sec * EXTRACT_SAMPLE_RATE * 2) if requested_sec else estimate_scratch_bytes(video_path)) as workspace:
+        with profile_stage("extracao", profile_dir):
+            range_files = prepare_audio_ranges(video_path, workspace, ranges, cache_key, use_cache)
+        if not range_files:
+            return "Failed to extract the requested time ranges"
         
-        duration = len(audio)
-        num_chunks = math.ceil(duration / chunk_length_ms)
-        print(f"Dividindo o áudio em {num_chunks} segmentos de {chunk_length_ms/1000} segundos...")
+        language = resolve_language(range_files[0][2], language)
         
-        chunk_files = []
-        for i in range(num_chunks):
-            start_ms = i * chunk_length_ms
-            end_ms = min((i + 1) * chunk_length_ms, duration)
-            
-            chunk = audio[start_ms:end_ms]
-            chunk_file = os.path.join(output_dir, f"chunk_{i:03d}.wav")
-            chunk.export(chunk_file, format="wav")
-            chunk_files.append(chunk_file)
+        if progress_callback:
+            progress_callback(25)
+        
+        segments = []
+        for i, (start_sec, end_sec, range_path) in enumerate(range_files):
+            print(f"Transcrevendo o trecho {format_timestamp(start_sec)}-{format_timestamp(end_sec)}")
+            range_segments = transcribe_audio_segments(
+                range_path,
+                language,
+                chunk_length_sec,
+                lambda progress: progress_callback(25 + (i + progress / 100) / len(range_files) * 75) if progress_callback else None,
+                profile_dir,
+                recognizer,
+                overlap_sec
+            )
+            if range_segments is None:
+                return "Falha ao dividir o áudio em segmentos"
             
-        print(f"Áudio dividido em {len(chunk_files)} segmentos")
-        return chunk_files
+            for segment in range_segments:
+                segment["index"] = len(segments)
+                segment["start"] += start_sec
+                segment["end"] += start_sec
+                segments.append(segment)
     
-    except Exception as e:
-        print(f"Erro ao dividir o áudio: {e}")
-        return []
-
-
-def transcribe_audio_chunk(audio_path, language="en-US"):
-    recognizer = sr.Recognizer()
+    range_bounds = [[start_sec, end_sec] for start_sec, end_sec, _ in range_files]
+    transcribed_text = join_range_blocks(segments, range_bounds)
+    save_segments(get_segments_path(output_text_path), {
+        "video_path": os.path.abspath(video_path),
+        "cache_key": cache_key,
+        "language": language,
+        "chunk_length_sec": chunk_length_sec,
+        "overlap_sec": overlap_sec,
+        "ranges": range_bounds,
+        "segments": segments
+    })
     
     try:
-        with sr.AudioFile(audio_path) as source:
-            audio_data = recognizer.record(source)
-            
-            text = recognizer.recognize_google(audio_data, language=language)
-            return text
-    except sr.UnknownValueError:
-        return ""
-    except sr.RequestError as e:
-        print(f"Erro na API do Google: {e}")
-        return ""
+        with open(output_text_path, 'w', encoding='utf-8') as file:
+            file.write(transcribed_text)
+        print(f"Transcribed text saved to {output_text_path}")
     except Exception as e:
-        print(f"Erro ao transcrever o chunk {audio_path}: {e}")
-        return ""
+        print(f"Error saving transcribed text: {e}")
+    
+    if progress_callback:
+        progress_callback(100)
+    
+    return transcribed_text
 
 
-def transcribe_audio_with_chunks(audio_path, language="en-US", chunk_length_sec=30, progress_callback=None):
-    chunk_length_ms = chunk_length_sec * 1000
+def get_confidence_score(result):
+    if result.get("confidence") is not None:
+        return result["confidence"]
+    return 0.5 if result.get("text") else 0.0
+
+
+def refine_transcription(segments_path, min_confidence=0.7, margin_sec=1.0, backend=None, progress_callback=None):
+    with open(segments_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
     
-    chunk_files = split_audio_into_chunks(audio_path, chunk_length_ms, 
-                                         os.path.join(os.path.dirname(audio_path), "audio_chunks"))
+    segments = data["segments"]
+    language = data.get("language", "en-US")
+    candidates = [
+        segment for segment in segments
+        if not segment.get("skipped") and get_confidence_score(segment) < min_confidence
+    ]
     
-    if not chunk_files:
-        return "Falha ao dividir o áudio em segmentos"
+    print(f"{len(candidates)} de {len(segments)} segmentos com confiança abaixo de {min_confidence}")
+    if not candidates:
+        return join_transcript_text(data)
     
-    print(f"Transcrevendo {len(chunk_files)} segmentos de áudio...")
-    full_text = []
+    backends = ["google"] + ([backend] if backend and backend != "google" else [])
+    requests_made = 0
+    improved = 0
+    ranges = data.get("ranges")
+    if ranges:
+        expected_bytes = int(sum(end - start for start, end in ranges) * EXTRACT_SAMPLE_RATE * 2)
+    else:
+        expected_bytes = estimate_scratch_bytes(data.get("video_path"))
     
-    for i, chunk_file in enumerate(chunk_files):
-        print(f"Processando segmento {i+1} de {len(chunk_files)}...")
-        chunk_text = transcribe_audio_chunk(chunk_file, language)
+    with job_workspace(expected_bytes) as workspace:
+        audio_path = os.path.join(workspace, "temp_audio.wav")
+        cache_key = data.get("cache_key")
+        sources = [(0.0, audio_path)]
         
-        if chunk_text:
-            full_text.append(chunk_text)
+        if data.get("track") is not None:
+            track_paths = extract_audio_tracks(data.get("video_path"), workspace, [data["track"]])
+            if not track_paths:
+                print(f"Falha ao extrair a faixa {data['track']} de {data.get('video_path')}")
+                return None
+            sources = [(0.0, track_paths[data["track"]])]
+        elif ranges:
+            range_files = prepare_audio_ranges(data.get("video_path"), workspace, ranges, cache_key)
+            if not range_files:
+                print(f"Falha ao extrair os trechos de {data.get('video_path')}")
+                return None
+            sources = [(start_sec, range_path) for start_sec, _, range_path in range_files]
+        elif not (cache_key and load_cached_audio(cache_key, audio_path)):
+            error = prepare_audio(data.get("video_path"), audio_path, cache_key)
+            if error:
+                print(error)
+                return None
         
-        if progress_callback:
-            progress = int((i + 1) / len(chunk_files) * 100)
-            progress_callback(progress)
+        loaded = {}
+        window_path = os.path.join(workspace, "refine_window.wav")
         
-        try:
-            os.remove(chunk_file)
-        except:
-            pass
+        for i, segment in enumerate(candidates):
+            offset_sec, source_path = sources[0]
+            for source in sources:
+                if source[0] <= segment["start"] + 0.001:
+                    offset_sec, source_path = source
+            if source_path not in loaded:
+                loaded[source_path] = AudioSegment.from_wav(source_path)
+            audio = loaded[source_path]
+            
+            start_ms = max(0, int((segment["start"] - offset_sec - margin_sec) * 1000))
+            end_ms = min(len(audio), int((segment["end"] - offset_sec + margin_sec) * 1000))
+            audio[start_ms:end_ms].export(window_path, format="wav")
+            
+            best = segment
+            for candidate_backend in backends:
+                result = recognize_chunk(window_path, language, backend=candidate_backend)
+                requests_made += 1
+                if get_confidence_score(result) > get_confidence_score(best):
+                    result["backend"] = candidate_backend
+                    best = result
+            
+            if best is not segment:
+                print(f"Segmento {segment['index'] + 1}: confiança {get_confidence_score(segment):.2f} -> {get_confidence_score(best):.2f}")
+                segment.update({
+                    "start": offset_sec + start_ms / 1000,
+                    "end": offset_sec + end_ms / 1000,
+                    "text": best["text"],
+                    "confidence": best["confidence"],
+                    "alternatives": best["alternatives"],
+                    "refined": best.get("backend", "google")
+                })
+                segment.pop("error", None)
+                improved += 1
+            
+            if progress_callback:
+                progress_callback(int((i + 1) / len(candidates) * 100))
     
-    try:
-        chunks_dir = os.path.join(os.path.dirname(audio_path), "audio_chunks")
-        if os.path.exists(chunks_dir) and not os.listdir(chunks_dir):
-            os.rmdir(chunks_dir)
-    except:
-        pass
+    print(f"Refinamento: {improved} segmentos melhorados com {requests_made} requisições "
+          f"(uma transcrição completa usaria {len(segments)})")
     
-    return " ".join(full_text)
+    save_segments(segments_path, data)
+    
+    transcribed_text = join_transcript_text(data)
+    if segments_path.endswith("_segmentos.json"):
+        output_text_path = segments_path[:-len("_segmentos.json")] + "_transcricao.txt"
+        with open(output_text_path, "w", encoding="utf-8") as file:
+            file.write(transcribed_text)
+        print(f"Transcribed text saved to {output_text_path}")
+        index_transcript(output_text_path)
+    
+    return transcribed_text
 
 
-def extract_speech_from_video(video_path, output_text_path=None, language="en-US", chunk_length_sec=30, progress_callback=None):
-    video_dir = os.path.dirname(video_path)
-    if not output_text_path:
-        base_name = os.path.splitext(os.path.basename(video_path))[0]
-        output_text_path = os.path.join(video_dir, f"{base_name}_transcricao.txt")
+def find_media_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, name) for name in sorted(names)
+                          if not name.startswith(".") and name.lower().endswith(MEDIA_EXTENSIONS)]
+        elif any(char in path for char in "*?["):
+            files += sorted(glob.glob(path))
+        else:
+            files.append(path)
+    return files
+
+
+def scan_silence(media_path, stream_index=0):
+    cmd = [
+        FFMPEG_PATH, '-nostdin', '-hide_banner', '-i', media_path, '-map', f"0:a:{stream_index}", '-vn', '-sn', '-dn',
+        '-af', f"silencedetect=noise={PLAN_SILENCE_THRESHOLD}:d={PLAN_SILENCE_MIN_SEC}", '-f', 'null', '-'
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors="replace")
     
-    temp_audio_path = os.path.join(video_dir, "temp_audio.wav")
+    silences = []
+    start = None
+    for line in result.stderr.splitlines():
+        match = re.search(r"silence_start: (-?[\d.]+)", line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+        match = re.search(r"silence_end: ([\d.]+)", line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    if start is not None:
+        silences.append((start, None))
+    return silences
+
+
+def plan_media_file(media_path, chunk_length_sec=30, overlap_sec=0, silence_scan=False):
+    plan = {"path": media_path, "duration": None, "chunks": 0, "speech_ratio": None, "silent_chunks": None}
+    info = probe_media(media_path)
+    stream = get_default_audio_stream(info)
+    if not stream or not info["duration"]:
+        plan["error"] = "sem áudio ou duração desconhecida"
+        return plan
     
-    if not extract_audio_from_video(video_path, temp_audio_path):
-        base_name = os.path.splitext(video_path)[0]
-        audio_files = glob.glob(f"{base_name}*.m4a") + glob.glob(f"{base_name}*.mp3") + glob.glob(f"{base_name}*.aac")
-        
-        if audio_files:
-            print(f"Trying to use separate audio file: {audio_files[0]}")
-            if not extract_audio_from_video(audio_files[0], temp_audio_path):
-                return "Failed to extract audio from video and audio files"
-        else:
-            return "Failed to extract audio from video and no audio files found"
+    duration = info["duration"]
+    plan["duration"] = duration
+    plan["chunks"] = get_chunk_count(duration, chunk_length_sec, overlap_sec)
     
-    if progress_callback:
-        progress_callback(25)
+    if silence_scan:
+        silences = [(start, end if end is not None else duration) for start, end in scan_silence(media_path, stream["audio_index"])]
+        plan["speech_ratio"] = max(0.0, 1 - sum(end - start for start, end in silences) / duration)
+        plan["silent_chunks"] = sum(
+            1 for i in range(plan["chunks"])
+            if any(start <= i * chunk_length_sec and end >= min((i + 1) * chunk_length_sec + overlap_sec, duration)
+                   for start, end in silences)
+        )
+    return plan
+
+
+def estimate_makespan(file_seconds, jobs):
+    workers = [0.0] * max(1, min(jobs, len(file_seconds)))
+    for seconds in sorted(file_seconds, reverse=True):
+        heapq.heapreplace(workers, workers[0] + seconds)
+    return max(workers)
+
+
+def plan_batch(paths, language="en-US", chunk_length_sec=30, overlap_sec=0, jobs=2, latency=None, silence_scan=False):
+    files = find_media_files(paths)
+    if not files:
+        print("Nenhum arquivo de mídia encontrado")
+        return []
     
-    transcribed_text = transcribe_audio_with_chunks(
-        temp_audio_path, 
-        language, 
-        chunk_length_sec,
-        lambda progress: progress_callback(25 + progress * 0.75) if progress_callback else None
-    )
+    latency = latency or get_measured_latency()
+    latency_source = "medida nas execuções anteriores" if latency else "estimada"
+    latency = latency or DEFAULT_REQUEST_LATENCY_SEC
     
-    if os.path.exists(temp_audio_path):
-        os.remove(temp_audio_path)
-        print("Temporary audio file removed")
+    with ThreadPoolExecutor(max_workers=min(len(files), (os.cpu_count() or 1) * 2)) as executor:
+        plans = list(executor.map(lambda path: plan_media_file(path, chunk_length_sec, overlap_sec, silence_scan), files))
     
-    if output_text_path and transcribed_text:
-        try:
-            with open(output_text_path, 'w', encoding='utf-8') as file:
-                file.write(transcribed_text)
-            print(f"Transcribed text saved to {output_text_path}")
-        except Exception as e:
-            print(f"Error saving transcribed text: {e}")
+    candidates = get_auto_language_candidates(language)
+    detection_requests = len(candidates) * LANGUAGE_SAMPLE_COUNT if candidates else 0
+    
+    for plan in plans:
+        name = os.path.basename(plan["path"])
+        if plan.get("error"):
+            print(f"{name}: {plan['error']}")
+            continue
+        line = f"{name}: {format_timestamp(plan['duration'])}, {plan['chunks']} segmentos"
+        if plan["speech_ratio"] is not None:
+            line += f", {plan['speech_ratio'] * 100:.0f}% fala, {plan['silent_chunks']} segmentos só com silêncio"
+        print(line)
+    
+    valid = [plan for plan in plans if not plan.get("error")]
+    total_duration = sum(plan["duration"] for plan in valid)
+    total_requests = sum(plan["chunks"] for plan in valid) + detection_requests * len(valid)
+    eta = estimate_makespan([(plan["chunks"] + detection_requests) * latency for plan in valid], jobs)
+    
+    print()
+    print(f"Arquivos: {len(valid)} de {len(plans)} ({format_timestamp(total_duration)} de áudio)")
+    print(f"Requisições previstas: {total_requests}" + (f" (incluindo {detection_requests} por arquivo para detectar o idioma)" if detection_requests else ""))
+    if silence_scan and valid:
+        speech = sum(plan["duration"] * plan["speech_ratio"] for plan in valid)
+        print(f"Fala: {speech / total_duration * 100:.0f}% do áudio, {sum(plan['silent_chunks'] for plan in valid)} segmentos só com silêncio")
+    print(f"Tempo estimado: {format_timestamp(eta)} com {jobs} trabalhos simultâneos e {latency:.1f}s por requisição ({latency_source})")
+    return plans
+
+
+def copy_video_to_folder(file_path):
+    video_name = os.path.splitext(os.path.basename(file_path))[0]
+    output_folder = create_video_folder(video_name)
+    
+    new_video_path = os.path.join(output_folder, os.path.basename(file_path))
+    shutil.copy2(file_path, new_video_path)
+    return output_folder, new_video_path
+
+
+def process_video_file(file_path, output_path=None, language="en-US", chunk_length_sec=30, progress_callback=None, use_cache=True, shards=0, profile=False,
+                       recognizer=None, ranges=None, overlap_sec=0):
+    output_folder, video_path = copy_video_to_folder(file_path)
+    print(f"Criada pasta para o vídeo: {output_folder}")
+    
+    if not output_path:
+        video_name = os.path.splitext(os.path.basename(video_path))[0]
+        output_path = os.path.join(output_folder, f"{video_name}_transcricao.txt")
+    
+    result = extract_speech_from_video(video_path, output_path, language, chunk_length_sec,
+                                       progress_callback, use_cache=use_cache, shards=shards, profile=profile,
+                                       recognizer=recognizer, ranges=ranges, overlap_sec=overlap_sec)
+    
+    if os.path.exists(output_path):
+        index_transcript(output_path)
+        return output_path, result
+    return None, result
+
+
+def process_video_tracks(file_path, track_spec="all", language="en-US", chunk_length_sec=30, progress_callback=None,
+                         max_workers=None, overlap_sec=0):
+    info = probe_media(file_path)
+    tracks = parse_track_spec(track_spec, info, language)
+    
+    output_folder, video_path = copy_video_to_folder(file_path)
+    print(f"Criada pasta para o vídeo: {output_folder}")
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    
+    progress = dict.fromkeys(range(len(tracks)), 0)
+    progress_lock = threading.Lock()
+    
+    def update_progress(position, percent):
+        if not progress_callback:
+            return
+        with progress_lock:
+            progress[position] = percent
+            progress_callback(25 + sum(progress.values()) / len(progress) * 0.75)
+    
+    with job_workspace(estimate_scratch_bytes(video_path) * len(tracks)) as workspace:
+        track_paths = extract_audio_tracks(video_path, workspace, [index for index, _ in tracks])
+        if not track_paths:
+            return []
+        
+        if progress_callback:
+            progress_callback(25)
+        
+        def transcribe_track(position):
+            index, track_language = tracks[position]
+            track_path = track_paths[index]
+            track_language = resolve_language(track_path, track_language)
+            print(f"Transcrevendo a faixa {index} em {track_language}")
+            
+            segments = transcribe_audio_segments(track_path, track_language, chunk_length_sec,
+                                                 lambda percent: update_progress(position, percent),
+                                                 overlap_sec=overlap_sec)
+            if segments is None:
+                return index, None, "Falha ao dividir o áudio em segmentos"
+            
+            output_path = os.path.join(output_folder, f"{video_name}_faixa{index}_transcricao.txt")
+            text = join_segments_text(segments)
+            save_segments(get_segments_path(output_path), {
+                "video_path": os.path.abspath(video_path),
+                "cache_key": None,
+                "language": track_language,
+                "chunk_length_sec": chunk_length_sec,
+                "overlap_sec": overlap_sec,
+                "track": index,
+                "segments": segments
+            })
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            print(f"Faixa {index} salva em {output_path}")
+            index_transcript(output_path)
+            return index, output_path, text
+        
+        def run_track(position):
+            try:
+                return transcribe_track(position)
+            except Exception as e:
+                print(f"Erro ao transcrever a faixa {tracks[position][0]}: {e}")
+                return tracks[position][0], None, str(e)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or len(tracks)) as executor:
+            results = list(executor.map(run_track, range(len(tracks))))
     
     if progress_callback:
         progress_callback(100)
+    return results
+
+
+_yt_dlp_lock = threading.Lock()
+_yt_dlp_ready = False
+
+
+def get_yt_dlp_path():
+    global _yt_dlp_ready
     
-    return transcribed_text
+    with _yt_dlp_lock:
+        if not _yt_dlp_ready:
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", "yt-dlp"], 
+                                     stdout=subprocess.DEVNULL, 
+                                     stderr=subprocess.DEVNULL)
+                print("yt-dlp installed successfully")
+            except:
+                pass
+            _yt_dlp_ready = True
+    
+    yt_dlp_path = os.path.join(os.path.dirname(sys.executable), "Scripts", "yt-dlp")
+    if not os.path.exists(yt_dlp_path):
+        yt_dlp_path = "yt-dlp"
+    return yt_dlp_path
+
+
+def is_youtube_collection(youtube_url):
+    if not youtube_url:
+        return False
+    if "list=" in youtube_url and "v=" not in youtube_url:
+        return True
+    return any(marker in youtube_url for marker in ("/playlist", "/@", "/channel/", "/c/", "/user/"))
+
+
+def expand_youtube_playlist(youtube_url):
+    command = [
+        get_yt_dlp_path(),
+        youtube_url,
+        "--flat-playlist",
+        "--dump-json",
+        "--no-warnings"
+    ]
+    
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8")
+    if result.returncode != 0:
+        print(f"Error running yt-dlp: {result.stderr}")
+        return []
+    
+    entries = []
+    seen = set()
+    for line in result.stdout.splitlines():
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        
+        video_id = data.get("id")
+        if not video_id or video_id in seen:
+            continue
+        seen.add(video_id)
+        
+        entries.append({
+            "id": video_id,
+            "title": data.get("title") or f"youtube_{video_id}",
+            "url": f"https://www.youtube.com/watch?v={video_id}"
+        })
+    
+    print(f"Encontrados {len(entries)} vídeos em {youtube_url}")
+    return entries
 
 
-def download_youtube_video(youtube_url, output_folder=None, progress_callback=None):
+def download_youtube_video(youtube_url, output_folder=None, progress_callback=None, video_title=None):
     try:
         print(f"Downloading video from {youtube_url}...")
         
-        try:
-            subprocess.run(['C:\\ffmpeg\\bin\\ffmpeg.exe', '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        except:
+        if not is_ffmpeg_available():
             print("FFmpeg não está instalado ou não está no PATH. Por favor, instale o FFmpeg.")
             print("Você pode baixá-lo em: https://ffmpeg.org/download.html")
             return None
         
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "yt-dlp"], 
-                                 stdout=subprocess.DEVNULL, 
-                                 stderr=subprocess.DEVNULL)
-            print("yt-dlp installed successfully")
-        except:
-            pass
-        
         if not output_folder:
             output_folder = "."
         
@@ -283,9 +1828,7 @@ def download_youtube_video(youtube_url, output_folder=None, progress_callback=No
                 if progress_callback:
                     progress_callback(100)
         
-        yt_dlp_path = os.path.join(os.path.dirname(sys.executable), "Scripts", "yt-dlp")
-        if not os.path.exists(yt_dlp_path):
-            yt_dlp_path = "yt-dlp"
+        yt_dlp_path = get_yt_dlp_path()
         
         output_template = os.path.join(output_folder, "%(title)s.%(ext)s")
         
@@ -296,6 +1839,7 @@ def download_youtube_video(youtube_url, output_folder=None, progress_callback=No
             "--force-overwrites",
             "--newline",
             "--progress",
+            "--no-playlist",
             "--print", "after_move:filepath"
         ]
         
@@ -304,52 +1848,69 @@ def download_youtube_video(youtube_url, output_folder=None, progress_callback=No
             youtube_url,
             "--print", "title",
             "--skip-download",
+            "--no-playlist",
             "--no-warnings"
         ]
         
-        try:
-            title_process = subprocess.Popen(
-                title_command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                universal_newlines=True
-            )
-            video_title, _ = title_process.communicate()
-            video_title = video_title.strip()
+        if video_title:
             print(f"Título do vídeo: {video_title}")
-        except:
-            video_title = "youtube_video"
+        else:
+            try:
+                title_process = subprocess.run(
+                    title_command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    universal_newlines=True
+                )
+                video_title = title_process.stdout.strip()
+                print(f"Título do vídeo: {video_title}")
+            except:
+                video_title = "youtube_video"
+        
+        existing_files = set(glob.glob(os.path.join(output_folder, "*")))
         
-        process = subprocess.Popen(
+        output_path = None
+        error_lines = deque(maxlen=50)
+        
+        with subprocess.Popen(
             command, 
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE,
             text=True,
             bufsize=1,
             universal_newlines=True
-        )
-        
-        output_path = None
-        
-        for line in process.stdout:
-            print(line.strip())
-            if os.path.exists(line.strip()):
-                output_path = line.strip()
-        
-        process.wait()
+        ) as process:
+            stderr_thread = threading.Thread(target=lambda: error_lines.extend(process.stderr), daemon=True)
+            stderr_thread.start()
+            try:
+                for line in process.stdout:
+                    line = line.strip()
+                    print(line)
+                    if os.path.exists(line):
+                        output_path = line
+                    elif progress_callback and line.startswith("[download]") and "%" in line:
+                        try:
+                            progress_callback(float(line.split()[1].rstrip("%")))
+                        except ValueError:
+                            pass
+                process.wait()
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                stderr_thread.join()
         
         if os.path.exists(progress_file):
             os.remove(progress_file)
         
         if process.returncode != 0:
-            error = process.stderr.read()
-            print(f"Error running yt-dlp: {error}")
+            print(f"Error running yt-dlp: {''.join(error_lines)}")
             return None, None
         
         if not output_path:
-            video_files = glob.glob(os.path.join(output_folder, "*"))
-            video_files = [f for f in video_files if os.path.isfile(f) and not f.endswith('.json') and not f.endswith('.txt')]
+            video_files = set(glob.glob(os.path.join(output_folder, "*"))) - existing_files
+            video_files = [f for f in video_files if os.path.isfile(f) and not f.endswith(('.json', '.txt', '.part', '.ytdl'))]
             
             video_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
             
@@ -374,16 +1935,206 @@ def download_youtube_video(youtube_url, output_folder=None, progress_callback=No
         return None
 
 
+def process_youtube_video(youtube_url, output_path=None, language="en-US", chunk_length_sec=30,
+                          download_callback=None, progress_callback=None, video_title=None, use_cache=True, shards=0,
+                          profile=False, recognizer=None, ranges=None, overlap_sec=0):
+    if not os.path.exists("videos"):
+        os.makedirs("videos")
+    
+    temp_folder = tempfile.mkdtemp(prefix="temp_", dir="videos")
+    try:
+        result = download_youtube_video(youtube_url, temp_folder, download_callback, video_title)
+        if isinstance(result, tuple) and len(result) == 2:
+            video_path, video_title = result
+        else:
+            video_path = result
+        
+        if not video_path:
+            print("Failed to download YouTube video")
+            return None, None
+        
+        output_folder = create_video_folder(video_title or "youtube_video", True, youtube_url)
+        print(f"Criada pasta para o vídeo: {output_folder}")
+        
+        new_video_path = os.path.join(output_folder, os.path.basename(video_path))
+        shutil.move(video_path, new_video_path)
+        video_path = new_video_path
+    finally:
+        shutil.rmtree(temp_folder, ignore_errors=True)
+    
+    if not output_path:
+        video_name = os.path.splitext(os.path.basename(video_path))[0]
+        output_path = os.path.join(output_folder, f"{video_name}_transcricao.txt")
+    
+    result = extract_speech_from_video(video_path, output_path, language, chunk_length_sec, progress_callback,
+                                       cache_key=get_audio_cache_key(video_path, youtube_url), use_cache=use_cache,
+                                       shards=shards, profile=profile, recognizer=recognizer, ranges=ranges,
+                                       overlap_sec=overlap_sec)
+    
+    if os.path.exists(output_path):
+        index_transcript(output_path)
+        return output_path, result
+    return None, result
+
+
+def process_youtube_playlist(youtube_url, language="en-US", chunk_length_sec=30, max_workers=2, use_cache=True):
+    entries = expand_youtube_playlist(youtube_url)
+    if not entries:
+        return []
+    
+    update_index()
+    processed_ids = get_indexed_youtube_ids()
+    new_entries = [entry for entry in entries if entry["id"] not in processed_ids]
+    print(f"{len(entries) - len(new_entries)} vídeos já processados, {len(new_entries)} novos")
+    
+    def process_entry(entry):
+        try:
+            output_path, _ = process_youtube_video(entry["url"], None, language, chunk_length_sec,
+                                                   video_title=entry["title"], use_cache=use_cache)
+            return entry, output_path
+        except Exception as e:
+            print(f"Erro ao processar {entry['url']}: {e}")
+            return entry, None
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(process_entry, new_entries))
+    
+    failed = [entry["url"] for entry, output_path in results if not output_path]
+    if failed:
+        print(f"{len(failed)} vídeos falharam: {', '.join(failed)}")
+    
+    return results
+
+
+class Transcriber:
+    def __init__(self, language="en-US", chunk_length_sec=30, use_cache=True, shards=0, profile=False, max_workers=2,
+                 ranges=None, overlap_sec=0):
+        if not 0 <= overlap_sec < chunk_length_sec:
+            raise ValueError("a sobreposição deve ser maior ou igual a zero e menor que o tamanho do segmento")
+        self.language = language
+        self.chunk_length_sec = chunk_length_sec
+        self.use_cache = use_cache
+        self.shards = shards
+        self.profile = profile
+        self.max_workers = max_workers
+        self.ranges = ranges
+        self.overlap_sec = overlap_sec
+        self._local = threading.local()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+        if not is_ffmpeg_available():
+            print(f"AVISO: FFmpeg não está acessível no caminho {FFMPEG_PATH}")
+        if not os.path.exists("videos"):
+            os.makedirs("videos")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+    
+    @property
+    def recognizer(self):
+        recognizer = getattr(self._local, "recognizer", None)
+        if recognizer is None:
+            recognizer = sr.Recognizer()
+            self._local.recognizer = recognizer
+        return recognizer
+    
+    @property
+    def executor(self):
+        with self._executor_lock:
+            if not self._executor:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+    
+    def _options(self, overrides):
+        options = {
+            "language": self.language,
+            "chunk_length_sec": self.chunk_length_sec,
+            "use_cache": self.use_cache,
+            "shards": self.shards,
+            "profile": self.profile,
+            "ranges": self.ranges,
+            "overlap_sec": self.overlap_sec
+        }
+        options.update(overrides)
+        return options
+    
+    def transcribe_file(self, file_path, output_path=None, progress_callback=None, **overrides):
+        options = self._options(overrides)
+        return process_video_file(file_path, output_path, options["language"], options["chunk_length_sec"],
+                                  progress_callback, options["use_cache"], options["shards"], options["profile"],
+                                  recognizer=self.recognizer, ranges=options["ranges"],
+                                  overlap_sec=options["overlap_sec"])
+    
+    def transcribe_url(self, url, output_path=None, progress_callback=None, download_callback=None, **overrides):
+        options = self._options(overrides)
+        return process_youtube_video(url, output_path, options["language"], options["chunk_length_sec"],
+                                     download_callback, progress_callback, overrides.get("video_title"),
+                                     options["use_cache"], options["shards"], options["profile"],
+                                     recognizer=self.recognizer, ranges=options["ranges"],
+                                     overlap_sec=options["overlap_sec"])
+    
+    def transcribe_tracks(self, file_path, track_spec="all", progress_callback=None, **overrides):
+        options = self._options(overrides)
+        return process_video_tracks(file_path, track_spec, options["language"], options["chunk_length_sec"],
+                                    progress_callback, self.max_workers, options["overlap_sec"])
+    
+    def transcribe(self, source, **overrides):
+        try:
+            if source.startswith(("http://", "https://")):
+                return self.transcribe_url(source, **overrides)
+            return self.transcribe_file(source, **overrides)
+        except Exception as e:
+            print(f"Erro ao processar {source}: {e}")
+            return None, None
+    
+    def transcribe_many(self, sources, **overrides):
+        futures = [self.executor.submit(self.transcribe, source, **overrides) for source in sources]
+        return [future.result() for future in futures]
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract speech text from video")
     
     video_source = parser.add_mutually_exclusive_group(required=True)
     video_source.add_argument("-f", "--file", help="Path to the input video file")
-    video_source.add_argument("-y", "--youtube", help="YouTube video URL")
+    video_source.add_argument("-y", "--youtube", help="YouTube video, playlist or channel URL")
+    video_source.add_argument("-r", "--refine", help="Re-transcribe only the low-confidence or empty chunks listed in a *_segmentos.json file")
+    video_source.add_argument("-w", "--watch", help="Watch a folder and transcribe new media files as they arrive")
+    video_source.add_argument("--live", help="Caption a live source as it plays: stream URL (RTMP/HLS) or a file still being recorded")
+    video_source.add_argument("-p", "--plan", nargs="+", help="Dry run: report chunk and request counts and an ETA for files, folders or globs without transcribing")
     
     parser.add_argument("-o", "--output", help="Path to save the transcribed text")
-    parser.add_argument("-l", "--language", default="en-US", help="Language code for speech recognition (default: en-US)")
+    parser.add_argument("-l", "--language", default="en-US", help="Language code for speech recognition, or auto / auto:pt-BR,en-US to detect it from a few speech samples (default: en-US)")
     parser.add_argument("-c", "--chunk", type=int, default=30, help="Length of audio chunks in seconds (default: 30)")
+    parser.add_argument("--overlap", type=float, default=0, help="Seconds shared by adjacent chunks; repeated words at the seams are removed (default: 0)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the extracted audio cache")
+    parser.add_argument("--shards", type=int, default=0, help="Parallel ffmpeg processes for audio extraction (default: 0 = automatic for videos over 20 minutes, 1 = disabled)")
+    parser.add_argument("--profile", action="store_true", help="Write CPU (cProfile) and memory (tracemalloc) reports for each stage into the video folder")
+    parser.add_argument("--scratch", help="Folder for temporary audio (default: /dev/shm when available, otherwise the system temp folder)")
+    parser.add_argument("--scratch-quota", type=float, help="Maximum MB of temporary audio in the scratch folder across running jobs")
+    parser.add_argument("--min-confidence", type=float, default=0.7, help="Chunks below this confidence are retried in refine mode (default: 0.7)")
+    parser.add_argument("--refine-backend", choices=["google", "sphinx"], help="Extra recognizer to try in refine mode (sphinx needs pocketsphinx)")
+    parser.add_argument("--start", help="Transcribe from this time on (SS, MM:SS or HH:MM:SS)")
+    parser.add_argument("--end", help="Transcribe up to this time (SS, MM:SS or HH:MM:SS)")
+    parser.add_argument("--range", action="append", default=[], help="Time range START-END to transcribe; repeat for several ranges (e.g. --range 10:00-20:00 --range 1:00:00-1:05:00)")
+    parser.add_argument("--tracks", help="Transcribe several audio tracks of a local file at once: all, or INDEX[:LANGUAGE] list (e.g. 0:pt-BR,1:en-US)")
+    parser.add_argument("--silence-scan", action="store_true", help="In plan mode, also measure the speech/silence ratio with ffmpeg silencedetect")
+    parser.add_argument("--latency", type=float, help="Seconds per recognition request for the plan ETA (default: average measured in previous runs)")
+    parser.add_argument("--dedupe", action="store_true", help="Reuse the stored text of chunks already heard in earlier jobs (intros, ads, jingles) instead of sending them again; needs NumPy")
+    parser.add_argument("--condition", action="store_true", help="Filter, noise-gate and normalize the audio before chunking and skip chunks that are silent after the gate; needs NumPy")
+    parser.add_argument("--recycle-after", type=int, help="In watch mode, run files in worker processes restarted after this many files")
+    parser.add_argument("--recycle-rss", type=float, help="In watch mode, restart a worker process once it uses more than this many MB")
+    parser.add_argument("-j", "--jobs", type=int, default=2, help="Files or playlist videos processed at the same time (default: 2)")
     
     args = parser.parse_args()
     
@@ -394,64 +2145,94 @@ if __name__ == "__main__":
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pydub"])
         import pydub
     
-    try:
-        subprocess.run(['C:\\ffmpeg\\bin\\ffmpeg.exe', '-version'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    except:
-        print("AVISO: FFmpeg não está acessível no caminho C:\\ffmpeg\\bin\\ffmpeg.exe")
+    if not is_ffmpeg_available():
+        print(f"AVISO: FFmpeg não está acessível no caminho {FFMPEG_PATH}")
         print("Verifique se o FFmpeg está instalado neste local ou ajuste o caminho no código.")
     
-    video_path = None
-    output_folder = None
+    if not 0 <= args.overlap < args.chunk:
+        parser.error("--overlap deve ser maior ou igual a zero e menor que --chunk")
+    
+    try:
+        ranges = parse_time_ranges(";".join(args.range))
+        if args.start or args.end:
+            ranges += parse_time_ranges(f"{args.start or ''}-{args.end or ''}")
+    except ValueError as e:
+        parser.error(str(e))
+    ranges = merge_time_ranges(ranges) or None
+    
+    if ranges and (args.tracks or args.watch or args.live or args.plan or args.refine
+                   or (args.youtube and is_youtube_collection(args.youtube))):
+        parser.error("--start, --end e --range só podem ser usados com um único arquivo (-f) ou vídeo do YouTube (-y)")
+    
+    if args.scratch:
+        os.environ[SCRATCH_DIR_ENV] = args.scratch
+    if args.scratch_quota:
+        os.environ[SCRATCH_QUOTA_ENV] = str(args.scratch_quota)
+    if args.dedupe:
+        os.environ[DEDUPE_ENV] = "1"
+    if args.condition:
+        os.environ[CONDITION_ENV] = "1"
+    
+    if args.plan:
+        plans = plan_batch(args.plan, args.language, args.chunk, args.overlap, args.jobs, args.latency, args.silence_scan)
+        sys.exit(0 if plans else 1)
+    
+    if args.refine:
+        result = refine_transcription(args.refine, args.min_confidence, backend=args.refine_backend)
+        sys.exit(0 if result is not None else 1)
+    
+    if args.watch:
+        from watch_folder import watch_folder
+        watch_folder(args.watch, args.language, args.chunk, args.jobs, use_cache=not args.no_cache,
+                     recycle_after=args.recycle_after, recycle_rss_mb=args.recycle_rss)
+        sys.exit(0)
+    
+    if args.live:
+        if args.language.startswith(AUTO_LANGUAGE):
+            parser.error("a detecção automática de idioma não está disponível com --live")
+        from live_transcriber import transcribe_live
+        text = transcribe_live(args.live, args.language, args.output, follow=os.path.isfile(args.live), workers=args.jobs)
+        sys.exit(0 if text is not None else 1)
     
     if not os.path.exists("videos"):
         os.makedirs("videos")
     
+    if args.tracks:
+        if not args.file:
+            parser.error("--tracks só pode ser usado com --file")
+        try:
+            results = process_video_tracks(args.file, args.tracks, args.language, args.chunk, overlap_sec=args.overlap)
+        except ValueError as e:
+            parser.error(str(e))
+        for index, output_path, text in results:
+            print(f"Faixa {index}: {output_path or text}")
+        sys.exit(0 if results and all(output_path for _, output_path, _ in results) else 1)
+    
+    if args.youtube and is_youtube_collection(args.youtube):
+        results = process_youtube_playlist(args.youtube, args.language, args.chunk, args.jobs, not args.no_cache)
+        done = sum(1 for _, output_path in results if output_path)
+        print(f"\n{done} de {len(results)} vídeos novos transcritos")
+        sys.exit(0 if done == len(results) else 1)
+    
     if args.youtube:
-        temp_folder = os.path.join("videos", "temp_" + datetime.now().strftime("%Y%m%d_%H%M%S"))
-        if not os.path.exists(temp_folder):
-            os.makedirs(temp_folder)
-        
         def print_progress(percent):
             print(f"\rDownload progress: {percent:.1f}%", end="", flush=True)
         
-        video_path, video_title = download_youtube_video(args.youtube, temp_folder, print_progress)
+        with Transcriber(args.language, args.chunk, not args.no_cache, args.shards, args.profile,
+                         ranges=ranges, overlap_sec=args.overlap) as transcriber:
+            output_path, result = transcriber.transcribe_url(args.youtube, args.output, download_callback=print_progress)
         print()
         
-        if not video_path:
-            print("Failed to download YouTube video")
+        if result is None:
             exit(1)
-            
-        output_folder = create_video_folder(video_title or "youtube_video", True, args.youtube)
-        print(f"Criada pasta para o vídeo: {output_folder}")
-        
-        new_video_path = os.path.join(output_folder, os.path.basename(video_path))
-        shutil.move(video_path, new_video_path)
-        video_path = new_video_path
-        
-        try:
-            if os.path.exists(temp_folder):
-                shutil.rmtree(temp_folder)
-        except:
-            pass
     else:
-        video_path = args.file
-        video_name = os.path.splitext(os.path.basename(video_path))[0]
-        output_folder = create_video_folder(video_name)
-        
-        new_video_path = os.path.join(output_folder, os.path.basename(video_path))
-        shutil.copy2(video_path, new_video_path)
-        video_path = new_video_path
-    
-    output_path = args.output
-    if not output_path:
-        video_name = os.path.splitext(os.path.basename(video_path))[0]
-        output_path = os.path.join(output_folder, f"{video_name}_transcricao.txt")
-    
-    result = extract_speech_from_video(video_path, output_path, args.language, args.chunk)
+        with Transcriber(args.language, args.chunk, not args.no_cache, args.shards, args.profile,
+                         ranges=ranges, overlap_sec=args.overlap) as transcriber:
+            output_path, result = transcriber.transcribe_file(args.file, args.output)
     
     print("\nTranscribed Text:")
     print(result[:500] + "..." if len(result) > 500 else result)
     print(f"\nComprimento total do texto: {len(result)} caracteres")
     
     if output_path:
-        print(f"\nTexto completo salvo em: {output_path}")
\ No newline at end of file
+        print(f"\nTexto completo salvo em: {output_path}")
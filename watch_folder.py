@@ -0,0 +1,318 @@
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from video_transcriber import MEDIA_EXTENSIONS, process_video_file, should_recycle_worker
+
+
+STATE_FILE_NAME = ".transcricoes_processadas.json"
+MAX_ATTEMPTS = 3
+
+
+def is_media_file(path):
+    name = os.path.basename(path)
+    return not name.startswith(".") and name.lower().endswith(MEDIA_EXTENSIONS)
+
+
+class ProcessedRecord:
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self.lock = threading.Lock()
+        self.entries = {}
+
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Erro ao ler o registro de arquivos processados: {e}")
+
+    def is_processed(self, path, stat):
+        entry = self.entries.get(os.path.basename(path))
+        if not entry or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+            return False
+        return entry.get("status") == "ok" or entry.get("attempts", 1) >= MAX_ATTEMPTS
+
+    def mark(self, path, stat, status, output_path=None):
+        with self.lock:
+            previous = self.entries.get(os.path.basename(path))
+            attempts = 1
+            if (status != "ok" and previous and previous.get("status") != "ok"
+                    and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime):
+                attempts = previous.get("attempts", 1) + 1
+            self.entries[os.path.basename(path)] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "status": status,
+                "attempts": attempts,
+                "output": output_path,
+                "processed_at": datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            }
+            self._save()
+
+    def _save(self):
+        folder = os.path.dirname(self.state_path) or "."
+        fd, temp_path = tempfile.mkstemp(suffix=".json", dir=folder)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.state_path)
+
+
+def transcribe_file_job(path, language, chunk_length_sec, use_cache):
+    output_path, _ = process_video_file(path, None, language, chunk_length_sec, use_cache=use_cache)
+    return output_path
+
+
+def recycled_worker_main(tasks, results, current_task, max_jobs, max_rss_mb):
+    jobs_done = 0
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, args = task
+        current_task.value = task_id
+        try:
+            results.put((task_id, transcribe_file_job(*args), None))
+        except Exception as e:
+            results.put((task_id, None, str(e)))
+        current_task.value = 0
+        jobs_done += 1
+        if should_recycle_worker(jobs_done, max_jobs, max_rss_mb):
+            break
+
+
+class RecyclingProcessPool:
+    def __init__(self, processes, max_jobs=None, max_rss_mb=None):
+        self.processes = processes
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.tasks = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.callbacks = {}
+        self.task_counter = 0
+        self.lock = threading.Lock()
+        self.closing = False
+        self.workers = [self._start_worker() for _ in range(processes)]
+        self.supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self.supervisor.start()
+
+    def _start_worker(self):
+        current_task = multiprocessing.Value("l", 0)
+        worker = multiprocessing.Process(target=recycled_worker_main,
+                                         args=(self.tasks, self.results, current_task, self.max_jobs, self.max_rss_mb))
+        worker.start()
+        return worker, current_task
+
+    def submit(self, args, callback):
+        with self.lock:
+            self.task_counter += 1
+            self.callbacks[self.task_counter] = callback
+            self.tasks.put((self.task_counter, args))
+
+    def _finish(self, task_id, output_path, error):
+        with self.lock:
+            callback = self.callbacks.pop(task_id, None)
+        if callback:
+            callback(output_path, error)
+
+    def _supervise(self):
+        while True:
+            try:
+                self._finish(*self.results.get(timeout=0.5))
+                continue
+            except queue.Empty:
+                pass
+
+            finished = []
+            with self.lock:
+                for worker, current_task in list(self.workers):
+                    if worker.is_alive():
+                        continue
+                    self.workers.remove((worker, current_task))
+                    callback = self.callbacks.pop(current_task.value, None)
+                    if callback:
+                        finished.append((callback, worker.exitcode))
+                    worker.close()
+                    if not self.closing:
+                        self.workers.append(self._start_worker())
+                    elif self.callbacks:
+                        self.workers.append(self._start_worker())
+                        self.tasks.put(None)
+                done = self.closing and not self.workers
+
+            for callback, exitcode in finished:
+                callback(None, f"processo encerrado com código {exitcode}")
+            if done:
+                break
+
+    def shutdown(self):
+        with self.lock:
+            self.closing = True
+            for _ in self.workers:
+                self.tasks.put(None)
+        self.supervisor.join()
+
+
+def start_inotify_observer(folder, touched):
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            path = getattr(event, "dest_path", None) or event.src_path
+            if is_media_file(path):
+                touched.put(path)
+
+    observer = Observer()
+    observer.schedule(Handler(), folder, recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
+
+
+def scan_folder(folder):
+    try:
+        return [entry.path for entry in os.scandir(folder) if entry.is_file() and is_media_file(entry.path)]
+    except OSError as e:
+        print(f"Erro ao listar {folder}: {e}")
+        return []
+
+
+def watch_folder(folder, language="en-US", chunk_length_sec=30, max_jobs=2, settle_seconds=3.0,
+                 poll_interval=2.0, use_cache=True, stop_event=None, recycle_after=None, recycle_rss_mb=None):
+    folder = os.path.abspath(folder)
+    if not os.path.isdir(folder):
+        print(f"Pasta não encontrada: {folder}")
+        return
+
+    stop_event = stop_event or threading.Event()
+    record = ProcessedRecord(os.path.join(folder, STATE_FILE_NAME))
+    touched = queue.Queue()
+    pending = {}
+    in_flight = set()
+    in_flight_lock = threading.Lock()
+
+    observer = start_inotify_observer(folder, touched)
+    if observer:
+        print(f"Monitorando {folder} (inotify)")
+    else:
+        print(f"Monitorando {folder} (verificação a cada {poll_interval:.0f}s; instale watchdog para usar inotify)")
+
+    def finish_job(path, stat, output_path, error=None):
+        if error:
+            print(f"Erro ao processar {path}: {error}")
+        else:
+            print(f"Arquivo concluído: {path}")
+        record.mark(path, stat, "ok" if output_path else "erro", output_path)
+        if not output_path and record.is_processed(path, stat):
+            print(f"{path} falhou {MAX_ATTEMPTS} vezes; não será tentado de novo até ser modificado")
+        with in_flight_lock:
+            in_flight.discard(path)
+
+    def run_job(path, stat):
+        try:
+            print(f"Processando novo arquivo: {path}")
+            finish_job(path, stat, transcribe_file_job(path, language, chunk_length_sec, use_cache))
+        except Exception as e:
+            finish_job(path, stat, None, e)
+
+    def submit_job(path, stat):
+        if pool:
+            print(f"Processando novo arquivo: {path}")
+            pool.submit((path, language, chunk_length_sec, use_cache),
+                        lambda output_path, error: finish_job(path, stat, output_path, error))
+        else:
+            executor.submit(run_job, path, stat)
+
+    if recycle_after or recycle_rss_mb:
+        pool = RecyclingProcessPool(max_jobs, recycle_after, recycle_rss_mb)
+        executor = None
+    else:
+        pool = None
+        executor = ThreadPoolExecutor(max_workers=max_jobs)
+    for path in scan_folder(folder):
+        touched.put(path)
+    last_scan = time.monotonic()
+
+    try:
+        while not stop_event.is_set():
+            if not observer and time.monotonic() - last_scan >= poll_interval:
+                for path in scan_folder(folder):
+                    touched.put(path)
+                last_scan = time.monotonic()
+
+            while True:
+                try:
+                    path = touched.get_nowait()
+                except queue.Empty:
+                    break
+                if path not in pending:
+                    pending[path] = (None, time.monotonic())
+
+            now = time.monotonic()
+            for path, (signature, changed_at) in list(pending.items()):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    del pending[path]
+                    continue
+
+                current = (stat.st_size, stat.st_mtime)
+                if current != signature:
+                    pending[path] = (current, now)
+                    continue
+
+                if now - changed_at < settle_seconds or stat.st_size == 0:
+                    continue
+
+                with in_flight_lock:
+                    if path in in_flight:
+                        continue
+                    del pending[path]
+                    if record.is_processed(path, stat):
+                        continue
+                    in_flight.add(path)
+                submit_job(path, stat)
+
+            stop_event.wait(0.5)
+    except KeyboardInterrupt:
+        print("\nEncerrando o monitoramento...")
+    finally:
+        if observer:
+            observer.stop()
+        if pool:
+            pool.shutdown()
+        else:
+            executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch a folder and transcribe new media files")
+    parser.add_argument("folder", help="Folder to watch")
+    parser.add_argument("-l", "--language", default="en-US", help="Language code for speech recognition (default: en-US)")
+    parser.add_argument("-c", "--chunk", type=int, default=30, help="Length of audio chunks in seconds (default: 30)")
+    parser.add_argument("-j", "--jobs", type=int, default=2, help="Files processed at the same time (default: 2)")
+    parser.add_argument("--settle", type=float, default=3.0, help="Seconds a file must stay unchanged before processing (default: 3)")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Folder scan interval without inotify (default: 2)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the extracted audio cache")
+    parser.add_argument("--recycle-after", type=int, help="Run files in worker processes restarted after this many files")
+    parser.add_argument("--recycle-rss", type=float, help="Run files in worker processes restarted once they use more than this many MB")
+
+    args = parser.parse_args()
+
+    watch_folder(args.folder, args.language, args.chunk, args.jobs, args.settle, args.poll_interval, not args.no_cache,
+                 recycle_after=args.recycle_after, recycle_rss_mb=args.recycle_rss)
+    sys.exit(0)